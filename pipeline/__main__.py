@@ -1,7 +1,7 @@
 """CLI entry point — run via `python -m pipeline` or `uv run python -m pipeline`."""
 
 import argparse
-import copy
+import atexit
 import faulthandler
 import json
 
@@ -15,9 +15,11 @@ import json
 # pipeline.orchestrator._write_heavy_worker_status for context.
 import json.encoder as _json_encoder
 import logging
+import logging.handlers
 import os
 import sys
 from datetime import datetime
+from queue import SimpleQueue
 
 _json_encoder.JSONEncoder.key_separator = ": "
 _json_encoder.JSONEncoder.item_separator = ", "
@@ -76,18 +78,50 @@ def setup_logging(staging_dir: str):
         sys.stdout.reconfigure(encoding="utf-8", errors="replace", line_buffering=True)
     except (AttributeError, ValueError):  # pragma: no cover - exotic stdout
         pass
+    # Producers (GPU / fetch / prep / upload threads) only enqueue; one
+    # QueueListener thread does the file + console writes. A slow console
+    # (a selected-text Windows terminal blocks writes outright) or a
+    # contended disk therefore can't stall the thread that's about to
+    # dispatch the next NVENC job. The listener is stopped at exit so the
+    # tail of the log is drained before the process goes away.
+    global _log_listener
+    if _log_listener is not None:
+        _log_listener.stop()
+    file_handler = logging.FileHandler(log_file, encoding="utf-8")
+    stream_handler = logging.StreamHandler(sys.stdout)
+    formatter = logging.Formatter("%(asctime)s [%(levelname)s] %(message)s")
+    for h in (file_handler, stream_handler):
+        h.setFormatter(formatter)
+    log_queue: SimpleQueue = SimpleQueue()
+    _log_listener = logging.handlers.QueueListener(log_queue, file_handler, stream_handler)
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    # QueueHandler.prepare() bakes the formatted text into record.msg; keep
+    # that to the bare message so the listener's formatter isn't doubled.
+    queue_handler.setFormatter(logging.Formatter("%(message)s"))
     logging.basicConfig(
         level=logging.INFO,
-        format="%(asctime)s [%(levelname)s] %(message)s",
-        handlers=[
-            logging.FileHandler(log_file, encoding="utf-8"),
-            logging.StreamHandler(sys.stdout),
-        ],
+        handlers=[queue_handler],
         # force=True so our handlers win even if something already configured
         # logging. Without it basicConfig silently no-ops when the root logger
         # has handlers, and the pipeline would run with no file log at all.
         force=True,
     )
+    _log_listener.start()
+
+
+# Background writer for the root logger's QueueHandler; see setup_logging.
+_log_listener: "logging.handlers.QueueListener | None" = None
+
+
+def _stop_log_listener() -> None:
+    """Drain queued records to the real handlers and stop the listener."""
+    global _log_listener
+    if _log_listener is not None:
+        _log_listener.stop()
+        _log_listener = None
+
+
+atexit.register(_stop_log_listener)
 
 
 def _build_full_gamut_item(entry: dict) -> dict:
@@ -116,19 +150,30 @@ def _build_full_gamut_item(entry: dict) -> dict:
         "file_size_bytes": entry.get("file_size_bytes", 0),
         "file_size_gb": entry.get("file_size_gb", 0),
         "duration_seconds": entry.get("duration_seconds", 0),
-        "video_codec": video.get("codec", codec_raw),
-        "resolution": video.get("resolution_class", ""),
+        "video_codec": _intern(video.get("codec", codec_raw)),
+        "resolution": _intern(video.get("resolution_class", "")),
         "bitrate_kbps": entry.get("overall_bitrate_kbps", 0) or 0,
         "hdr": video.get("hdr", False),
         "bit_depth": video.get("bit_depth", 8),
         "audio_streams": entry.get("audio_streams", []),
         "subtitle_streams": entry.get("subtitle_streams", []),
         "subtitle_count": entry.get("subtitle_count", 0),
-        "library_type": entry.get("library_type", ""),
+        "library_type": _intern(entry.get("library_type", "")),
         "tmdb": entry.get("tmdb") or {},
     }
 
 
+def _intern(value):
+    """``sys.intern`` for the small enum-like strings on a queue item.
+
+    json.loads hands back a fresh str per occurrence, so a 10k-item queue
+    holds 10k separate "1080p"/"HEVC"/"series" objects. Interning shares
+    one object per value and turns the res_key / content-type lookups in
+    the config tables into identity hits. Non-str values pass through.
+    """
+    return sys.intern(value) if type(value) is str else value
+
+
 def _ffprobe_video_codec(filepath: str, *, timeout: int = 15) -> str | None:
     """Return the live on-disk video codec name (e.g. 'av1', 'hevc', 'h264'),
     or None on probe failure.
@@ -419,8 +464,9 @@ def categorise_entry(
                 # full_gamut. Note this is a bare `if` with `pass`-by-
                 # omission: the subsequent codec checks are `elif`, so when
                 # force_reencode is set we skip them entirely and drop out
-                # of the terminal block to normal routing.
-                existing = state.get_file(filepath)  # refresh, no-op but explicit
+                # of the terminal block to normal routing. ``existing`` is
+                # still the row read above — nothing has written it since.
+                pass
             # DONE consistency check (2026-05-24). If the state row says
             # DONE/REPLACED but the file on disk isn't AV1, the row is
             # lying. Causes seen:
@@ -687,13 +733,13 @@ def _prune_done_from_priority_locked(prio_path: str, state: "PipelineState | Non
     paths = data.get("paths") or []
     if not paths or state is None:
         return 0
-    # Anything terminal — done OR any flagged_* — drops off.
-    TERMINAL = {"done", "flagged_corrupt", "flagged_foreign_audio", "flagged_undetermined", "flagged_manual"}
+    # Anything terminal — done OR any flagged_* — drops off. is_terminal
+    # rather than a local list, which had fallen behind (no flagged_undersized).
     kept = []
     removed = 0
     for fp in paths:
         row = state.get_file(fp)
-        if row and (row.get("status") or "").lower() in TERMINAL:
+        if row and is_terminal((row.get("status") or "").lower()):
             # KEEP a terminal row the operator explicitly wants re-encoded.
             # A DONE row with force_reencode=true is an ACTIVE re-encode
             # request (priority-add / requeue of an already-done AV1 file
@@ -757,8 +803,9 @@ def _read_priority_paths(staging_dir: str | None = None) -> set[str]:
     return set(data.get("paths") or [])
 
 
-def _sort_full_gamut(queue: list, config: dict, priority_paths: set[str]) -> None:
-    """In-place sort of the full_gamut queue.
+def _sort_full_gamut(queue: list, config: dict, priority_paths: set[str]) -> int:
+    """In-place sort of the full_gamut queue. Returns how many queued items
+    are in the priority bucket.
 
     Order:
       1. Priority paths (per ``control/priority.json -> paths``) ALWAYS
@@ -786,33 +833,55 @@ def _sort_full_gamut(queue: list, config: dict, priority_paths: set[str]) -> Non
         — so much of that queue costs nothing to "process" anyway.
       * Movies largest-first once reached, so the biggest space wins
         land first.
+
+    The priority bucket is counted while the keys are built (the sort
+    computes each key exactly once), so callers that log the bump count
+    don't need a second pass over the queue.
     """
     order = (config.get("encode_queue_order") or "series_first").lower()
+    n_priority = 0
 
     def _is_series(item: dict) -> bool:
         return (item.get("library_type") or "").lower() in ("series", "show", "tv", "anime")
 
     def _key(item: dict) -> tuple:
-        is_priority = 0 if item.get("filepath") in priority_paths else 1
+        nonlocal n_priority
         size = item.get("file_size_bytes", 0)
         # Within the priority bucket: always smallest-first, regardless of
         # library type — the operator prioritised these to get quick wins.
-        if is_priority == 0:
-            return (is_priority, 0, size)
+        if item.get("filepath") in priority_paths:
+            n_priority += 1
+            return (0, 0, size)
         if order == "series_first":
             # Series (rank 0) ascending; movies (rank 1) descending.
-            return (is_priority, 0, size) if _is_series(item) else (is_priority, 1, -size)
-        return (is_priority, 0, -size if order == "largest_first" else size)
+            return (1, 0, size) if _is_series(item) else (1, 1, -size)
+        return (1, 0, -size if order == "largest_first" else size)
 
     queue.sort(key=_key)
+    return n_priority
+
+
+def _sort_gap_filler(queue: list) -> None:
+    """In-place sort of the gap_filler queue, smallest first.
+
+    The key used to be ``(needs_fetch, size)`` with ``needs_fetch`` from a
+    second ``analyse_gaps`` call per entry — re-running the whole gap
+    analysis that ``categorise_entry`` had just done. It was always 0:
+    ``needs_fetch`` is ``needs_audio_transcode``, and categorise_entry sends
+    every audio-transcode case to full_gamut (the LotR AC-3 rule), so
+    nothing in this queue ever needs a fetch. Sorting by size alone gives
+    the same order without the O(queue) re-analysis.
+    """
+    queue.sort(key=lambda entry: entry.get("file_size_bytes", 0))
 
 
 def build_queues(report_path: str, config: dict, state: PipelineState, control: PipelineControl):
     """Build separate queues for full_gamut and gap_filler from the media report."""
-    with open(report_path, encoding="utf-8") as f:
-        report = json.load(f)
-
-    from pipeline.gap_filler import analyse_gaps
+    # Binary read + json.loads: one bulk decode of a report that runs to
+    # hundreds of MB, instead of text-mode incremental decoding with
+    # newline translation. Also tolerates a UTF-8 BOM.
+    with open(report_path, "rb") as f:
+        report = json.loads(f.read())
 
     full_gamut_queue = []
     gap_filler_queue = []
@@ -834,21 +903,14 @@ def build_queues(report_path: str, config: dict, state: PipelineState, control:
             full_gamut_queue.append(item)
         elif category == "gap_filler":
             gap_filler_queue.append(item)
-    _sort_full_gamut(full_gamut_queue, config, priority_paths)
+    n_prio = _sort_full_gamut(full_gamut_queue, config, priority_paths)
     if priority_paths:
-        n_prio = sum(1 for it in full_gamut_queue if it.get("filepath") in priority_paths)
         logging.info(
             f"Priority bump active: {n_prio} of {len(full_gamut_queue)} full_gamut "
             f"items lifted to the front of the queue"
         )
 
-    # Gap filler: NAS-only work first (no fetch), then by size
-    # needs_fetch is True only for audio transcode — everything else runs on NAS
-    def _gap_sort_key(entry):
-        gaps = analyse_gaps(entry, config)
-        return (1 if gaps.needs_fetch else 0, entry.get("file_size_bytes", 0))
-
-    gap_filler_queue.sort(key=_gap_sort_key)
+    _sort_gap_filler(gap_filler_queue)
 
     return full_gamut_queue, gap_filler_queue
 
@@ -908,8 +970,12 @@ def main():
     # State
     db_path = args.state_file or os.path.join(args.staging, "pipeline_state.db")
     state = PipelineState(db_path)
-    serializable_config = copy.deepcopy(config)
-    if isinstance(serializable_config.get("lossless_audio_codecs"), set):
+    # Shallow copy is enough: set_meta only json.dumps it, and the one
+    # non-JSON value (the lossless codec frozenset) is replaced rather than
+    # mutated. build_config already hands us private copies of the nested
+    # dicts, so a deepcopy here was pure allocation.
+    serializable_config = dict(config)
+    if isinstance(serializable_config.get("lossless_audio_codecs"), (set, frozenset)):
         serializable_config["lossless_audio_codecs"] = sorted(serializable_config["lossless_audio_codecs"])
     state.set_meta("config", serializable_config)
     state.save()
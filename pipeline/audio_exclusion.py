@@ -33,14 +33,16 @@ from __future__ import annotations
 
 import json
 import logging
+import re
 import time
 from pathlib import Path
 
 from paths import STAGING_DIR
+from pipeline.exclusion_match import cached_matcher
 
 DEFAULT_PATH: Path = Path(STAGING_DIR) / "control" / "audio_foreign_ok.json"
 
-_cache: dict = {"mtime": 0.0, "patterns_lower": (), "expires_at": 0.0}
+_cache: dict = {"mtime": 0.0, "patterns_lower": (), "expires_at": 0.0, "matcher": None, "matcher_for": None}
 _TTL_SECONDS = 5.0
 
 
@@ -74,6 +76,11 @@ def _load_patterns(path: Path | None = None) -> tuple[str, ...]:
     return patterns_lower
 
 
+def _load_matcher(path: Path | None = None) -> re.Pattern | None:
+    """Compiled matcher for the current patterns (see :func:`cached_matcher`)."""
+    return cached_matcher(_cache, _load_patterns(path))
+
+
 def is_foreign_audio_ok(filepath: str, path: Path | None = None) -> bool:
     """True if ``filepath`` matches any pattern in audio_foreign_ok.json.
 
@@ -81,11 +88,10 @@ def is_foreign_audio_ok(filepath: str, path: Path | None = None) -> bool:
     filepath always returns False."""
     if not filepath:
         return False
-    fp_lower = filepath.lower()
-    for pat in _load_patterns(path):
-        if pat in fp_lower:
-            return True
-    return False
+    matcher = _load_matcher(path)
+    if matcher is None:
+        return False
+    return matcher.search(filepath.lower()) is not None
 
 
 def reset_cache_for_tests() -> None:
@@ -93,3 +99,5 @@ def reset_cache_for_tests() -> None:
     _cache["mtime"] = 0.0
     _cache["patterns_lower"] = ()
     _cache["expires_at"] = 0.0
+    _cache["matcher"] = None
+    _cache["matcher_for"] = None
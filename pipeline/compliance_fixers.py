@@ -154,7 +154,9 @@ def _ffmpeg_drop_streams_to_path(
     src_size = os.path.getsize(src)
     timeout_secs = max(600, 60 + int(src_size / (4 * 1024 * 1024)))
     try:
-        out = subprocess.run(cmd, capture_output=True, timeout=timeout_secs)
+        # stdout carries nothing for a file output; piping only stderr lets
+        # communicate() read it inline instead of spawning a reader thread per pipe.
+        out = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, timeout=timeout_secs)
     except Exception as e:
         logging.error(f"ffmpeg drop-to-path raised (timeout={timeout_secs}s, src_size={src_size / 1024**3:.1f}GB): {e}")
         if os.path.exists(dst):
@@ -47,6 +47,13 @@ DEFAULT_CONFIG = {
     # (suspected Raptor Lake instability; BIOS mitigation pending). Bump back to 2
     # once the CPU is confirmed stable.
     "prep_concurrency": 1,
+    # CPU thread cap for the software-decode encode path (NVDEC-flaky codecs
+    # such as VC-1, and the no_hwaccel retry), where libavcodec decode plus
+    # the pixel-format filter otherwise spread across every core while the
+    # prep worker is busy too. Emitted as ``-threads`` / ``-filter_threads``.
+    # 0 = ffmpeg's own default (one thread per core). Ignored on the NVDEC
+    # path, where the CPU only demuxes and muxes.
+    "sw_decode_threads": 0,
     # Cap on prepped-and-waiting-for-GPU files. Prep workers pause when
     # this many files already sit in the "prepped, awaiting encode" state —
     # avoids burning CPU producing more than the single GPU can consume.
@@ -147,22 +154,24 @@ DEFAULT_CONFIG = {
     "audio_eac3_stereo_bitrate": "256k",  # EAC3 for stereo/mono
     "audio_loudnorm": False,  # EBU R128 loudness normalisation on transcoded audio
     # Audio codecs to transcode to EAC3 (lossless + wasteful lossy like DTS)
-    "lossless_audio_codecs": {
-        "truehd",
-        "dts-hd ma",
-        "dts-hd.ma",
-        "dts",
-        "flac",
-        "pcm_s16le",
-        "pcm_s24le",
-        "pcm_s32le",
-        "pcm_f32le",
-        "pcm_s16be",
-        "pcm_s24be",
-        "pcm_s32be",
-        "pcm_f32be",
-        "alac",
-    },
+    "lossless_audio_codecs": frozenset(
+        {
+            "truehd",
+            "dts-hd ma",
+            "dts-hd.ma",
+            "dts",
+            "flac",
+            "pcm_s16le",
+            "pcm_s24le",
+            "pcm_s32le",
+            "pcm_f32le",
+            "pcm_s16be",
+            "pcm_s24be",
+            "pcm_s32be",
+            "pcm_f32be",
+            "alac",
+        }
+    ),
     # Audio re-encoding: codecs/bitrates considered "bulky" (transcode to EAC-3)
     # - lossless codecs: always transcode (FLAC, PCM, DTS-HD MA, ALAC) — TrueHD
     #   stays passthrough because it carries Atmos object data the Sonos Arc decodes
@@ -196,7 +205,7 @@ DEFAULT_CONFIG = {
     # can watch the dub while adults pick the original + subtitles. Matched
     # case-insensitively against tmdb.director. Default: the Studio Ghibli
     # roster. Set audio_keep_english_with_original=True to apply this globally.
-    "dual_audio_directors": [
+    "dual_audio_directors": (
         "Hayao Miyazaki",
         "Isao Takahata",
         "Hiromasa Yonebayashi",
@@ -204,7 +213,7 @@ DEFAULT_CONFIG = {
         "Yoshifumi Kondo",
         "Hiroyuki Morita",
         "Michael Dudok de Wit",
-    ],
+    ),
     # Behaviour
     "overwrite_existing": False,
     "replace_original": True,  # Replace original on NAS after verify
@@ -272,15 +281,23 @@ DEFAULT_CONFIG = {
 REMUX_EXTENSIONS = {".m2ts", ".avi", ".wmv", ".ts", ".m2v", ".vob", ".mpg", ".mpeg", ".mp4"}
 
 
+def _copy_dicts(d: dict) -> dict:
+    """Copy every dict level of ``d``, sharing the leaves.
+
+    Stands in for ``copy.deepcopy(DEFAULT_CONFIG)``: the only collection
+    leaves in DEFAULT_CONFIG are a frozenset and a tuple, so the dicts are
+    the only thing a caller (or build_config's merge) can mutate.
+    """
+    return {k: _copy_dicts(v) if isinstance(v, dict) else v for k, v in d.items()}
+
+
 def build_config(overrides: dict | None = None) -> dict:
     """Build a config dict by merging DEFAULT_CONFIG with optional overrides.
 
     Overrides can contain top-level keys (e.g. "max_staging_bytes") or nested
     dicts (e.g. "cq": {"movie": {"1080p": 26}}) which are deep-merged.
     """
-    import copy
-
-    config = copy.deepcopy(DEFAULT_CONFIG)
+    config = _copy_dicts(DEFAULT_CONFIG)
     if not overrides:
         return config
     for key, value in overrides.items():
@@ -296,17 +313,28 @@ def build_config(overrides: dict | None = None) -> dict:
     return config
 
 
+# library_type values that take the series column of the per-content tables.
+_SERIES_LIBRARY_TYPES = frozenset({"series", "show", "tv", "anime"})
+
+
+# (resolution, is_hdr) -> res_key. HDR only splits the 4K tier; anything
+# not listed falls back to "SD".
+_RES_KEY_TABLE = {
+    ("4K", True): "4K_HDR",
+    ("4K", False): "4K_SDR",
+    **{(res, hdr): res for res in ("1080p", "720p", "480p", "SD") for hdr in (True, False)},
+}
+
+
 def get_res_key(item: dict) -> str:
-    """Derive a resolution key (e.g. '4K_HDR', '1080p') from a queue item."""
-    resolution = item.get("resolution", "1080p")
-    is_hdr = item.get("hdr", False)
-    if resolution == "4K" and is_hdr:
-        return "4K_HDR"
-    if resolution == "4K":
-        return "4K_SDR"
-    if resolution in ("1080p", "720p", "480p", "SD"):
-        return resolution
-    return "SD"
+    """Derive a resolution key (e.g. '4K_HDR', '1080p') from a queue item.
+
+    Single source of truth for the res_key classification —
+    ``resolve_encode_params`` calls this rather than carrying its own copy.
+    One dict lookup rather than a comparison ladder; it runs for every queue
+    item at categorisation and again per encode.
+    """
+    return _RES_KEY_TABLE.get((item.get("resolution", "1080p"), bool(item.get("hdr", False))), "SD")
 
 
 # Floor for the source-relative maxrate so a garbage/near-zero source bitrate
@@ -370,20 +398,8 @@ def resolve_encode_params(config: dict, item: dict) -> dict:
     """
     from pipeline.content_grade import target_cq
 
-    library_type = item.get("library_type", "movie")
-    content_type = "series" if library_type in ("series", "show", "tv", "anime") else "movie"
-    resolution = item.get("resolution", "1080p")
-    is_hdr = item.get("hdr", False)
-
-    # Build resolution key for config lookup
-    if resolution == "4K" and is_hdr:
-        res_key = "4K_HDR"
-    elif resolution == "4K":
-        res_key = "4K_SDR"
-    elif resolution in ("1080p", "720p", "480p", "SD"):
-        res_key = resolution
-    else:
-        res_key = "SD"
+    content_type = "series" if item.get("library_type", "movie") in _SERIES_LIBRARY_TYPES else "movie"
+    res_key = get_res_key(item)
 
     base_cq = config["cq"].get(content_type, {}).get(res_key, 30)
     final_cq, content_grade, applied_offset = target_cq(base_cq, item)
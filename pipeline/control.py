@@ -7,11 +7,30 @@ Pause: pause.json, pause_all.json, pause_fetch.json, pause_encode.json, or just
 Skip:  skip.json
 """
 
+import functools
 import json
 import logging
 import os
+import threading
 import time
-from typing import Optional
+from typing import Callable, Optional
+
+
+@functools.lru_cache(maxsize=65536)
+def _norm_path(filepath: str) -> str:
+    """``normpath().lower()`` comparison key for a filepath, memoised.
+
+    The fetch worker re-checks should_skip for every queued item on every
+    tick; the queue's paths don't change between ticks, so the pure-Python
+    normpath walk is done once per path rather than once per tick.
+    """
+    return os.path.normpath(filepath).lower()
+
+
+def _normalise_skip_paths(data: dict) -> frozenset[str]:
+    """skip.json ``paths`` as a frozenset of normpath().lower() strings."""
+    paths = data.get("paths", []) if isinstance(data, dict) else []
+    return frozenset(_norm_path(p) for p in paths if isinstance(p, str))
 
 
 class PipelineControl:
@@ -43,76 +62,194 @@ class PipelineControl:
         },
     }
 
+    # How long a missing root-level PAUSE flag is assumed to stay missing
+    # before being re-statted. Bounds pickup latency for that flag.
+    _ABSENT_TTL_SECS = 1.0
+
+    # Poll interval while paused. Bounds resume latency.
+    _RESUME_POLL_SECS = 1.0
+
+    # Coarsest directory-mtime resolution the snapshot must survive (FAT
+    # stores 2s; some SMB servers report whole seconds). See _control_names.
+    _DIR_MTIME_TICK_SECS = 2.0
+
+    # How long one pause-type answer is reused across workers. Well under
+    # the poll interval, so it doesn't change pause/resume semantics.
+    _PAUSE_MEMO_SECS = 0.25
+
     def __init__(self, staging_dir: str):
         self.control_dir = os.path.join(staging_dir, "control")
         os.makedirs(self.control_dir, exist_ok=True)
         self._last_read = {}
+        # path -> monotonic deadline until which the path is assumed absent.
+        self._absent_until: dict[str, float] = {}
+        # (control/ mtime_ns, names in control/, monotonic time that mtime
+        # was first seen, listed after its tick closed) — see _control_names.
+        self._dir_snapshot: Optional[tuple[int, frozenset[str], float, bool]] = None
+        # (monotonic time, pause type) — see _get_pause_type.
+        self._pause_memo: Optional[tuple[float, Optional[str]]] = None
         self._seed_persistent_files()
 
     def _seed_persistent_files(self):
-        """Create persistent control files with empty defaults if they don't exist yet."""
-        for name, default_data in self._PERSISTENT_FILES.items():
+        """Create persistent control files with empty defaults if they don't exist yet.
+
+        O_EXCL makes create-if-missing a single open: an existing file (the
+        normal case on every start after the first) fails fast with
+        FileExistsError and is never touched.
+        """
+        for name, blob in _PERSISTENT_BLOBS.items():
             path = os.path.join(self.control_dir, name)
-            if not os.path.exists(path):
-                with open(path, "w", encoding="utf-8") as f:
-                    json.dump(default_data, f, indent=4, ensure_ascii=False)
-                logging.info(f"Created control/{name} (edit to configure)")
+            try:
+                fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0))
+            except FileExistsError:
+                continue
+            with os.fdopen(fd, "wb") as f:
+                f.write(blob)
+            logging.info(f"Created control/{name} (edit to configure)")
 
-    def _find_control_file(self, canonical_name: str) -> Optional[tuple[str, dict]]:
-        """Find a control file by canonical name or any alias.
+    def _stat(self, path: str) -> Optional[os.stat_result]:
+        """``os.stat(path)``, or None if it doesn't exist.
 
-        Returns (filepath, implicit_data) or None. Aliases carry implicit data
-        so the file can be empty or minimal.
+        Misses are remembered for ``_ABSENT_TTL_SECS``: the legacy PAUSE flag
+        lives in the staging root (outside control/, so the directory snapshot
+        doesn't cover it) and is probed on every GPU dispatch and fetch tick.
+        A freshly dropped PAUSE file is picked up within the TTL.
         """
-        # Check canonical name first
-        path = os.path.join(self.control_dir, canonical_name)
-        if os.path.exists(path):
-            return (path, {})
-
-        # Check aliases
-        for alias, (canon, implicit) in self._ALIASES.items():
-            if canon == canonical_name:
-                alias_path = os.path.join(self.control_dir, alias)
-                if os.path.exists(alias_path):
-                    return (alias_path, implicit)
+        now = time.monotonic()
+        if self._absent_until.get(path, 0.0) > now:
+            return None
+        try:
+            st = os.stat(path)
+        except OSError:
+            self._absent_until[path] = now + self._ABSENT_TTL_SECS
+            return None
+        self._absent_until.pop(path, None)
+        return st
+
+    def _control_names(self) -> Optional[frozenset[str]]:
+        """Names present in control/, re-listed only when the directory changes.
+
+        Creating, deleting or renaming an entry bumps the directory's mtime,
+        so one stat of control/ answers "which control files exist" for every
+        canonical name and alias at once. None if the directory can't be
+        read — callers then fall back to statting each candidate.
+
+        On a coarse-mtime filesystem (FAT, some SMB shares) a second file
+        created in the same tick as the listing leaves the mtime unchanged,
+        so an unchanged mtime is only trusted once the snapshot was listed
+        ``_DIR_MTIME_TICK_SECS`` after that mtime was first seen — by then
+        its tick has closed and any later change would move the mtime.
+        Until then every check re-lists. Timed on the local monotonic clock,
+        so clock skew against the NAS doesn't matter.
+        """
+        now = time.monotonic()
+        try:
+            dir_mtime = os.stat(self.control_dir).st_mtime_ns
+            snap = self._dir_snapshot
+            if snap is not None and snap[0] == dir_mtime:
+                if snap[3]:
+                    return snap[1]
+                first_seen = snap[2]
+            else:
+                first_seen = now
+            with os.scandir(self.control_dir) as it:
+                names = frozenset(entry.name for entry in it)
+        except OSError:
+            return None
+        tick_closed = now - first_seen >= self._DIR_MTIME_TICK_SECS
+        self._dir_snapshot = (dir_mtime, names, first_seen, tick_closed)
+        return names
 
+    def _find_control_file(self, canonical_name: str) -> Optional[tuple[str, dict, os.stat_result]]:
+        """Find a control file by canonical name or any alias.
+
+        Returns (filepath, implicit_data, stat_result) or None. Aliases carry
+        implicit data so the file can be empty or minimal. The stat result is
+        handed on so the reader doesn't stat the file again. Candidates not in
+        the directory snapshot are skipped without a syscall.
+        """
+        names = self._control_names()
+        candidates = [(canonical_name, {})]
+        candidates += [(alias, implicit) for alias, (canon, implicit) in self._ALIASES.items() if canon == canonical_name]
+        for name, implicit in candidates:
+            if names is not None and name not in names:
+                continue
+            path = os.path.join(self.control_dir, name)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            return (path, implicit, st)
         return None
 
-    def _read_control_file(self, canonical_name: str) -> Optional[dict]:
-        """Read and parse a control JSON file (or alias). Returns None if missing."""
+    def _read_control_file(
+        self, canonical_name: str, derive: Optional[Callable[[dict], object]] = None
+    ) -> Optional[object]:
+        """Read and parse a control JSON file (or alias). Returns None if missing.
+
+        With ``derive``, returns ``derive(data)`` instead of the raw dict. The
+        derived value is memoised in the ``_last_read`` entry next to the
+        parsed data, so it's rebuilt only when the file's mtime changes.
+        """
         found = self._find_control_file(canonical_name)
         if not found:
             return None
 
-        path, implicit_data = found
+        path, implicit_data, st = found
         try:
-            mtime = os.path.getmtime(path)
+            mtime = st.st_mtime
             cache_key = path
-            if self._last_read.get(cache_key, {}).get("mtime") == mtime:
-                return self._last_read[cache_key].get("data")
+            cached = self._last_read.get(cache_key)
+            if cached is not None and cached.get("mtime") == mtime:
+                if derive is None:
+                    return cached.get("data")
+                if "derived" not in cached:
+                    cached["derived"] = derive(cached.get("data") or {})
+                return cached["derived"]
 
             # Allow empty files — just the presence is enough
-            size = os.path.getsize(path)
-            if size == 0:
+            if st.st_size == 0:
                 data = {}
             else:
-                with open(path, "r", encoding="utf-8") as f:
-                    data = json.load(f)
+                # Bytes straight into json.loads: no text-mode decode pass,
+                # and json's own encoding detection accepts the UTF-8 BOM
+                # Notepad writes, which text-mode "utf-8" rejected.
+                with open(path, "rb") as f:
+                    data = json.loads(f.read())
 
             # Merge implicit data from alias (alias values take priority for type fields)
             merged = {**data, **implicit_data}
-            self._last_read[cache_key] = {"mtime": mtime, "data": merged}
-            return merged
-        except (json.JSONDecodeError, OSError) as e:
+            entry = {"mtime": mtime, "data": merged}
+            self._last_read[cache_key] = entry
+            if derive is None:
+                return merged
+            entry["derived"] = derive(merged)
+            return entry["derived"]
+        except (ValueError, OSError) as e:
             logging.warning(f"Control file {os.path.basename(path)} unreadable: {e}")
             # If the alias carries implicit data, still honour it (file might just be empty/malformed)
             if implicit_data:
-                return implicit_data
+                return implicit_data if derive is None else derive(implicit_data)
             return None
 
     def _get_pause_type(self) -> Optional[str]:
-        """Get the current pause type, or None if not paused."""
-        if os.path.exists(os.path.join(os.path.dirname(self.control_dir), "PAUSE")):
+        """Get the current pause type, or None if not paused.
+
+        Memoised for ``_PAUSE_MEMO_SECS``: the GPU, fetch and prep workers
+        each ask at every file boundary, often within the same instant, and
+        the answer only changes when the user drops or deletes a file.
+        """
+        now = time.monotonic()
+        memo = self._pause_memo
+        if memo is not None and now - memo[0] < self._PAUSE_MEMO_SECS:
+            return memo[1]
+        pause_type = self._read_pause_type()
+        self._pause_memo = (now, pause_type)
+        return pause_type
+
+    def _read_pause_type(self) -> Optional[str]:
+        """Uncached body of :meth:`_get_pause_type`."""
+        if self._stat(os.path.join(os.path.dirname(self.control_dir), "PAUSE")) is not None:
             return "all"
         pause = self._read_control_file("pause.json")
         if pause is None:
@@ -134,10 +271,29 @@ class PipelineControl:
             pt = self._get_pause_type()
             if pt not in ("all", "encode_only"):
                 break
-            time.sleep(5)
+            time.sleep(self._RESUME_POLL_SECS)
         if not shutdown_flag():
             logging.info("Resumed.")
 
+    def wait_for_encode_resume(self, shutdown: threading.Event) -> bool:
+        """Block the calling GPU worker while encode is paused.
+
+        Waits on ``shutdown`` between polls, so a SIGTERM wakes the worker
+        immediately rather than after the poll interval. Returns True if the
+        worker was actually held.
+
+        Polls at ``_RESUME_POLL_SECS`` (1s) rather than the old 5s: each poll
+        is at most a few stats — misses are negatively cached — so resuming
+        from a gaming session costs under a second instead of up to five.
+        Native change notifications (inotify / ReadDirectoryChangesW) would
+        need a platform dependency for a saving of a few stats per second.
+        """
+        if not self.is_encode_paused():
+            return False
+        while not shutdown.is_set() and self.is_encode_paused():
+            shutdown.wait(timeout=self._RESUME_POLL_SECS)
+        return True
+
     def is_fetch_paused(self) -> bool:
         """Check if fetching specifically is paused.
 
@@ -161,16 +317,46 @@ class PipelineControl:
         pt = self._get_pause_type()
         return pt in ("all", "encode_only")
 
+    def _skip_set(self) -> frozenset[str]:
+        """Normalised (normpath + lower) skip-list paths, cached per skip.json mtime.
+
+        should_skip is called once per queue item by the fetch worker and
+        build_queues; re-normalising every skip entry on every call made a
+        full queue pass O(queue x skip list) in string work.
+        """
+        skip_set = self._read_control_file("skip.json", derive=_normalise_skip_paths)
+        return skip_set if skip_set is not None else frozenset()
+
     def should_skip(self, filepath: str) -> bool:
         """Check if a file is in the skip list."""
-        skip = self._read_control_file("skip.json")
-        if not skip:
+        skip_set = self._skip_set()
+        if not skip_set:
             return False
-        skip_paths = skip.get("paths", [])
-        # Normalize for comparison
-        norm = os.path.normpath(filepath).lower()
-        return any(os.path.normpath(p).lower() == norm for p in skip_paths)
+        return _norm_path(filepath) in skip_set
+
+    def skip_checker(self) -> Callable[[str], bool]:
+        """``should_skip`` bound to one read of skip.json, for queue-wide loops.
+
+        Each should_skip call re-stats control/ and skip.json to validate the
+        cache. A loop over the whole queue takes the skip set once up front;
+        the loop is short enough that a skip.json edit landing mid-loop is
+        simply picked up on the next one.
+        """
+        skip_set = self._skip_set()
+        if not skip_set:
+            return lambda _filepath: False
+        return lambda filepath: _norm_path(filepath) in skip_set
 
     def apply_queue_overrides(self, queue: list[dict]) -> list[dict]:
         """Apply skip overrides to the queue."""
-        return [item for item in queue if not self.should_skip(item["filepath"])]
+        skip_set = self._skip_set()
+        if not skip_set:
+            return list(queue)
+        return [item for item in queue if _norm_path(item["filepath"]) not in skip_set]
+
+
+# Default file contents, serialised once at import — they never change.
+_PERSISTENT_BLOBS = {
+    name: json.dumps(data, indent=4, ensure_ascii=False).encode("utf-8")
+    for name, data in PipelineControl._PERSISTENT_FILES.items()
+}
@@ -0,0 +1,46 @@
+"""Substring matcher shared by the per-title exclusion lists.
+
+subs_exclusion (subs_optional.json) and audio_exclusion (audio_foreign_ok.json)
+both hold a user-edited list of plain, case-insensitive substrings matched
+against the full filepath. Both compile that list into one regex alternation
+through :func:`cached_matcher`, so the two can't drift in how they match.
+"""
+
+from __future__ import annotations
+
+import re
+
+
+def minimal_patterns(patterns: tuple[str, ...]) -> list[str]:
+    """Drop duplicates and every pattern that contains another pattern.
+
+    A pattern that contains another can never change a substring match
+    ("puffin rock" already matches wherever "puffin rock s01" would), so the
+    minimal set matches exactly the same paths with fewer alternation
+    branches for the regex engine to try at every position of every path.
+    Shortest first, so each pattern is only checked against shorter ones.
+    """
+    kept: list[str] = []
+    for p in sorted(set(patterns), key=len):
+        if not any(k in p for k in kept):
+            kept.append(p)
+    return kept
+
+
+def cached_matcher(cache: dict, patterns: tuple[str, ...]) -> re.Pattern | None:
+    """Compiled substring matcher for ``patterns``, or None if there are none.
+
+    ``patterns`` are already lowercased (callers lowercase the path too). The
+    alternation is built from the ``re.escape``d :func:`minimal_patterns`, so
+    matching stays plain substring semantics.
+
+    The compiled pattern is kept in ``cache`` (the caller's mtime cache, keys
+    ``matcher`` / ``matcher_for``) and rebuilt only when the caller's loader
+    hands back a new tuple.
+    """
+    if not patterns:
+        return None
+    if cache.get("matcher_for") is not patterns:
+        cache["matcher"] = re.compile("|".join(re.escape(p) for p in minimal_patterns(patterns)))
+        cache["matcher_for"] = patterns
+    return cache["matcher"]
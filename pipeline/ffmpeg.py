@@ -2,6 +2,7 @@
 Extracted from encoding.py — pure functions that build ffmpeg commands.
 No state management, no file I/O beyond ffprobe queries."""
 
+import functools
 import json
 import logging
 import os
@@ -42,11 +43,16 @@ def format_bytes(b: int) -> str:
 
 
 def format_duration(secs: float) -> str:
-    if secs < 60:
-        return f"{secs:.0f}s"
-    if secs < 3600:
-        return f"{secs / 60:.0f}m {secs % 60:.0f}s"
-    return f"{secs / 3600:.0f}h {(secs % 3600) / 60:.0f}m"
+    # Whole seconds + divmod: ``secs / 60`` formatted with ``:.0f`` rounds the
+    # leading unit, so 90s read "2m 30s" and 5400s read "2h 30m".
+    total = int(round(secs))
+    if total < 60:
+        return f"{total}s"
+    if total < 3600:
+        m, s = divmod(total, 60)
+        return f"{m}m {s}s"
+    h, rem = divmod(total, 3600)
+    return f"{h}h {rem // 60}m"
 
 
 def _probe_source_color(input_path: str) -> dict[str, Optional[str]]:
@@ -108,24 +114,43 @@ def _probe_source_color(input_path: str) -> dict[str, Optional[str]]:
     }
 
 
-def get_duration(filepath: str) -> Optional[float]:
-    """Get file duration via ffprobe."""
+@functools.lru_cache(maxsize=1024)
+def _probe_duration(filepath: str, mtime_ns: int, size: int) -> float:
+    """ffprobe ``format.duration`` for one version of a file; raises on failure.
+
+    ``mtime_ns``/``size`` are only part of the cache key — a rewritten file
+    is a new entry. Failures raise rather than return, so lru_cache never
+    remembers a transient SMB error as the file's answer.
+    """
+    cmd = [
+        "ffprobe",
+        "-v",
+        "quiet",
+        "-show_entries",
+        "format=duration",
+        "-of",
+        "csv=p=0",
+        filepath,
+    ]
+    result = subprocess.run(cmd, capture_output=True, text=True, timeout=30, encoding="utf-8", errors="replace")
+    if result.returncode != 0:
+        raise RuntimeError(f"ffprobe exit {result.returncode}")
     try:
-        cmd = [
-            "ffprobe",
-            "-v",
-            "quiet",
-            "-print_format",
-            "json",
-            "-show_format",
-            str(filepath),
-        ]
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=30, encoding="utf-8", errors="replace")
-        if result.returncode == 0:
-            import json
+        return float(result.stdout.strip())
+    except ValueError:
+        # Container without a duration ("N/A"): same 0.0 the JSON path gave.
+        return 0.0
+
+
+def get_duration(filepath: str) -> Optional[float]:
+    """Get file duration via ffprobe.
 
-            data = json.loads(result.stdout)
-            return float(data.get("format", {}).get("duration", 0))
+    Cached per (path, mtime, size): the verify step and retries re-ask about
+    files that haven't changed, and each ask is an ffprobe process.
+    """
+    try:
+        st = os.stat(filepath)
+        return _probe_duration(str(filepath), st.st_mtime_ns, st.st_size)
     except Exception as e:
         logging.debug(f"ffprobe duration failed for {filepath}: {e}")
     return None
@@ -470,6 +495,7 @@ def build_ffmpeg_cmd(
     include_subs: bool = True,
     external_subs: list[str] | None = None,
     use_hwaccel: bool = True,
+    params: dict | None = None,
 ) -> list[str]:
     """Build the ffmpeg command for NVENC AV1 encoding.
 
@@ -488,9 +514,13 @@ def build_ffmpeg_cmd(
             attempt's stderr mentions CUDA/CUVID/NVDEC/hwaccel — NVDEC does not
             support every codec/profile (e.g. 10-bit H.264, MPEG-4 ASP), so we
             need a graceful fallback path.
+        params: Pre-resolved :func:`resolve_encode_params` output. Callers that
+            already hold it (the encode path and its retries) pass it so the
+            CQ override lookup isn't repeated; None resolves it here.
     """
     is_hdr = item.get("hdr", False)
-    params = resolve_encode_params(config, item)
+    if params is None:
+        params = resolve_encode_params(config, item)
 
     # REFUSE-TO-BUILD: zero-audio sources are either scanner false positives (fix
     # the scanner) or pre-existing damage (delete + re-source). Either way, never
@@ -582,6 +612,13 @@ def build_ffmpeg_cmd(
     # with use_hwaccel=False before falling through to the subtitle / audio retries.
     if use_hwaccel:
         cmd.extend(["-hwaccel", "cuda", "-hwaccel_output_format", "cuda"])
+    else:
+        # Software decode is the one CPU-heavy part of an NVENC encode. An
+        # optional cap keeps it from competing with the prep worker for every
+        # core; must precede -i to apply to the decoder.
+        sw_threads = int(config.get("sw_decode_threads", 0) or 0)
+        if sw_threads > 0:
+            cmd.extend(["-filter_threads", str(sw_threads), "-threads", str(sw_threads)])
 
     cmd.extend(
         [
@@ -8,7 +8,6 @@ No handoffs between threads. No intermediate states. One file, one thread,
 start to finish.
 """
 
-import hashlib
 import json
 import logging
 import os
@@ -16,10 +15,11 @@ import re
 import subprocess
 import threading
 import time
+from collections import deque
 from pathlib import Path
 
 from paths import PLEX_TOKEN, PLEX_URL
-from pipeline.config import REMUX_EXTENSIONS, get_res_key, resolve_encode_params
+from pipeline.config import REMUX_EXTENSIONS, resolve_encode_params
 from pipeline.ffmpeg import (
     _remux_to_mkv,
     build_ffmpeg_cmd,
@@ -32,6 +32,7 @@ from pipeline.report import remove_entry, update_entry
 from pipeline.state import FileStatus, PipelineState, is_terminal
 from pipeline.streams import is_hi_external
 from pipeline.subs import scan_sidecars
+from pipeline.transfer import staging_prefix
 
 
 def _probe_full(path: str) -> dict:
@@ -211,6 +212,7 @@ def prepare_for_encode(
     config: dict,
     state: PipelineState,
     staging_dir: str,
+    shutdown: threading.Event | None = None,
 ) -> dict | None:
     """Run all non-GPU prep steps so the GPU worker can dive straight into encoding.
 
@@ -245,13 +247,16 @@ def prepare_for_encode(
     this idempotence safe against concurrent callers — the second one
     in queues on the lock, then short-circuits on prep_done when the
     first finishes.
+
+    ``shutdown`` (the orchestrator's event) cuts the step-1 wait for fetch
+    short when set; without it that wait polls on a plain sleep.
     """
     # Serialise per-filepath. Other callers (a parallel prep worker, or
     # _encode_only's stale-prep fallback) queue on the same Lock; the
     # idempotence check immediately below the lock short-circuits the
     # one(s) that woke up second.
     with _get_prep_lock(filepath):
-        return _prepare_for_encode_locked(filepath, item, config, state, staging_dir)
+        return _prepare_for_encode_locked(filepath, item, config, state, staging_dir, shutdown)
 
 
 def _prepare_for_encode_locked(
@@ -260,6 +265,7 @@ def _prepare_for_encode_locked(
     config: dict,
     state: PipelineState,
     staging_dir: str,
+    shutdown: threading.Event | None = None,
 ) -> dict | None:
     """Body of prepare_for_encode, called under the per-filepath lock.
 
@@ -327,7 +333,15 @@ def _prepare_for_encode_locked(
                 if waited >= max_wait_secs:
                     logging.error(f"prep: gave up waiting for fetch after {waited}s (status={status}): {filename}")
                     return None
-                time.sleep(2)
+                # Wait on the caller's shutdown event when given, so a stopping
+                # prep worker leaves now rather than at the end of its 30-minute
+                # wait for a fetch that the (also stopping) fetch worker won't do.
+                if shutdown is not None:
+                    if shutdown.wait(2):
+                        logging.info(f"prep: shutdown while waiting for fetch: {filename}")
+                        return None
+                else:
+                    time.sleep(2)
                 waited += 2
                 if waited % 120 == 0 and status != FileStatus.FETCHING.value:
                     logging.warning(
@@ -564,6 +578,14 @@ def _prepare_for_encode_locked(
             # _cleanup call already covers. What DID leak is the new stripped
             # sibling; see stripped_leftover in _encode_only.
             actual_input = stripped_input
+            # A remux output is now a dead intermediate: nothing reads it
+            # again, but it used to sit in staging (a full copy of the
+            # source) until the encode finished — hours later with
+            # prep running up to prep_buffer_max files ahead. Drop it now.
+            # The fetched local_path is kept; the later _cleanup calls
+            # tolerate the remux path being gone.
+            if remuxed_path:
+                _cleanup(remuxed_path)
             # Re-probe so item.audio_streams / subtitle_streams reflect
             # the now-stripped input. The encoder's stream selector
             # will see the trimmed lists and won't need to re-strip.
@@ -612,7 +634,7 @@ def _prepare_for_encode_locked(
         encode_dir = os.path.join(staging_dir, "encoded")
         os.makedirs(encode_dir, exist_ok=True)
         out_stem = Path(clean_name).stem if clean_name else Path(filename).stem
-        safe_prefix = hashlib.md5(filepath.encode()).hexdigest()[:12]
+        safe_prefix = staging_prefix(filepath)
         output_path = os.path.join(encode_dir, f"{safe_prefix}_{out_stem}.mkv")
 
         prep_data = {
@@ -737,6 +759,37 @@ def full_gamut(
         return False
 
 
+def _move_encode_into_place(filepath: str, dest_path: str, final_path: str, backup_path: str) -> None:
+    """Park the source as ``backup_path`` and move the uploaded encode onto ``final_path``.
+
+    Acts and catches rather than checking first, except for the backup
+    guard: on POSIX ``os.rename`` silently overwrites, which would replace
+    a re-encode's truly-original .bak with the previous AV1. A source that's
+    already gone is skipped, as is a ``dest_path`` that was never uploaded;
+    any other failure raises.
+    """
+    if not os.path.exists(backup_path):
+        try:
+            os.rename(filepath, backup_path)
+        except FileNotFoundError:
+            pass
+    try:
+        os.replace(dest_path, final_path)
+    except FileNotFoundError:
+        # The target folder going missing also lands here — only a missing
+        # dest_path is the skip.
+        if os.path.exists(dest_path):
+            raise
+        return
+    logging.info(f"  Replaced: {os.path.basename(final_path)} (backup kept for verification)")
+
+
+def _partial_output_path(output_path: str) -> str:
+    """In-progress name for an encode: ``x.mkv`` -> ``x.part.mkv``."""
+    root, ext = os.path.splitext(output_path)
+    return f"{root}.part{ext}"
+
+
 def _with_cq(cmd: list[str], cq: int) -> list[str]:
     """Return a copy of an ffmpeg command with the ``-cq`` value replaced.
 
@@ -880,6 +933,9 @@ def _encode_only(
         if eng_external:
             logging.info(f"  Muxing {len(eng_external)} external English subtitle(s) (cached)")
 
+        # Resolved once and threaded through: it reads the per-file CQ override
+        # from the state DB, so every rebuild used to cost a SQLite round-trip.
+        params = resolve_encode_params(config, item)
         cmd = build_ffmpeg_cmd(
             actual_input,
             output_path,
@@ -887,12 +943,11 @@ def _encode_only(
             config,
             include_subs=True,
             external_subs=eng_external or None,
+            params=params,
         )
 
         encode_start = time.time()
         logging.info("  Encoding (post-prep): AV1 + EAC-3 audio + strip foreign tracks")
-        get_res_key(item)
-        params = resolve_encode_params(config, item)
         logging.info(
             f"  {library_type.upper()} | {item.get('resolution', '?')} | "
             f"HDR: {item.get('hdr', False)} | CQ: {params.get('cq', '?')} | "
@@ -913,6 +968,7 @@ def _encode_only(
                     filepath,
                     result_out=encode_info,
                     external_subs=eng_external,
+                    params=params,
                 )
         else:
             success = _run_encode(
@@ -925,6 +981,7 @@ def _encode_only(
                 filepath,
                 result_out=encode_info,
                 external_subs=eng_external,
+                params=params,
             )
         if not success:
             _cleanup(local_path, remuxed_path, output_path, stripped_leftover)
@@ -1001,6 +1058,7 @@ def _encode_only(
                         filepath,
                         result_out=encode_info,
                         external_subs=eng_external,
+                        params={**params, "cq": _retry_cq},
                     )
             else:
                 success = _run_encode(
@@ -1013,6 +1071,7 @@ def _encode_only(
                     filepath,
                     result_out=encode_info,
                     external_subs=eng_external,
+                    params={**params, "cq": _retry_cq},
                 )
             if not success:
                 _cleanup(local_path, remuxed_path, output_path, stripped_leftover)
@@ -1141,6 +1200,22 @@ def _purge_stale_source_path(filepath: str, final_path: str, state: PipelineStat
     return True
 
 
+def _source_report_entry(filepath: str, final_path: str) -> dict | None:
+    """media_report entry for ``filepath`` (or ``final_path``), or None.
+
+    One parse of the report; never raises — a missing or unreadable report
+    only costs the callers their optional enrichment.
+    """
+    try:
+        from paths import MEDIA_REPORT  # noqa: PLC0415
+        from server.helpers import read_json_safe  # noqa: PLC0415
+
+        report = read_json_safe(MEDIA_REPORT) or {}
+        return next((f for f in report.get("files", []) if f.get("filepath") in (filepath, final_path)), None)
+    except Exception:
+        return None
+
+
 def finalize_upload(filepath: str, state: PipelineState, config: dict) -> bool:
     """Upload encoded file to NAS, verify, replace original, tag, report, Plex.
 
@@ -1355,6 +1430,13 @@ def finalize_upload(filepath: str, state: PipelineState, config: dict) -> bool:
                 )
             return False
 
+    # The source's media_report entry, read once: the compliance check below
+    # wants its tmdb / library_type, and the history record at the end wants
+    # its source stream info. Re-reading for the history was a second parse
+    # of the whole report, and came after update_entry / the stale-path purge
+    # had replaced the entry with the OUTPUT's probe.
+    _entry = _source_report_entry(filepath, final_path)
+
     # === Standards compliance check (single source of truth) ===
     # Replaces the previous inline standards block. All checks live in
     # pipeline.compliance.check_compliance(), the same function the audit
@@ -1372,19 +1454,6 @@ def finalize_upload(filepath: str, state: PipelineState, config: dict) -> bool:
         from pipeline.compliance import Category, categorise, check_compliance
         from pipeline.compliance_fixers import FIXERS
 
-        # Resolve item from media_report so it has tmdb/library_type for the check.
-        try:
-            from paths import MEDIA_REPORT  # noqa: PLC0415
-            from server.helpers import read_json_safe  # noqa: PLC0415
-
-            _report = read_json_safe(MEDIA_REPORT) or {}
-            _entry = next(
-                (f for f in _report.get("files", []) if f.get("filepath") in (filepath, final_path)),
-                None,
-            )
-        except Exception:
-            _entry = None
-
         # Build the item shape compliance expects. ``finalize_upload`` doesn't
         # have ``item`` in scope (the queue item is consumed by ``full_gamut``
         # earlier and not threaded through to upload) — only the state DB
@@ -1731,7 +1800,8 @@ def finalize_upload(filepath: str, state: PipelineState, config: dict) -> bool:
     try:
         result = subprocess.run(
             ["ffmpeg", "-v", "error", "-hide_banner", "-i", dest_path, "-t", "10", "-f", "null", "-"],
-            capture_output=True,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
             text=True,
             timeout=60,
             encoding="utf-8",
@@ -1815,14 +1885,15 @@ def finalize_upload(filepath: str, state: PipelineState, config: dict) -> bool:
     # absent. Bad Batch S03 had 4 episodes stuck in this exact loop.
     backup_path = filepath + ".original.bak"
     try:
-        if os.path.exists(final_path) and final_path != filepath:
-            os.remove(final_path)
-            logging.info(f"  Removed existing target: {final_name}")
-        if os.path.exists(filepath) and not os.path.exists(backup_path):
-            os.rename(filepath, backup_path)
-        if os.path.exists(dest_path):
-            os.replace(dest_path, final_path)
-            logging.info(f"  Replaced: {final_name} (backup kept for verification)")
+        if final_path != filepath:
+            # Remove-and-catch rather than exists-then-remove: one SMB round
+            # trip instead of two, and no window between the check and the act.
+            try:
+                os.remove(final_path)
+                logging.info(f"  Removed existing target: {final_name}")
+            except FileNotFoundError:
+                pass
+        _move_encode_into_place(filepath, dest_path, final_path, backup_path)
         # NOTE: backup deleted at the end of finalize_upload after all
         # post-replace verification passes. Kept in place during the
         # filename / TMDb / sidecar steps so any early-return rollback
@@ -1962,15 +2033,16 @@ def finalize_upload(filepath: str, state: PipelineState, config: dict) -> bool:
     # roughly-source-sized files indefinitely. Failures here don't fail
     # the encode — at worst we leave one bak behind that the next bulk
     # purge picks up.
-    if os.path.exists(backup_path):
-        try:
-            bak_size = os.path.getsize(backup_path)
-            os.remove(backup_path)
-            logging.info(f"  Removed backup: {os.path.basename(backup_path)} ({format_bytes(bak_size)} freed)")
-        except OSError as e:
-            logging.warning(
-                f"  Backup removal failed for {os.path.basename(backup_path)}: {e} — leaving for the next bulk purge"
-            )
+    try:
+        bak_size = os.path.getsize(backup_path)
+        os.remove(backup_path)
+        logging.info(f"  Removed backup: {os.path.basename(backup_path)} ({format_bytes(bak_size)} freed)")
+    except FileNotFoundError:
+        pass  # no backup taken (fresh encode with the source already gone)
+    except OSError as e:
+        logging.warning(
+            f"  Backup removal failed for {os.path.basename(backup_path)}: {e} — leaving for the next bulk purge"
+        )
 
     # === DONE ===
     # Clear the duration_retry_count on success — a file that retried once and then
@@ -2014,12 +2086,13 @@ def finalize_upload(filepath: str, state: PipelineState, config: dict) -> bool:
     _purge_stale_source_path(filepath, final_path, state)
 
     # Update global stats
-    state.stats["completed"] = state.stats.get("completed", 0) + 1
-    state.stats["bytes_saved"] = state.stats.get("bytes_saved", 0) + saved
-    state.stats["total_encode_time_secs"] = state.stats.get("total_encode_time_secs", 0) + encode_time
-    state.stats["total_source_size_bytes"] = state.stats.get("total_source_size_bytes", 0) + input_size
-    state.stats["total_content_duration_secs"] = state.stats.get("total_content_duration_secs", 0) + input_duration
-    state.save()
+    state.add_stats(
+        completed=1,
+        bytes_saved=saved,
+        total_encode_time_secs=encode_time,
+        total_source_size_bytes=input_size,
+        total_content_duration_secs=input_duration,
+    )
 
     # === Append to encode_history.jsonl (what the dashboard + audits read) ===
     # Rich record: source stream info (from media_report + item) + output stream info
@@ -2028,15 +2101,9 @@ def finalize_upload(filepath: str, state: PipelineState, config: dict) -> bool:
     try:
         from datetime import datetime, timezone
 
-        from paths import MEDIA_REPORT, STAGING_DIR
-        from server.helpers import read_json_safe
+        from paths import STAGING_DIR
 
-        report = read_json_safe(MEDIA_REPORT) or {}
-        report_entry: dict = {}
-        for f in report.get("files", []):
-            if f.get("filepath") == filepath or f.get("filepath") == final_path:
-                report_entry = f
-                break
+        report_entry: dict = _entry or {}
         report_video = report_entry.get("video", {}) or {}
 
         fetch_time = entry.get("fetch_time_secs") or 0
@@ -2155,6 +2222,7 @@ def _run_encode(
     filepath: str,
     result_out: dict | None = None,
     external_subs: list | None = None,
+    params: dict | None = None,
 ) -> bool:
     """Execute the ffmpeg encode command with up to three attempts.
 
@@ -2165,6 +2233,10 @@ def _run_encode(
     Progress is parsed from stderr (frame=/fps=/time=/speed= lines) and pushed into
     pipeline state so the dashboard can show live % / speed / ETA per file.
 
+    `params` is the resolved encode-params dict ``cmd`` was built from. The
+    no_hwaccel / no_subs fallbacks rebuild the command with it, so a bloat
+    retry at a raised CQ keeps that CQ on its fallbacks too.
+
     If `result_out` is provided, on success it is populated with:
         retry_mode        — "none" | "no_subs" | "audio_copy"
         attempts          — number of attempts taken (1..3)
@@ -2188,6 +2260,15 @@ def _run_encode(
     attempts_total = 4
     duration_secs = item.get("duration_seconds") or 0
 
+    # ffmpeg writes to a ".part.mkv" sibling that is renamed onto output_path
+    # only after a clean exit, so a file at output_path is always a finished
+    # encode. A crash or kill mid-encode leaves the .part file, which the
+    # startup staging sweep removes as an orphan (no state row references it)
+    # instead of preserving it under the live output_path. The extension stays
+    # .mkv so ffmpeg still picks the muxer from the name.
+    part_path = _partial_output_path(output_path)
+    cmd = [part_path if tok == output_path else tok for tok in cmd]
+
     for attempt in range(attempts_total):
         if attempt == 0:
             pass  # original cmd (hwaccel on by default)
@@ -2199,15 +2280,16 @@ def _run_encode(
             # from disk too. Subtitle gone from both places. (2026-07-25)
             cmd = build_ffmpeg_cmd(
                 input_path,
-                output_path,
+                part_path,
                 item,
                 config,
                 use_hwaccel=False,
                 external_subs=external_subs or None,
+                params=params,
             )
             logging.warning("  Retrying with software decode (NVDEC incompatible source)")
         elif retry_mode == "no_subs":
-            cmd = build_ffmpeg_cmd(input_path, output_path, item, config, include_subs=False)
+            cmd = build_ffmpeg_cmd(input_path, part_path, item, config, include_subs=False, params=params)
             logging.warning("  Retrying without subtitles")
         elif retry_mode == "audio_copy":
             cmd = _build_audio_copy_cmd(cmd)
@@ -2242,7 +2324,7 @@ def _run_encode(
             output_growth_stop = threading.Event()
             output_growth_thread = threading.Thread(
                 target=_output_growth_watchdog,
-                args=(process, output_path, output_growth_stop, stall_secs),
+                args=(process, part_path, output_growth_stop, stall_secs),
                 daemon=True,
             )
             output_growth_thread.start()
@@ -2253,15 +2335,15 @@ def _run_encode(
                 output_growth_thread.join(timeout=5)
 
             if process.returncode == 0:
-                if not os.path.exists(output_path):
+                if not os.path.exists(part_path):
                     continue
+                os.replace(part_path, output_path)
                 if result_out is not None:
                     result_out["retry_mode"] = retry_mode
                     result_out["attempts"] = attempt + 1
                 return True
 
-            if os.path.exists(output_path):
-                os.remove(output_path)
+            _cleanup(part_path)
 
             stderr_low = stderr.lower()
             # NVDEC decode failure — retry with software decode (libavcodec).
@@ -2313,8 +2395,7 @@ def _run_encode(
         except Exception as e:
             logging.error(f"  Encode exception: {e}")
             state.set_file(filepath, FileStatus.ERROR, error=str(e), stage="encoding")
-            if os.path.exists(output_path):
-                os.remove(output_path)
+            _cleanup(part_path)
             return False
 
     state.set_file(filepath, FileStatus.ERROR, error="encode failed after retries", stage="encoding")
@@ -2380,6 +2461,48 @@ def _output_growth_watchdog(
             return
 
 
+# ffmpeg stderr kept per encode attempt. The head carries the banner, stream
+# mapping and startup errors; the tail carries the failure that ended the run.
+# A multi-hour encode repeating one warning per packet used to grow the buffer
+# without bound.
+_STDERR_HEAD_LINES = 200
+_STDERR_TAIL_LINES = 200
+# Substrings _run_encode's retry selection looks for ANYWHERE in stderr. One
+# trimmed middle line per marker is kept so trimming never changes a retry.
+_STDERR_RETRY_MARKERS = ("subtitle", "codec none", "non-monotonic dts", "non monotonic dts")
+
+
+def _collect_stderr(stream) -> str:
+    """Read ``stream`` to EOF and return a bounded copy of it.
+
+    Keeps the first ``_STDERR_HEAD_LINES`` and last ``_STDERR_TAIL_LINES``
+    lines verbatim, replaces the middle with an omission marker, and keeps
+    the first middle line carrying each ``_STDERR_RETRY_MARKERS`` entry.
+    """
+    head: list[str] = []
+    tail: deque[str] = deque(maxlen=_STDERR_TAIL_LINES)
+    marker_lines: dict[str, str] = {}
+    omitted = 0
+    for raw in iter(stream.readline, ""):
+        if not raw:
+            break
+        line = raw.rstrip("\n")
+        if len(head) < _STDERR_HEAD_LINES:
+            head.append(line)
+            continue
+        if len(tail) == _STDERR_TAIL_LINES:
+            evicted = tail[0]
+            evicted_low = evicted.lower()
+            for marker in _STDERR_RETRY_MARKERS:
+                if marker not in marker_lines and marker in evicted_low:
+                    marker_lines[marker] = evicted
+            omitted += 1
+        tail.append(line)
+    middle = [f"[... {omitted} stderr lines omitted ...]"] if omitted else []
+    kept = dict.fromkeys(marker_lines.values())
+    return "\n".join(head + middle + list(kept) + list(tail))
+
+
 def _stream_encode_progress(process, state: PipelineState, filepath: str, duration_secs: float) -> str:
     """Consume ffmpeg's stable `-progress pipe:1` key=value output on stdout, emit state updates.
 
@@ -2393,17 +2516,16 @@ def _stream_encode_progress(process, state: PipelineState, filepath: str, durati
     Enforces a wall-clock deadline of ``max(1800, duration_secs * 10)`` seconds. A hung
     ffmpeg used to block a GPU worker forever; now we kill the process and return the
     captured stderr so the caller can record ERROR.
+
+    The returned stderr is bounded — see ``_collect_stderr``.
     """
     import threading
 
-    stderr_buf: list[str] = []
+    stderr_out: list[str] = []
 
     def _drain_stderr():
         assert process.stderr is not None
-        for line in iter(process.stderr.readline, ""):
-            if not line:
-                break
-            stderr_buf.append(line.rstrip("\n"))
+        stderr_out.append(_collect_stderr(process.stderr))
 
     t = threading.Thread(target=_drain_stderr, daemon=True)
     t.start()
@@ -2492,7 +2614,7 @@ def _stream_encode_progress(process, state: PipelineState, filepath: str, durati
             pass
         timed_out = True
     t.join(timeout=5)
-    stderr = "\n".join(stderr_buf)
+    stderr = stderr_out[0] if stderr_out else ""
     if timed_out:
         stderr = (stderr + "\nENCODE TIMEOUT: killed after wall-clock deadline").strip()
     return stderr
@@ -2551,9 +2673,9 @@ def _find_external_subs(filepath: str) -> list[str]:
 
 
 def _cleanup(*paths: str | None) -> None:
-    """Remove local staging files, ignoring errors."""
+    """Remove local staging files, ignoring errors (including already-gone)."""
     for p in paths:
-        if p and os.path.exists(p):
+        if p:
             try:
                 os.remove(p)
             except OSError:
@@ -291,8 +291,7 @@ def gap_fill(
     # built from media_report which can lag reality — a file we already re-encoded can end up
     # back in the queue with stale track info, and we don't want to overwrite its DONE state
     # with an ERROR just because the analysis was based on outdated metadata.
-    existing = state.get_file(filepath)
-    if existing and (existing.get("status") or "").lower() == FileStatus.DONE.value:
+    if (state.get_status(filepath) or "").lower() == FileStatus.DONE.value:
         logging.info(f"  Skipping {filename}: already DONE in state (media_report analysis likely stale).")
         return True
 
@@ -534,8 +533,7 @@ def gap_fill(
         else:
             state.set_file(filepath, FileStatus.DONE, mode="gap_filler")
             logging.info(f"  DONE: Gap filled: {filename}")
-        state.stats["gap_filled"] = state.stats.get("gap_filled", 0) + 1
-        state.save()
+        state.add_stats(gap_filled=1)
         return True
 
     except Exception as e:
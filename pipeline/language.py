@@ -554,7 +554,7 @@ def extract_bitmap_subtitle_text(
                 pattern,
             ]
             try:
-                subprocess.run(cmd, capture_output=True, timeout=120)
+                subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, timeout=120)
             except (subprocess.TimeoutExpired, FileNotFoundError):
                 continue
 
@@ -1795,16 +1795,30 @@ def process_file(
 # ---------------------------------------------------------------------------
 
 
+def _copy_with_own_streams(file_entry: dict) -> dict:
+    """Copy of ``file_entry`` whose audio/subtitle stream dicts are its own.
+
+    Detection only ever sets or pops top-level keys on those stream dicts, so
+    they are all that needs copying. This used to be ``copy.deepcopy`` of the
+    whole report entry (tmdb block, video block, every stream's tags) on every
+    file the fetch worker, qualify and full_gamut pass through.
+    """
+    entry = dict(file_entry)
+    for kind in ("audio_streams", "subtitle_streams"):
+        streams = file_entry.get(kind)
+        if streams:
+            entry[kind] = [dict(s) for s in streams]
+    return entry
+
+
 def detect_all_languages(file_entry: dict, use_whisper: bool = False) -> dict:
     """Detect languages for all undetermined tracks in a file entry.
 
-    Returns a deep copy of ``file_entry`` with ``detected_language`` /
+    Returns a copy of ``file_entry`` with ``detected_language`` /
     ``detection_confidence`` / ``detection_method`` fields populated on
     audio_streams and subtitle_streams. Does NOT modify the input.
     """
-    import copy
-
-    entry = copy.deepcopy(file_entry)
+    entry = _copy_with_own_streams(file_entry)
     filepath = entry["filepath"]
 
     detected_text_langs: dict[int, str] = {}
@@ -1944,9 +1958,7 @@ def clear_legacy_heuristic_detections(file_entry: dict) -> tuple[dict, int]:
     so we don't trust stale labels. Title-hint detections (``title_hint``)
     are kept — those are still considered valid.
     """
-    import copy
-
-    entry = copy.deepcopy(file_entry)
+    entry = _copy_with_own_streams(file_entry)
     cleared = 0
     for track_kind in ("audio_streams", "subtitle_streams"):
         for stream in entry.get(track_kind, []) or []:
@@ -10,13 +10,19 @@ import os
 import signal
 import threading
 import time
-from typing import Optional
+from typing import Callable, Optional
 
 from pipeline.circuit_breaker import CircuitBreaker, CircuitBreakerOpen
 from pipeline.ffmpeg import format_bytes
 from pipeline.full_gamut import finalize_upload, full_gamut
-from pipeline.state import ACTIVE_STATUSES, FileStatus, PipelineState, is_terminal
-from pipeline.transfer import SOURCE_MISSING, fetch_file
+from pipeline.state import ACTIVE_STATUSES, SETTLED_STATUSES, FileStatus, PipelineState, is_terminal
+from pipeline.transfer import (
+    FETCH_CLAIMABLE,
+    SOURCE_MISSING,
+    fetch_file,
+    invalidate_staging_usage,
+    staging_usage_snapshot,
+)
 
 # Filename suffixes written by the pipeline's tmp-mux / staging steps.
 # Shared with tools.scanner so both sides agree on what to exclude from
@@ -50,6 +56,35 @@ def _ghost_candidate_paths(state: PipelineState) -> list[str]:
     return paths
 
 
+def _staged_checker(fetch_dir: str) -> Callable[[Optional[str]], bool]:
+    """Predicate "is this local_path on disk?" bound to one listing of ``fetch_dir``.
+
+    The pickers test every fetched row's local_path on each tick, and those
+    all live in staging/fetch — one scandir (taken lazily, on first use)
+    answers them instead of a stat per row. Paths anywhere else fall back to
+    ``os.path.exists``.
+    """
+    fetch_norm = os.path.normcase(os.path.abspath(fetch_dir))
+    listing: Optional[set[str]] = None
+
+    def present(local: Optional[str]) -> bool:
+        nonlocal listing
+        if not local:
+            return False
+        norm = os.path.normcase(os.path.abspath(local))
+        if os.path.dirname(norm) != fetch_norm:
+            return os.path.exists(local)
+        if listing is None:
+            try:
+                with os.scandir(fetch_dir) as entries:
+                    listing = {os.path.normcase(os.path.abspath(e.path)) for e in entries}
+            except OSError:
+                listing = set()
+        return norm in listing
+
+    return present
+
+
 class Orchestrator:
     """3-thread pipeline coordinator: GPU encode + network I/O + gap filler."""
 
@@ -78,6 +113,18 @@ class Orchestrator:
         # which files to prioritise — any worker waiting is enough to bump priority.
         self._gpu_wants_set: set[str] = set()
         self._gpu_wants_lock = threading.Lock()
+        # Wakes the fetch worker out of its idle wait: set when a GPU worker
+        # posts a new want (it is about to block on that file, and the slot it
+        # just took frees prefetch capacity) and on shutdown.
+        self._fetch_wake = threading.Event()
+        # Same idea one stage on: a landed fetch wakes prep and the GPU
+        # picker, a finished prep wakes the GPU picker, a GPU pick drains the
+        # prepped buffer (wakes prep), an encode handed to upload wakes the
+        # upload worker, and a finished upload frees staging (wakes fetch).
+        # Each idle wait still times out, so a missed set costs one interval.
+        self._gpu_wake = threading.Event()
+        self._prep_wake = threading.Event()
+        self._upload_wake = threading.Event()
         # Shared dispatched set across all GPU workers — prevents two workers picking the same file.
         self._dispatched: set[str] = set()
         self._dispatched_lock = threading.Lock()
@@ -113,6 +160,8 @@ class Orchestrator:
                 self._gpu_wants_set.discard(previous)
             if filepath:
                 self._gpu_wants_set.add(filepath)
+        if filepath:
+            self._fetch_wake.set()
 
     def _get_gpu_wants(self) -> set[str]:
         with self._gpu_wants_lock:
@@ -121,6 +170,17 @@ class Orchestrator:
     def _handle_signal(self, signum, frame):
         logging.info(f"Received signal {signum}, shutting down...")
         self._shutdown.set()
+        self._wake_all()
+
+    def _wake_all(self) -> None:
+        for wake in (self._fetch_wake, self._gpu_wake, self._prep_wake, self._upload_wake):
+            wake.set()
+
+    def _idle(self, wake: threading.Event, timeout: float) -> None:
+        """Idle a worker for up to ``timeout`` seconds, or until ``wake`` is set."""
+        if not self._shutdown.is_set():
+            wake.wait(timeout=timeout)
+        wake.clear()
 
     def _write_heavy_worker_status(
         self,
@@ -470,11 +530,20 @@ class Orchestrator:
         import time as _time
 
         live_paths: set[str] = set()
+        # Rows in these statuses don't have in-flight files in encoded/fetch.
+        # Deliberately NOT state.SETTLED_STATUSES: this older list leaves out
+        # FLAGGED_FOREIGN_AUDIO/MANUAL/CORRUPT/UNDERSIZED, so any path such a
+        # row still names counts as live — a miss here deletes work (see the
+        # incident above), an extra live path only keeps a file. ("skipped"
+        # is a legacy status string with no FileStatus member.) Filtered in
+        # SQL first so the library's DONE rows aren't loaded and
+        # extras-decoded just to be skipped; the check below still catches
+        # any row whose status isn't stored lowercase.
+        sweep_skip = ("done", "skipped", "error", "flagged_undetermined")
         try:
-            for _fp, row in self.state.get_all_files().items():
+            for _fp, row in self.state.get_files_excluding(sweep_skip).items():
                 status = (row.get("status") or "").lower()
-                # Terminal statuses don't have in-flight files in encoded/fetch
-                if status in ("done", "skipped", "error", "flagged_undetermined"):
+                if status in sweep_skip:
                     continue
                 # _row_to_dict already merged extras into row, so prep_data /
                 # local_path / output_path / actual_input live at the top level.
@@ -561,7 +630,7 @@ class Orchestrator:
                 name=name,
             )
         # Single fetch worker. SMB upload is already saturated by one transfer; a second
-        # thread only adds contention. fetch_file claims its target under state._lock, so
+        # thread only adds contention. fetch_file claims its target with state.try_transition, so
         # even with N>1 two workers would never pick the same path — we just don't need N>1.
         fetch_concurrency = max(1, int(self.config.get("fetch_concurrency", 1)))
         for i in range(fetch_concurrency):
@@ -638,6 +707,7 @@ class Orchestrator:
 
         logging.info("Orchestrator shutting down...")
         self._shutdown.set()
+        self._wake_all()
         for t in threads.values():
             t.join(timeout=30)
         self.state.save()
@@ -687,15 +757,15 @@ class Orchestrator:
                         break
                 else:
                     drained_at = None
-                self._shutdown.wait(timeout=5)
+                self._idle(self._gpu_wake, 5)
                 continue
 
             drained_at = None
             filepath = item["filepath"]
             processed += 1
+            self._prep_wake.set()
 
-            while self.control.is_encode_paused() and not self._shutdown.is_set():
-                self._shutdown.wait(timeout=5)
+            self.control.wait_for_encode_resume(self._shutdown)
 
             # Tell the network worker what we need fetched (per-worker tracking via shared set).
             self._set_gpu_wants(filepath)
@@ -745,6 +815,7 @@ class Orchestrator:
                         "  …and the ERROR write also failed (poisoned row?) — left as-is so the worker survives"
                     )
 
+            upload_inline = int(self.config.get("upload_concurrency", 1)) <= 0
             if encode_ok:
                 # Upload + verify + replace + tags + Plex scan run on the
                 # dedicated upload worker. The GPU thread leaves the row at
@@ -755,7 +826,8 @@ class Orchestrator:
                 #
                 # Fallback: if upload_concurrency is 0 (e.g. unit tests, or
                 # a deliberate config), run inline as before.
-                upload_inline = int(self.config.get("upload_concurrency", 1)) <= 0
+                if not upload_inline:
+                    self._upload_wake.set()
                 if upload_inline:
                     try:
                         finalize_upload(filepath, self.state, self.config)
@@ -766,16 +838,14 @@ class Orchestrator:
                         # as an error (only on the upload_concurrency<=0 path).
                         # The increment belongs only on a real upload failure.
                         logging.error(f"Upload failed for {os.path.basename(filepath)}: {e}")
-                        self.state.stats["errors"] = self.state.stats.get("errors", 0) + 1
-                        self.state.save()
+                        self.state.add_stats(errors=1)
             else:
                 # Guarded: state.stats does an unguarded json.loads of the
                 # pipeline_stats blob and state.save() raises ValueError by
                 # design on a bad shape — neither should be able to kill the
                 # only encoder over a counter.
                 try:
-                    self.state.stats["errors"] = self.state.stats.get("errors", 0) + 1
-                    self.state.save()
+                    self.state.add_stats(errors=1)
                 except Exception:  # noqa: BLE001
                     logging.exception("GPU worker: error-counter bookkeeping failed — continuing")
 
@@ -794,6 +864,14 @@ class Orchestrator:
             with self._dispatched_lock:
                 self._dispatched.discard(filepath)
 
+            # A file that leaves the GPU without going on to the upload worker
+            # (failed encode, or an upload already run inline) has given back
+            # its prefetch slot. Refill it now rather than at the end of the
+            # fetch worker's 5-10s poll; the upload worker does the same when
+            # it releases a file.
+            if not encode_ok or upload_inline:
+                self._staging_freed()
+
             self._set_gpu_wants(None, previous=filepath)
 
         self._set_gpu_wants(None)
@@ -808,6 +886,14 @@ class Orchestrator:
     # Fetch Worker — pre-fetch files to keep the GPU encoders fed
     # =========================================================================
 
+    def _fetch_idle(self, timeout: float) -> None:
+        """Idle the fetch worker for up to ``timeout`` seconds.
+
+        Returns early when a GPU worker posts a want or on shutdown, so a
+        blocked encoder doesn't sit out the rest of a 5-10s poll interval.
+        """
+        self._idle(self._fetch_wake, timeout)
+
     def _fetch_worker(self, queue: list[dict], worker_id: int = 0):
         """Pull files from NAS → staging, in priority order.
 
@@ -828,11 +914,11 @@ class Orchestrator:
             did_work = False
 
             if self.control.is_fetch_paused():
-                self._shutdown.wait(timeout=5)
+                self._fetch_idle(5)
                 continue
 
             if self._get_fetch_buffer_used() >= max_buffer:
-                self._shutdown.wait(timeout=5)
+                self._fetch_idle(5)
                 continue
 
             prefetched_count = self._count_prefetched()
@@ -840,11 +926,13 @@ class Orchestrator:
 
             # === Priority 1: Fetch what the GPU workers are blocked on ===
             for gpu_wants in self._get_gpu_wants():
-                existing = self.state.get_file(gpu_wants)
-                status = existing["status"] if existing else None
-                if status not in (None, FileStatus.PENDING.value):
+                status = self.state.get_status(gpu_wants)
+                if status not in FETCH_CLAIMABLE:
                     continue  # already fetched or in some other state
-                entry = self._lookup_file(gpu_wants)
+                # The queue already holds this file's entry (the GPU worker
+                # picked it from there); the report is only a fallback, since
+                # reading it means parsing the whole media_report under its lock.
+                entry = self._queued_item(queue, gpu_wants) or self._lookup_file(gpu_wants)
                 if not entry:
                     entry = {
                         "filepath": gpu_wants,
@@ -859,13 +947,15 @@ class Orchestrator:
                     break
                 if result is not None:
                     self._post_fetch(entry)
+                    self._prep_wake.set()
+                    self._gpu_wake.set()
                     did_work = True
                     break
             if did_work:
                 continue
 
             if prefetch_full:
-                self._shutdown.wait(timeout=10)
+                self._fetch_idle(10)
                 continue
 
             # === Priority 2: Pre-fetch next queue items ===
@@ -875,15 +965,20 @@ class Orchestrator:
             # live queue, otherwise holding the lock would serialise fetches.
             with self._dispatched_lock:
                 queue_snapshot = list(queue)
+            # Only FETCH_CLAIMABLE rows (absent from state, or PENDING) are
+            # fetchable. One status snapshot per lap instead of a get_file
+            # (row read + extras decode) per queued item — a lap that finds
+            # nothing to fetch walks the whole queue. A row that moves on
+            # mid-lap is caught by fetch_file's claim on the same set.
+            statuses = self.state.all_statuses()
+            is_skipped = self.control.skip_checker()
             for item in queue_snapshot:
                 if self._shutdown.is_set():
                     break
                 fp = item["filepath"]
-                existing = self.state.get_file(fp)
-                status = existing["status"] if existing else None
-                if status and status != FileStatus.PENDING.value:
+                if statuses.get(fp) not in FETCH_CLAIMABLE:
                     continue
-                if self.control.should_skip(fp):
+                if is_skipped(fp):
                     continue
                 result = fetch_file(item, self.staging_dir, self.config, self.state)
                 if result is SOURCE_MISSING:
@@ -892,11 +987,13 @@ class Orchestrator:
                     break
                 if result is not None:
                     self._post_fetch(item)
+                    self._prep_wake.set()
+                    self._gpu_wake.set()
                     did_work = True
                     break
 
             if not did_work:
-                self._shutdown.wait(timeout=5)
+                self._fetch_idle(5)
 
         logging.info(f"{tag} finished")
 
@@ -989,11 +1086,11 @@ class Orchestrator:
                 # needs the local file to exist, pass 2 skips ACTIVE, prep needs
                 # local, fetch skips non-PENDING): stranded until restart, with
                 # the flagged verdict silently discarded. (2026-07-25)
-                current = self.state.get_file(filepath)
-                if current and is_terminal(current.get("status") or ""):
+                current = self.state.get_status(filepath)
+                if current and is_terminal(current):
                     logging.debug(
                         f"  post-fetch: {os.path.basename(filepath)} went terminal "
-                        f"({current.get('status')}) while we worked — not resurrecting"
+                        f"({current}) while we worked — not resurrecting"
                     )
                 else:
                     self.state.set_file(filepath, FileStatus.PROCESSING, **payload)
@@ -1028,9 +1125,9 @@ class Orchestrator:
             return cached[1]
 
         try:
-            with open(MEDIA_REPORT, encoding="utf-8") as f:
-                report = _json.load(f)
-        except (OSError, _json.JSONDecodeError):
+            with open(MEDIA_REPORT, "rb") as f:
+                report = _json.loads(f.read())
+        except (OSError, ValueError):
             return {}
 
         lookup = {entry["filepath"]: entry for entry in (report.get("files") or []) if entry.get("filepath")}
@@ -1111,12 +1208,11 @@ class Orchestrator:
         skipped_now_compliant = 0
         for item in queue_snapshot:
             filepath = item["filepath"]
-            existing = self.state.get_file(filepath)
-            status = existing["status"] if existing else None
+            status = self.state.get_status(filepath)
             # Skip terminal statuses (DONE + FLAGGED_*) and ERROR. ERROR is
             # transient — retried on the next queue build — but currently we
             # skip it here too because the queue builder will reset it.
-            if status == FileStatus.ERROR.value or (status and is_terminal(status)):
+            if status in SETTLED_STATUSES:
                 continue
 
             # Refresh from media_report. If the file is gone from the
@@ -1207,11 +1303,9 @@ class Orchestrator:
                     logging.error(f"[{name}] gap_fill raised on {item['filename']}: {e}")
                     success = False
 
-                entry = self.state.get_file(filepath)
-                if entry and (entry.get("status") or "").lower() == "error":
+                if (self.state.get_status(filepath) or "").lower() == "error":
                     success = False
-                    self.state.stats["errors"] = self.state.stats.get("errors", 0) + 1
-                    self.state.save()
+                    self.state.add_stats(errors=1)
 
                 breaker.record(success)
                 if not was_open_before and breaker.is_open():
@@ -1442,10 +1536,15 @@ class Orchestrator:
         # handoff in the same window was under 6 seconds.
         # An unprepped-but-fetched file is still returned when nothing prepped is
         # waiting, so a stalled prep worker can never starve the encoder.
+        # One indexed query for the PROCESSING set, instead of a get_file
+        # (row fetch + extras JSON decode) for every queued file on every pick.
+        # Only the handful of fetched files go on to the full row read.
+        processing = set(self.state.get_files_by_status(FileStatus.PROCESSING))
+        is_staged = _staged_checker(os.path.join(self.staging_dir, "fetch"))
         unprepped: dict | None = None
         for item in queue:
             fp = item["filepath"]
-            if fp in self._dispatched:
+            if fp not in processing or fp in self._dispatched:
                 continue
             with self._prepping_lock:
                 if fp in self._prepping:
@@ -1453,8 +1552,7 @@ class Orchestrator:
             existing = self.state.get_file(fp)
             status = existing["status"] if existing else None
             if status == FileStatus.PROCESSING.value:
-                local = existing.get("local_path")
-                if local and os.path.exists(local):
+                if is_staged(existing.get("local_path")):
                     if existing.get("prep_done"):
                         return item
                     if unprepped is None:
@@ -1473,17 +1571,19 @@ class Orchestrator:
         # encode finished, status flipped to UPLOADING, _dispatched
         # discard fired, next iteration's pick saw UPLOADING and grabbed
         # the same file again, ffmpeg ENOENT on the cleaned fetch buffer.
+        # Once the head of the queue has been worked, this pass walks past
+        # every settled row before finding a pending one — read all statuses
+        # in one query rather than a get_status per row walked.
+        is_skipped = self.control.skip_checker()
+        statuses = self.state.all_statuses()
         for item in queue:
             fp = item["filepath"]
             if fp in self._dispatched:
                 continue
-            if self.control.should_skip(fp):
+            if is_skipped(fp):
                 continue
-            existing = self.state.get_file(fp)
-            status = existing["status"] if existing else None
-            if status and (
-                status in (s.value for s in ACTIVE_STATUSES) or status == FileStatus.ERROR.value or is_terminal(status)
-            ):
+            status = statuses.get(fp)
+            if status in ACTIVE_STATUSES or status in SETTLED_STATUSES:
                 continue
             return item
         return None
@@ -1515,7 +1615,7 @@ class Orchestrator:
         while not self._shutdown.is_set():
             picked = self._pick_for_upload()
             if picked is None:
-                self._shutdown.wait(timeout=5)
+                self._idle(self._upload_wake, 5)
                 continue
 
             try:
@@ -1529,10 +1629,10 @@ class Orchestrator:
                 import traceback as _tb
 
                 logging.error(f"{tag}: finalize_upload failed for {os.path.basename(picked)}: {e}\n{_tb.format_exc()}")
-                self.state.stats["errors"] = self.state.stats.get("errors", 0) + 1
-                self.state.save()
+                self.state.add_stats(errors=1)
             finally:
                 self._release_upload(picked)
+                self._staging_freed()
 
         logging.info(f"{tag} finished")
 
@@ -1590,25 +1690,28 @@ class Orchestrator:
             # If at cap, sleep a bit; the GPU worker will drain.
             prepped_count = self._count_prepped_waiting()
             if prepped_count >= prep_buffer_max:
-                self._shutdown.wait(timeout=10)
+                self._idle(self._prep_wake, 10)
                 continue
 
             picked = self._pick_for_prep(queue)
             if picked is None:
-                # Nothing to prep right now — wait briefly for fetch worker
-                # to land more files, then re-scan.
-                self._shutdown.wait(timeout=5)
+                # Nothing to prep right now — wait for the fetch worker to
+                # land more files, then re-scan.
+                self._idle(self._prep_wake, 5)
                 continue
 
             filepath = picked["filepath"]
             try:
-                prep_data = prepare_for_encode(filepath, picked, self.config, self.state, self.staging_dir)
+                prep_data = prepare_for_encode(
+                    filepath, picked, self.config, self.state, self.staging_dir, shutdown=self._shutdown
+                )
                 if prep_data is None:
                     logging.info(
                         f"{tag}: prep parked {os.path.basename(filepath)} (flagged / nothing-to-do / fetch failed)"
                     )
                 else:
                     logging.info(f"{tag}: prep done for {os.path.basename(filepath)}")
+                    self._gpu_wake.set()
                 # Success — reset the circuit-breaker counter.
                 self._prep_fail_counts.pop(filepath, None)
             except Exception as e:
@@ -1675,6 +1778,7 @@ class Orchestrator:
         """
         with self._dispatched_lock:
             queue_snapshot = list(queue)
+        is_staged = _staged_checker(os.path.join(self.staging_dir, "fetch"))
 
         for item in queue_snapshot:
             fp = item["filepath"]
@@ -1696,8 +1800,7 @@ class Orchestrator:
                 continue
             if existing.get("prep_done"):
                 continue
-            local = existing.get("local_path")
-            if not (local and os.path.exists(local)):
+            if not is_staged(existing.get("local_path")):
                 continue
             with self._prepping_lock:
                 if fp in self._prepping:
@@ -1841,8 +1944,7 @@ class Orchestrator:
             if not priority_paths:
                 logging.info("Priority re-sort: priority list is empty — no bump")
                 return
-            _sort_full_gamut(full_gamut_queue, self.config, priority_paths)
-            in_queue = sum(1 for it in full_gamut_queue if it.get("filepath") in priority_paths)
+            in_queue = _sort_full_gamut(full_gamut_queue, self.config, priority_paths)
             logging.info(
                 f"Priority re-sort applied: {in_queue} of {len(full_gamut_queue)} "
                 f"queued items lifted to the front (priority list has "
@@ -1868,10 +1970,9 @@ class Orchestrator:
         import json as _json
 
         from pipeline.__main__ import categorise_entry
-        from pipeline.gap_filler import analyse_gaps
 
-        with open(report_path, encoding="utf-8") as f:
-            report = _json.load(f)
+        with open(report_path, "rb") as f:
+            report = _json.loads(f.read())
 
         # Snapshot the current queue paths to avoid duplicate appends.
         # Acquire the lock long enough to copy the path sets — workers
@@ -1924,6 +2025,7 @@ class Orchestrator:
                 _prune_done_from_priority,
                 _read_priority_paths,
                 _sort_full_gamut,
+                _sort_gap_filler,
             )
 
             # Drop terminal-status entries from priority.json before reading
@@ -1934,47 +2036,45 @@ class Orchestrator:
                 logging.info(f"Priority prune: dropped {pruned} done/flagged entries from priority.json")
             priority_paths = _read_priority_paths()
             _sort_full_gamut(full_gamut_queue, self.config, priority_paths)
-
-            def _gap_sort_key(e: dict) -> tuple[int, int]:
-                gaps = analyse_gaps(e, self.config)
-                return (1 if gaps.needs_fetch else 0, e.get("file_size_bytes", 0))
-
-            gap_filler_queue.sort(key=_gap_sort_key)
+            _sort_gap_filler(gap_filler_queue)
 
         return (len(new_full), len(new_gap))
 
     def _all_done(self, queue: list[dict]) -> bool:
         # Snapshot both the dispatched set AND the queue under the lock so
-        # the refresh worker's appends don't race with this iteration. Per-
-        # item state lookups can happen outside the lock (state.get_file
-        # has its own internal lock).
+        # the refresh worker's appends don't race with this iteration. The
+        # status read happens outside the lock (state has its own), as one
+        # query for the whole queue — this runs on every idle GPU tick.
         with self._dispatched_lock:
             dispatched = set(self._dispatched)
             queue_snapshot = list(queue)
+        statuses = self.state.all_statuses()
         for item in queue_snapshot:
             fp = item["filepath"]
-            existing = self.state.get_file(fp)
-            status = existing["status"] if existing else None
+            status = statuses.get(fp)
             # ERROR counts as "settled" because retry happens on the next
             # queue build, not within this one. FLAGGED_* and DONE count as
-            # settled (the is_terminal check covers both).
-            settled = status and (status == FileStatus.ERROR.value or is_terminal(status))
+            # settled (SETTLED_STATUSES is terminal + ERROR).
+            settled = status in SETTLED_STATUSES
             if not settled:
                 if fp not in dispatched or status is None:
                     return False
         return True
 
+    def _staging_freed(self) -> None:
+        """A file has left staging: drop the usage memo and wake the fetch worker.
+
+        Without the invalidation the woken worker would read the up-to-5s-old
+        snapshot, which still counts the deleted file, see a full buffer and go
+        back to sleep — the wake-up would buy nothing.
+        """
+        invalidate_staging_usage(self.staging_dir)
+        self._fetch_wake.set()
+
     def _get_fetch_buffer_used(self) -> int:
-        fetch_dir = os.path.join(self.staging_dir, "fetch")
-        if not os.path.exists(fetch_dir):
-            return 0
-        total = 0
-        for f in os.listdir(fetch_dir):
-            try:
-                total += os.path.getsize(os.path.join(fetch_dir, f))
-            except OSError:
-                pass
-        return total
+        # Same memoised walk fetch_file checks against — no second listdir +
+        # getsize pass over fetch/ on every fetch-worker tick.
+        return staging_usage_snapshot(self.staging_dir)[1]
 
     def _count_prefetched(self) -> int:
         """Number of files in state that are fetched-but-not-yet-done.
@@ -1995,6 +2095,14 @@ class Orchestrator:
         ]
         return self.state.count_active_with_local(active_statuses)
 
+    def _queued_item(self, queue: list[dict], filepath: str) -> dict | None:
+        """Return the live queue's item for ``filepath``, or None."""
+        with self._dispatched_lock:
+            for item in queue:
+                if item.get("filepath") == filepath:
+                    return item
+        return None
+
     def _lookup_file(self, filepath: str) -> dict | None:
         """Look up a file in the media report."""
         try:
@@ -13,7 +13,7 @@ import threading
 import time
 from datetime import datetime
 from enum import Enum
-from typing import Optional
+from typing import Iterable, Optional
 
 
 class FileStatus(str, Enum):
@@ -95,6 +95,11 @@ ACTIVE_STATUSES: frozenset[FileStatus] = frozenset(
     }
 )
 
+# Terminal plus ERROR: nothing more happens to these before the next queue
+# build, which is where ERROR rows get their retry. The orchestrator's
+# "settled" checks and the dashboard forecast's remaining count use this.
+SETTLED_STATUSES: frozenset[FileStatus] = TERMINAL_STATUSES | {FileStatus.ERROR}
+
 # All FLAGGED_* — the UI's Flagged pane queries on this group.
 FLAGGED_STATUSES: frozenset[FileStatus] = frozenset(
     {
@@ -190,11 +195,9 @@ def _remove_from_priority_locked(prio_path: str, filepath: str) -> bool:
 
 def is_terminal(status: str | FileStatus) -> bool:
     """True if ``status`` means 'no more pipeline work needed'."""
-    if isinstance(status, str):
-        try:
-            status = FileStatus(status)
-        except ValueError:
-            return False
+    # FileStatus is a str enum, so a raw DB string hashes and compares equal
+    # to its member — no FileStatus(status) round-trip per queue-build row.
+    # Unknown strings simply aren't members.
     return status in TERMINAL_STATUSES
 
 
@@ -301,6 +304,10 @@ class PipelineState:
         _init_tables(self._conn)
         self._stats_cache = None
         self._stats_dirty = False
+        # The pipeline_stats JSON exactly as last read from / written to the
+        # DB. save() compares against it and skips the write when nothing
+        # changed — see save().
+        self._stats_persisted_json: Optional[str] = None
 
         count = self._conn.execute("SELECT COUNT(*) FROM pipeline_files").fetchone()[0]
         if count > 0:
@@ -322,10 +329,20 @@ class PipelineState:
         ``Expecting ':' delimiter`` ). Validating the just-serialised
         bytes parses before committing means corrupt output never
         reaches the DB.
+
+        Unchanged stats are not rewritten. Every dashboard request opens a
+        PipelineState, reads ``.data`` (which loads stats) and ``close()``s
+        it — previously one write transaction per poll, and one that wrote
+        the request's possibly-stale snapshot over whatever the running
+        pipeline had committed in between. Comparing the serialised text to
+        what was read/written last makes read-only users write nothing.
         """
         with self._lock:
             if self._stats_cache is not None:
                 stats_json = json.dumps(self._stats_cache)
+                if stats_json == self._stats_persisted_json:
+                    self._stats_dirty = False
+                    return
                 try:
                     json.loads(stats_json)
                 except json.JSONDecodeError as je:
@@ -336,6 +353,7 @@ class PipelineState:
                     ) from je
                 self._conn.execute("UPDATE pipeline_stats SET data = ? WHERE id = 1", (stats_json,))
                 self._conn.commit()
+                self._stats_persisted_json = stats_json
                 self._stats_dirty = False
 
     def get_file(self, filepath: str) -> Optional[dict]:
@@ -346,6 +364,16 @@ class PipelineState:
                 return None
             return self._row_to_dict(row)
 
+    def get_status(self, filepath: str) -> Optional[str]:
+        """Status value of one file, or None if not tracked.
+
+        For callers that only branch on status: reads the one column and
+        skips the ``SELECT *`` plus extras JSON decode that ``get_file`` does.
+        """
+        with self._lock:
+            row = self._conn.execute("SELECT status FROM pipeline_files WHERE filepath = ?", (filepath,)).fetchone()
+        return row[0] if row else None
+
     def set_file(self, filepath: str, status: FileStatus, **kwargs):
         """Create or update a file entry. Writes to DB immediately.
 
@@ -584,6 +612,21 @@ class PipelineState:
             except Exception:
                 pass
 
+    def try_transition(
+        self, filepath: str, allowed_from: frozenset[Optional[str]], status: FileStatus, **kwargs
+    ) -> bool:
+        """Compare-and-set: ``set_file(filepath, status, **kwargs)`` only if the
+        row's current status is in ``allowed_from`` (``None`` = untracked).
+
+        The read and the write share one hold of the lock, so two threads
+        claiming the same row can't both win. Returns whether it was set.
+        """
+        with self._lock:
+            if self.get_status(filepath) not in allowed_from:
+                return False
+            self.set_file(filepath, status, **kwargs)
+            return True
+
     def get_files_by_status(self, status: FileStatus) -> list[str]:
         """Return list of filepaths matching a status."""
         with self._lock:
@@ -601,12 +644,23 @@ class PipelineState:
             rows = self._conn.execute("SELECT filepath FROM pipeline_files").fetchall()
             return [row[0] for row in rows]
 
+    def all_statuses(self) -> dict[str, str]:
+        """``{filepath: status}`` for every tracked row, from one query.
+
+        For scans that check the status of every queued file: one round-trip
+        instead of a ``get_status`` (lock + query) per queue item.
+        """
+        with self._lock:
+            rows = self._conn.execute("SELECT filepath, status FROM pipeline_files").fetchall()
+        return dict(rows)
+
     @property
     def stats(self) -> dict:
         """Get stats dict. Cached in memory, flushed to DB on save()."""
         if self._stats_cache is None:
             with self._lock:
                 row = self._conn.execute("SELECT data FROM pipeline_stats WHERE id = 1").fetchone()
+                self._stats_persisted_json = row[0] if row else None
                 self._stats_cache = (
                     json.loads(row[0])
                     if row
@@ -626,6 +680,20 @@ class PipelineState:
         self._stats_cache = value
         self._stats_dirty = True
 
+    def add_stats(self, **deltas: float) -> None:
+        """Add each delta to its stats counter and save, under one lock hold.
+
+        ``state.stats[k] = state.stats.get(k, 0) + n`` from two threads (the
+        upload worker's completion bump and the GPU worker's error bump) can
+        interleave and lose an update; a batch of them also re-enters the
+        property once per read and once per write.
+        """
+        with self._lock:
+            stats = self.stats
+            for key, delta in deltas.items():
+                stats[key] = stats.get(key, 0) + delta
+            self.save()
+
     def count_active_with_local(self, statuses: list[str]) -> int:
         """Count rows in given statuses that have a non-empty local_path.
 
@@ -737,9 +805,7 @@ class PipelineState:
             if count > 0:
                 self._conn.execute("DELETE FROM pipeline_files WHERE status IN ('replaced', 'skipped')")
                 self._conn.commit()
-                self.stats["archived_count"] = self.stats.get("archived_count", 0) + count
-                self._stats_dirty = True
-                self.save()
+                self.add_stats(archived_count=count)
                 remaining = self._conn.execute("SELECT COUNT(*) FROM pipeline_files").fetchone()[0]
                 logging.info(f"Compacted state: removed {count} terminal entries ({remaining} remaining)")
         return count
@@ -750,6 +816,21 @@ class PipelineState:
             rows = self._conn.execute("SELECT * FROM pipeline_files").fetchall()
             return {row["filepath"]: self._row_to_dict(row) for row in rows}
 
+    def get_files_excluding(self, statuses: Iterable[str]) -> dict[str, dict]:
+        """Like :meth:`get_all_files`, minus rows in any of ``statuses``.
+
+        The filter runs in SQL, so excluded rows — on a settled library, the
+        vast majority — are never materialised or have their extras decoded.
+        """
+        statuses = list(statuses)
+        placeholders = ",".join("?" * len(statuses))
+        query = "SELECT * FROM pipeline_files"
+        if statuses:
+            query += f" WHERE status NOT IN ({placeholders})"
+        with self._lock:
+            rows = self._conn.execute(query, statuses).fetchall()
+            return {row["filepath"]: self._row_to_dict(row) for row in rows}
+
     def _row_to_dict(self, row: sqlite3.Row) -> dict:
         """Convert a SQLite row to the dict format callers expect.
 
@@ -34,10 +34,12 @@ from __future__ import annotations
 
 import json
 import logging
+import re
 import time
 from pathlib import Path
 
 from paths import STAGING_DIR
+from pipeline.exclusion_match import cached_matcher
 
 # Default location used by both the orchestrator (which seeds the file via
 # PipelineControl) and the dashboard (which reads it for compliance checks).
@@ -50,6 +52,11 @@ _cache: dict = {
     "mtime": 0.0,
     "patterns_lower": (),  # tuple of lowercased patterns
     "expires_at": 0.0,  # also expire after a TTL even if mtime unchanged
+    # Compiled alternation of the escaped patterns, plus the tuple it was built
+    # from. One regex search per filepath instead of a Python loop of ``in``
+    # checks; rebuilt only when _load_patterns hands back a new tuple.
+    "matcher": None,
+    "matcher_for": None,
 }
 
 _TTL_SECONDS = 5.0
@@ -90,6 +97,11 @@ def _load_patterns(path: Path | None = None) -> tuple[str, ...]:
     return patterns_lower
 
 
+def _load_matcher(path: Path | None = None) -> re.Pattern | None:
+    """Compiled matcher for the current patterns (see :func:`cached_matcher`)."""
+    return cached_matcher(_cache, _load_patterns(path))
+
+
 def is_subs_optional(filepath: str, path: Path | None = None) -> bool:
     """Return True if ``filepath`` matches any pattern in subs_optional.json.
 
@@ -98,11 +110,10 @@ def is_subs_optional(filepath: str, path: Path | None = None) -> bool:
     """
     if not filepath:
         return False
-    fp_lower = filepath.lower()
-    for pat in _load_patterns(path):
-        if pat in fp_lower:
-            return True
-    return False
+    matcher = _load_matcher(path)
+    if matcher is None:
+        return False
+    return matcher.search(filepath.lower()) is not None
 
 
 def reset_cache_for_tests() -> None:
@@ -110,3 +121,5 @@ def reset_cache_for_tests() -> None:
     _cache["mtime"] = 0.0
     _cache["patterns_lower"] = ()
     _cache["expires_at"] = 0.0
+    _cache["matcher"] = None
+    _cache["matcher_for"] = None
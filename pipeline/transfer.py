@@ -8,6 +8,7 @@ owns the upload/verify/replace responsibility inline. Those ~200 lines were
 removed on the post-incident cleanup; keep this file small and living.
 """
 
+import functools
 import hashlib
 import logging
 import os
@@ -91,17 +92,87 @@ def robust_copy(src: str, dst: str, max_retries: int = 3, backoff_secs: float =
     raise RuntimeError("robust_copy: no attempt made")
 
 
-def get_staging_usage(staging_dir: str) -> int:
-    """Get total bytes used in staging directory."""
-    total = 0
-    for dirpath, _, filenames in os.walk(staging_dir):
-        for f in filenames:
-            fp = os.path.join(dirpath, f)
-            try:
-                total += os.path.getsize(fp)
-            except OSError:
-                pass
-    return total
+# fetch_file is tried against every pending queue item in turn, and each
+# attempt opens with the staging-space check. While staging is full that is a
+# full staging walk per queued item per fetch-worker tick — thousands of walks
+# to learn the same answer. Memoise one walk briefly; fetch_file counts every
+# copy it makes into the memo, and the orchestrator invalidates it whenever a
+# stage frees staging space, so neither is seen stale.
+_USAGE_TTL_SECS = 5.0
+_usage_cache: dict[str, tuple[float, tuple[int, int]]] = {}
+
+
+def staging_usage_snapshot(staging_dir: str) -> tuple[int, int]:
+    """Return ``(staging bytes, fetch/ bytes)`` from one walk, memoised for ``_USAGE_TTL_SECS``."""
+    now = time.monotonic()
+    hit = _usage_cache.get(staging_dir)
+    if hit is not None and now - hit[0] < _USAGE_TTL_SECS:
+        return hit[1]
+    usage = _scan_usage(staging_dir)
+    _usage_cache[staging_dir] = (now, usage)
+    return usage
+
+
+def _scan_usage(staging_dir: str) -> tuple[int, int]:
+    """Walk staging with ``os.scandir``, sizing files from their ``DirEntry``.
+
+    On Windows the size comes back with the directory read, so this is one
+    FindNextFile per entry rather than os.walk's listing plus a
+    ``getsize`` stat per file.
+    """
+    fetch_dir = os.path.join(staging_dir, "fetch")
+    total = fetch = 0
+    pending = [staging_dir]
+    while pending:
+        dirpath = pending.pop()
+        try:
+            entries = os.scandir(dirpath)
+        except OSError:
+            continue
+        with entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        pending.append(entry.path)
+                        continue
+                    size = entry.stat().st_size
+                except OSError:
+                    continue
+                total += size
+                if dirpath == fetch_dir:
+                    fetch += size
+    return total, fetch
+
+
+def invalidate_staging_usage(staging_dir: str) -> None:
+    """Drop the memoised snapshot so the next check re-walks staging."""
+    _usage_cache.pop(staging_dir, None)
+
+
+def _add_fetched_usage(staging_dir: str, size: int) -> None:
+    """Count a just-landed fetch into the memoised snapshot instead of
+    dropping it, so the next check doesn't re-walk the tree. Space freed by
+    other stages goes through :func:`invalidate_staging_usage` instead."""
+    hit = _usage_cache.get(staging_dir)
+    if hit is not None:
+        taken_at, (total, fetch) = hit
+        _usage_cache[staging_dir] = (taken_at, (total + size, fetch + size))
+
+
+# The same per-item retry means a full staging drive used to log its
+# "Waiting..." warning once per queued item per tick. Warn once a minute per
+# condition; the repeats in between go to debug.
+_SPACE_WARN_INTERVAL_SECS = 60.0
+_space_warned_at: dict[str, float] = {}
+
+
+def _warn_space(kind: str, message: str) -> None:
+    now = time.monotonic()
+    if now - _space_warned_at.get(kind, float("-inf")) >= _SPACE_WARN_INTERVAL_SECS:
+        _space_warned_at[kind] = now
+        logging.warning(message)
+    else:
+        logging.debug(message)
 
 
 def get_free_space(path: str) -> int:
@@ -109,6 +180,10 @@ def get_free_space(path: str) -> int:
     return shutil.disk_usage(path).free
 
 
+# Statuses fetch_file may claim a row from (None = not yet tracked). Public:
+# the fetch worker filters its queue on the same set, so the two agree.
+FETCH_CLAIMABLE: frozenset[Optional[str]] = frozenset({None, FileStatus.PENDING.value})
+
 # Sentinel returned by ``fetch_file`` when the source file isn't on
 # disk at the recorded path. Callers (the fetch worker in
 # orchestrator.py) treat this as "remove from in-memory queue + flag
@@ -120,6 +195,23 @@ def get_free_space(path: str) -> int:
 SOURCE_MISSING = object()
 
 
+@functools.lru_cache(maxsize=65536)
+def staging_prefix(filepath: str) -> str:
+    """12-hex-char tag derived from a source path, for flat staging filenames.
+
+    Only needs to be stable and collision-unlikely, not cryptographic.
+    BLAKE2b with a 6-byte digest yields the same width as the old
+    ``md5(...).hexdigest()[:12]``, runs a little faster on short paths, and
+    isn't refused by FIPS-mode builds the way MD5 is. Python's ``hash()``
+    is no good here: it's salted per process, and names must match across
+    restarts.
+
+    Memoised: fetch_file names the local copy before its space checks, so
+    every queued item re-derived its tag on every fetch-worker lap.
+    """
+    return hashlib.blake2b(filepath.encode(), digest_size=6).hexdigest()
+
+
 def fetch_file(item: dict, staging_dir: str, config: dict, state: PipelineState, force: bool = False):
     """Copy file from NAS to local staging.
 
@@ -136,31 +228,22 @@ def fetch_file(item: dict, staging_dir: str, config: dict, state: PipelineState,
     # Mirror directory structure under staging/fetch/
     fetch_dir = os.path.join(staging_dir, "fetch")
     # Use a flat structure with hash to avoid path length issues on Windows
-    safe_name = hashlib.md5(source.encode()).hexdigest()[:12] + "_" + item["filename"]
+    safe_name = staging_prefix(source) + "_" + item["filename"]
     local_path = os.path.join(fetch_dir, safe_name)
 
-    os.makedirs(fetch_dir, exist_ok=True)
-
     # Check staging space
-    current_usage = get_staging_usage(staging_dir)
+    current_usage, fetch_usage = staging_usage_snapshot(staging_dir)
     file_size = item["file_size_bytes"]
     if current_usage + file_size > config["max_staging_bytes"]:
-        logging.warning(f"Staging full ({format_bytes(current_usage)} used). Waiting...")
+        _warn_space("staging", f"Staging full ({format_bytes(current_usage)} used). Waiting...")
         return None
 
     free = get_free_space(staging_dir)
     if free < config["min_free_space_bytes"] + file_size:
-        logging.warning(f"Insufficient free space ({format_bytes(free)}). Waiting...")
+        _warn_space("free", f"Insufficient free space ({format_bytes(free)}). Waiting...")
         return None
 
     # Check fetch buffer specifically
-    fetch_usage = 0
-    if os.path.exists(fetch_dir):
-        for f in os.listdir(fetch_dir):
-            try:
-                fetch_usage += os.path.getsize(os.path.join(fetch_dir, f))
-            except OSError:
-                pass
     if fetch_usage + file_size > config["max_fetch_buffer_bytes"] and not force:
         return None  # buffer full — caller handles the wait
 
@@ -182,12 +265,11 @@ def fetch_file(item: dict, staging_dir: str, config: dict, state: PipelineState,
 
     # Atomically claim this file for fetching — prevents the prefetch thread
     # and main loop from copying the same file concurrently (WinError 32).
-    with state._lock:
-        existing = state.get_file(source)
-        current = existing["status"] if existing else None
-        if current == FileStatus.FETCHING.value:
-            return None  # Another thread is already fetching this file
-        state.set_file(source, FileStatus.FETCHING, local_path=local_path)
+    # Only a new or PENDING row is claimable: callers filter on that from a
+    # snapshot, and a row that went FETCHING/PROCESSING/terminal since must
+    # not be re-fetched over.
+    if not state.try_transition(source, FETCH_CLAIMABLE, FileStatus.FETCHING, local_path=local_path):
+        return None  # Another thread is fetching it, or it has moved on
 
     logging.info(f"Fetching: {item['filename']} ({format_bytes(file_size)})")
 
@@ -201,6 +283,10 @@ def fetch_file(item: dict, staging_dir: str, config: dict, state: PipelineState,
             return None
 
     try:
+        # Created here rather than on entry: most calls return at the space
+        # checks above (the fetch worker offers every pending item in turn),
+        # and those don't need the directory.
+        os.makedirs(fetch_dir, exist_ok=True)
         start = time.time()
         robust_copy(source, local_path)
         elapsed = time.time() - start
@@ -211,6 +297,7 @@ def fetch_file(item: dict, staging_dir: str, config: dict, state: PipelineState,
             os.remove(local_path)
             state.set_file(source, FileStatus.ERROR, error="fetch incomplete", stage="fetch")
             return None
+        _add_fetched_usage(staging_dir, local_size)
         speed = file_size / elapsed / (1024**2) if elapsed > 0 else 0
         logging.info(f"Fetched in {format_duration(elapsed)} ({speed:.0f} MB/s)")
         state.set_file(
@@ -224,6 +311,7 @@ def fetch_file(item: dict, staging_dir: str, config: dict, state: PipelineState,
         )
         return local_path
     except Exception as e:
+        invalidate_staging_usage(staging_dir)
         logging.error(f"Fetch failed: {e}")
         state.set_file(source, FileStatus.ERROR, error=str(e), stage="fetch")
         # Clean up partial — may fail if another process holds a lock
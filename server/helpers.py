@@ -17,22 +17,56 @@ DISMISSED_DIR = STAGING_DIR / "dismissed"
 CONFIG_OVERRIDES_FILE = CONTROL_DIR / "config_overrides.json"
 
 
+# The dashboard reads the whole state far more often than it changes: every
+# WebSocket client re-reads it on each write and again on a ~6s heartbeat, and
+# the forecast / diagnostics endpoints read it per request. Each read decoded
+# every row's extras JSON. One build is memoised against the stats of the DB
+# and its WAL — any committed write touches one of them.
+_STATE_CACHE_LOCK = threading.Lock()
+_state_cache: tuple[tuple, dict] | None = None
+
+
+def _state_db_key(db_path: str) -> tuple:
+    """(mtime_ns, size) of the state DB and its -wal, None for a missing file."""
+    key = []
+    for path in (db_path, db_path + "-wal"):
+        try:
+            st = os.stat(path)
+        except OSError:
+            key.append(None)
+            continue
+        key.append((st.st_mtime_ns, st.st_size))
+    return tuple(key)
+
+
 def _get_pipeline_state() -> dict | None:
     """Read pipeline state from SQLite, returning the same dict shape as the old JSON.
 
     Falls back to the JSON file if the DB doesn't exist yet (pre-migration).
+    The SQLite read is cached until the DB or WAL changes; callers share the
+    returned dict and must not mutate it.
     """
+    global _state_cache
     db_path = str(PIPELINE_STATE_DB)
     if os.path.exists(db_path):
+        # Keyed on the stats taken BEFORE the read: a write landing mid-read
+        # leaves a key that no longer matches, so the next call re-reads.
+        key = (db_path, _state_db_key(db_path))
+        with _STATE_CACHE_LOCK:
+            if _state_cache is not None and _state_cache[0] == key:
+                return _state_cache[1]
         try:
             from pipeline.state import PipelineState
 
             state = PipelineState(db_path)
             data = state.data
             state.close()
-            return data
         except Exception:
             pass
+        else:
+            with _STATE_CACHE_LOCK:
+                _state_cache = (key, data)
+            return data
     # Fallback to JSON
     return read_json_safe(STATE_FILE)
 
@@ -139,9 +173,20 @@ def write_json_safe(path: Path, data: dict | list) -> None:
     parse, leave the destination intact and raise. Prevents the silent
     overwrite class that wiped media_report.json + priority.json +
     agents.registry.json + heavy_worker_state.json simultaneously.
+
+    The tmp is fsync'd before the replace, as media_report's writer does:
+    these are operator-intent files (config overrides, priority, skip), and
+    a crash straight after the rename must not leave an empty one behind.
     """
     tmp = path.with_suffix(".tmp")
-    tmp.write_text(json.dumps(data, indent=2, ensure_ascii=False), encoding="utf-8")
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(json.dumps(data, indent=2, ensure_ascii=False))
+        f.flush()
+        try:
+            os.fsync(f.fileno())
+        except OSError:
+            # fsync isn't available everywhere; not fatal
+            pass
     try:
         json.loads(tmp.read_text(encoding="utf-8"))
     except json.JSONDecodeError as e:
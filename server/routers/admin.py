@@ -23,6 +23,7 @@ from datetime import datetime, timedelta, timezone
 
 from fastapi import APIRouter, HTTPException, Request
 
+from pipeline.state import SETTLED_STATUSES
 from server.helpers import (
     CONFIG_OVERRIDES_FILE,
     CONTROL_DIR,
@@ -454,6 +455,14 @@ def _res_key_from_video(v: dict) -> str:
     return "unknown"
 
 
+# Rows the forecast does not count as remaining work: everything terminal
+# (DONE + FLAGGED_*) plus ERROR, which needs user action, not pipeline time.
+# Derived from the enum so a new FLAGGED_* status is excluded automatically —
+# the old hand-written list predated FLAGGED_UNDERSIZED and counted those
+# rows as remaining. Plain strings, since state rows carry the raw value.
+_FORECAST_SETTLED: frozenset[str] = frozenset(s.value for s in SETTLED_STATUSES)
+
+
 def _entry_res_key(e: dict) -> str:
     """Tier of a history entry. Prefer the top-level res_key, but fall back to
     source.video -- recent entries stopped writing res_key, which bucketed them
@@ -580,14 +589,6 @@ def get_history_summary() -> dict:
 
         state_data = _get_pipeline_state()
         if state_data and "files" in state_data:
-            # 2026-05-11: refresh the terminal-status filter to match the
-            # current FileStatus enum (DONE + FLAGGED_*). The old list
-            # ("verified", "replaced", "skipped", "error") was leftover from
-            # a pre-rewrite enum and was over-counting "remaining" because
-            # it never matched current DONE rows. ERROR is excluded too
-            # because errored rows need user action, not pipeline time.
-            terminal = {"done", "error", "flagged_foreign_audio",
-                        "flagged_undetermined", "flagged_manual", "flagged_corrupt"}
             # The state DB shape is ``{filepath: row_dict}``; the row doesn't
             # always carry its own filepath field (the path is the key).
             # Iterate items() so we keep the path for the media_report lookup
@@ -597,7 +598,7 @@ def get_history_summary() -> dict:
             remaining_files_list: list[tuple[str, dict]] = [
                 (fp, f)
                 for fp, f in state_data["files"].items()
-                if (f.get("status") or "").lower() not in terminal
+                if (f.get("status") or "").lower() not in _FORECAST_SETTLED
             ]
             remaining = len(remaining_files_list)
 
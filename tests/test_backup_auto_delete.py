@@ -27,9 +27,9 @@ def test_finalize_upload_deletes_backup_after_replace():
     import pipeline.full_gamut as fg
 
     src = inspect.getsource(fg.finalize_upload)
-    # The deletion lives inside an existence guard so an absent bak
-    # (fresh-encode case) is a no-op.
-    assert "if os.path.exists(backup_path):" in src
+    # An absent bak (fresh-encode case) is a no-op: the getsize/remove
+    # raise FileNotFoundError, which is caught on its own and not logged.
+    assert "except FileNotFoundError:" in src
     # And actually removes the file.
     assert "os.remove(backup_path)" in src, (
         "the deletion must call os.remove on the .original.bak path. "
@@ -106,3 +106,52 @@ def test_replace_log_no_longer_claims_backup_is_kept_long_term():
         "drop the suffix or say 'backup kept for verification' so the "
         "transient nature is clear."
     )
+
+
+def test_move_into_place_keeps_an_existing_backup(tmp_path):
+    """Re-encode: the .bak from the first run is the truly-original source
+    and must survive, even where os.rename would overwrite (POSIX)."""
+    from pipeline.full_gamut import _move_encode_into_place
+
+    src = tmp_path / "Heat.mkv"
+    src.write_bytes(b"previous av1")
+    bak = tmp_path / "Heat.mkv.original.bak"
+    bak.write_bytes(b"original h264")
+    dest = tmp_path / "Heat.av1.tmp"
+    dest.write_bytes(b"new av1")
+
+    _move_encode_into_place(str(src), str(dest), str(src), str(bak))
+
+    assert bak.read_bytes() == b"original h264"
+    assert src.read_bytes() == b"new av1"
+    assert not dest.exists()
+
+
+def test_move_into_place_backs_up_a_fresh_source(tmp_path):
+    from pipeline.full_gamut import _move_encode_into_place
+
+    src = tmp_path / "Heat.mkv"
+    src.write_bytes(b"h264")
+    bak = tmp_path / "Heat.mkv.original.bak"
+    dest = tmp_path / "Heat.av1.tmp"
+    dest.write_bytes(b"av1")
+
+    _move_encode_into_place(str(src), str(dest), str(src), str(bak))
+
+    assert bak.read_bytes() == b"h264"
+    assert src.read_bytes() == b"av1"
+
+
+def test_move_into_place_raises_when_the_target_folder_is_gone(tmp_path):
+    """A missing dest_path is a skip; a missing target folder is not."""
+    import pytest
+
+    from pipeline.full_gamut import _move_encode_into_place
+
+    dest = tmp_path / "Heat.av1.tmp"
+    dest.write_bytes(b"av1")
+    gone = tmp_path / "gone" / "Heat.mkv"
+
+    _move_encode_into_place(str(gone), str(tmp_path / "never.tmp"), str(gone), str(gone) + ".original.bak")
+    with pytest.raises(FileNotFoundError):
+        _move_encode_into_place(str(gone), str(dest), str(gone), str(gone) + ".original.bak")
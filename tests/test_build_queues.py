@@ -85,6 +85,34 @@ def test_processable_files_still_queued(tmp_path):
     state.close()
 
 
+def test_report_with_utf8_bom_and_non_ascii_titles_loads(tmp_path):
+    """The report is read as bytes and handed to json.loads, which detects
+    the encoding itself: a BOM written by a Windows editor and non-ASCII
+    titles must both survive."""
+    files = [
+        {
+            "filepath": r"\\KieranNAS\Media\Movies\Amélie (2001).mkv",
+            "filename": "Amélie (2001).mkv",
+            "library_type": "movie",
+            "video": {"codec_raw": "h264", "codec": "H.264", "resolution_class": "1080p"},
+            "audio_streams": [{"codec_raw": "eac3", "channels": 6, "language": "fre"}],
+            "subtitle_streams": [],
+            "file_size_bytes": 10_000_000_000,
+            "duration_seconds": 6000,
+            "overall_bitrate_kbps": 13000,
+        },
+    ]
+    path = tmp_path / "media_report.json"
+    path.write_bytes(b"\xef\xbb\xbf" + json.dumps({"files": files}, ensure_ascii=False).encode("utf-8"))
+    state = PipelineState(str(tmp_path / "pipeline_state.db"))
+    control = PipelineControl(str(tmp_path))
+
+    full, gap = build_queues(str(path), build_config({}), state, control)
+
+    assert [it["filename"] for it in full + gap] == ["Amélie (2001).mkv"]
+    state.close()
+
+
 def test_corrupt_flag_persists_on_rerun(tmp_path):
     """A second build_queues pass over the same broken entry must not flip it back to PENDING."""
     files = [
@@ -221,3 +249,107 @@ def test_av1_with_opus_audio_routes_to_full_gamut(tmp_path):
     assert entry.get("force_reencode"), "AV1 needing an audio transcode must be force-stamped"
 
     state.close()
+
+
+def test_queue_items_share_interned_enum_strings():
+    """resolution / video_codec / library_type are interned so a large
+    queue holds one object per value (and config lookups hit by identity)."""
+    import sys
+
+    from pipeline.__main__ import _build_full_gamut_item
+
+    # json.loads produces distinct str objects per occurrence — mimic that.
+    entries = json.loads(
+        json.dumps(
+            [
+                {
+                    "filepath": f"/nas/{i}.mkv",
+                    "library_type": "series",
+                    "video": {"codec": "HEVC", "resolution_class": "1080p"},
+                }
+                for i in range(2)
+            ]
+        )
+    )
+    a, b = (_build_full_gamut_item(e) for e in entries)
+    assert a["resolution"] is b["resolution"] is sys.intern("1080p")
+    assert a["video_codec"] is b["video_codec"]
+    assert a["library_type"] is b["library_type"]
+    # Missing / non-str values pass through untouched.
+    assert _build_full_gamut_item({"video": {"hdr": True}})["resolution"] == ""
+
+
+def test_gap_filler_queue_is_size_sorted_and_never_needs_fetch(tmp_path):
+    """_sort_gap_filler sorts by size alone. That is only equivalent to the
+    old (needs_fetch, size) key because categorise_entry never routes an
+    audio-transcode (needs_fetch) entry to gap_filler — pin both halves."""
+    from pipeline.gap_filler import analyse_gaps
+
+    def _av1(name, size, audio_codec):
+        return {
+            "filepath": rf"\\KieranNAS\Media\Series\Show\{name}.mkv",
+            "filename": f"{name}.mkv",
+            "library_type": "series",
+            "video": {"codec_raw": "av1", "codec": "AV1", "resolution_class": "1080p"},
+            "audio_streams": [{"codec_raw": audio_codec, "channels": 6, "language": "eng"}],
+            "subtitle_streams": [
+                {"codec_raw": "subrip", "language": "eng", "title": ""},
+                {"codec_raw": "subrip", "language": "fre", "title": ""},
+            ],
+            "file_size_bytes": size,
+            "duration_seconds": 3000,
+            "overall_bitrate_kbps": 4000,
+        }
+
+    files = [
+        _av1("Big", 3_000_000_000, "eac3"),
+        _av1("NeedsTranscode", 1_000_000_000, "opus"),
+        _av1("Small", 1_200_000_000, "eac3"),
+        _av1("Mid", 2_000_000_000, "eac3"),
+    ]
+    report_path = _write_report(tmp_path, files)
+    state = PipelineState(str(tmp_path / "pipeline_state.db"))
+    control = PipelineControl(str(tmp_path))
+    config = build_config({})
+
+    full, gap = build_queues(report_path, config, state, control)
+
+    assert [it["filename"] for it in full] == ["NeedsTranscode.mkv"]
+    assert [e["filename"] for e in gap] == ["Small.mkv", "Mid.mkv", "Big.mkv"]
+    assert not any(analyse_gaps(e, config).needs_fetch for e in gap)
+
+    state.close()
+
+
+def test_force_reencode_done_row_is_read_once(tmp_path, monkeypatch):
+    """A DONE row carrying force_reencode routes to full_gamut off the single
+    read categorise_entry already made — no second lookup of the same row."""
+    fp = r"\\KieranNAS\Media\Movies\Redo.mkv"
+    files = [
+        {
+            "filepath": fp,
+            "filename": "Redo.mkv",
+            "library_type": "movie",
+            "video": {"codec_raw": "av1", "codec": "AV1", "resolution_class": "1080p"},
+            "audio_streams": [{"codec_raw": "eac3", "channels": 6, "language": "eng"}],
+            "subtitle_streams": [],
+            "file_size_bytes": 4_000_000_000,
+            "duration_seconds": 6000,
+            "overall_bitrate_kbps": 5000,
+        },
+    ]
+    report_path = _write_report(tmp_path, files)
+    state = PipelineState(str(tmp_path / "pipeline_state.db"))
+    state.set_file(fp, FileStatus.DONE, force_reencode=True)
+    control = PipelineControl(str(tmp_path))
+
+    reads = []
+    real_get_file = state.get_file
+    monkeypatch.setattr(state, "get_file", lambda p: reads.append(p) or real_get_file(p))
+
+    full, _gap = build_queues(report_path, build_config({}), state, control)
+
+    assert [item["filepath"] for item in full] == [fp]
+    assert reads.count(fp) == 1
+
+    state.close()
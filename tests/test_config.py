@@ -61,6 +61,24 @@ class TestBuildConfig:
         build_config({"cq": {"movie": {"1080p": 99}}})
         assert DEFAULT_CONFIG["cq"]["movie"]["1080p"] == original_cq
 
+    def test_nested_dicts_are_private_and_leaves_immutable(self):
+        """build_config copies only the dict levels; every shared leaf must be
+        immutable so no caller can reach DEFAULT_CONFIG through it."""
+        config = build_config()
+        config["cq"]["movie"]["1080p"] = 99
+        config["audio_bulky_threshold_kbps"]["dts"] = 1
+        assert DEFAULT_CONFIG["cq"]["movie"]["1080p"] != 99
+        assert DEFAULT_CONFIG["audio_bulky_threshold_kbps"]["dts"] == 700
+
+        def _mutable_leaves(d, path=""):
+            for k, v in d.items():
+                if isinstance(v, dict):
+                    yield from _mutable_leaves(v, f"{path}{k}.")
+                elif isinstance(v, (list, set, bytearray)):
+                    yield f"{path}{k}"
+
+        assert list(_mutable_leaves(DEFAULT_CONFIG)) == []
+
 
 class TestGetResKey:
     """get_res_key maps item dicts to resolution keys."""
@@ -77,6 +95,10 @@ class TestGetResKey:
             ({"resolution": "SD"}, "SD"),
             ({}, "1080p"),  # default resolution is 1080p when missing
             ({"resolution": "unknown"}, "SD"),
+            ({"resolution": "unknown", "hdr": True}, "SD"),
+            ({"resolution": "1080p", "hdr": True}, "1080p"),  # HDR only splits 4K
+            ({"resolution": "4K", "hdr": 1}, "4K_HDR"),  # truthy, not just True
+            ({"resolution": "4K", "hdr": None}, "4K_SDR"),
         ],
     )
     def test_resolution_mapping(self, item, expected):
@@ -120,6 +142,21 @@ class TestResolveEncodeParams:
             params = resolve_encode_params(config, item)
             assert params["content_type"] == "series", f"{lib_type} should be 'series'"
 
+    @pytest.mark.parametrize(
+        "item",
+        [
+            {"resolution": "4K", "hdr": True},
+            {"resolution": "4K"},
+            {"resolution": "720p", "hdr": True},
+            {},
+            {"resolution": "unknown"},
+        ],
+    )
+    def test_res_key_matches_get_res_key(self, item):
+        """resolve_encode_params classifies resolution exactly like get_res_key."""
+        params = resolve_encode_params(build_config(), {"library_type": "movie", **item})
+        assert params["res_key"] == get_res_key(item)
+
     def test_maxrate_and_bufsize_present(self):
         """4K HDR movie includes a maxrate + bufsize, with bufsize == 2x maxrate.
 
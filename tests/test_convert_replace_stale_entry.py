@@ -166,3 +166,29 @@ def test_finalize_upload_keys_done_on_final_path_and_purges():
         "the stale-path purge must run AFTER the DONE transition so a crash "
         "between them can never leave the real file un-recorded."
     )
+
+
+def test_source_report_entry_is_the_pre_replace_entry(tmp_report_paths):
+    """finalize_upload reads the source's report entry once, up front. The
+    history record used to re-read the report after update_entry / the purge
+    had swapped in the AV1 output's entry, so its "source" block described
+    the output."""
+    import pipeline.full_gamut as fg
+
+    mp4 = r"\\NAS\Movies\Sneakers (1992)\Sneakers (1992).mp4"
+    mkv = r"\\NAS\Movies\Sneakers (1992)\Sneakers (1992).mkv"
+    _seed_report(mp4, mkv)
+
+    entry = fg._source_report_entry(mp4, mkv)
+    assert entry["video"]["codec_raw"] == "h264"
+
+    src = inspect.getsource(fg.finalize_upload)
+    assert src.count("_source_report_entry(") == 1
+    assert "read_json_safe(MEDIA_REPORT)" not in src
+    assert src.find("_source_report_entry(") < src.find("update_entry(final_path")
+
+
+def test_source_report_entry_tolerates_missing_report(tmp_report_paths):
+    import pipeline.full_gamut as fg
+
+    assert fg._source_report_entry(r"\\NAS\a.mkv", r"\\NAS\a.mkv") is None
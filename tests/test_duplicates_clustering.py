@@ -0,0 +1,27 @@
+"""find_duration_resolution_dupes chains files whose sorted durations sit
+within tolerance of their neighbour, per resolution class."""
+
+from __future__ import annotations
+
+from tools.duplicates import find_duration_resolution_dupes
+
+
+def _f(name: str, dur: float, res: str = "1080p") -> dict:
+    return {"filepath": f"/lib/{name}", "filename": name, "duration_seconds": dur, "video": {"resolution_class": res}}
+
+
+def test_clusters_chain_on_neighbour_gaps_and_drop_singletons():
+    files = [
+        _f("a.mkv", 100.0), _f("b.mkv", 101.5), _f("c.mkv", 103.0),  # chained: each gap <= 2
+        _f("d.mkv", 200.0),                                          # alone
+        _f("e.mkv", 300.0), _f("f.mkv", 302.0),                      # gap exactly at tolerance
+        _f("g.mkv", 300.5, res="720p"),                              # other class, alone
+    ]
+
+    rows = find_duration_resolution_dupes(files, duration_tolerance=2.0)
+
+    groups: dict[int, list[str]] = {}
+    for row in rows:
+        groups.setdefault(row["group_id"], []).append(row["filename"])
+    assert sorted(groups.values()) == [["a.mkv", "b.mkv", "c.mkv"], ["e.mkv", "f.mkv"]]
+    assert all(row["mode"] == "duration" and row["resolution"] == "1080p" for row in rows)
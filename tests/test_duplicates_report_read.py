@@ -0,0 +1,25 @@
+"""tools.duplicates reads the report in one binary read + decode."""
+
+from __future__ import annotations
+
+import csv
+import json
+import sys
+
+from tools import duplicates
+
+
+def test_bom_prefixed_report_is_read(tmp_path, monkeypatch):
+    files = [
+        {"filepath": f"/lib/{n}", "filename": n, "duration_seconds": 100.0, "video": {"resolution_class": "1080p"}}
+        for n in ("a.mkv", "b.mkv")
+    ]
+    report = tmp_path / "media_report.json"
+    report.write_bytes(b"\xef\xbb\xbf" + json.dumps({"files": files}).encode())
+    out = tmp_path / "dupes.csv"
+    monkeypatch.setattr(sys, "argv", ["duplicates", "--report", str(report), "--output", str(out), "--mode", "duration"])
+
+    duplicates.main()
+
+    with open(out, encoding="utf-8") as fh:
+        assert [row["filename"] for row in csv.DictReader(fh)] == ["a.mkv", "b.mkv"]
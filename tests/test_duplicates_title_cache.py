@@ -0,0 +1,30 @@
+"""normalize_title is memoised per filename.
+
+/api/duplicates runs find_title_duration_dupes over the whole report on every
+request; the second request over an unchanged report should not re-run the
+regex strip and filename cleaners for each file.
+"""
+
+from __future__ import annotations
+
+from tools.duplicates import find_title_duration_dupes, normalize_title
+
+
+def _files():
+    return [
+        {"filepath": "/m/Heat (1995)/Heat.1995.1080p.BluRay.x264.mkv",
+         "filename": "Heat.1995.1080p.BluRay.x264.mkv", "duration_seconds": 10240},
+        {"filepath": "/m/Heat (1995)/Heat (1995) [2160p HEVC].mkv",
+         "filename": "Heat (1995) [2160p HEVC].mkv", "duration_seconds": 10250},
+    ]
+
+
+def test_repeat_scan_hits_the_cache():
+    normalize_title.cache_clear()
+    first = find_title_duration_dupes(_files())
+    second = find_title_duration_dupes(_files())
+
+    assert first == second
+    assert {row["normalized_title"] for row in first} == {"heat"}
+    info = normalize_title.cache_info()
+    assert (info.misses, info.hits) == (2, 2)
@@ -0,0 +1,112 @@
+"""_run_encode writes to a .part.mkv and renames into place on success.
+
+Before this, ffmpeg wrote straight to output_path, so a crash or kill
+mid-encode left a truncated file under the very name upload looks for, and
+the startup staging sweep preserved it because a live state row referenced
+that path. Now a file at output_path is always a completed encode.
+"""
+
+from __future__ import annotations
+
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+from pipeline import full_gamut
+from pipeline.full_gamut import _partial_output_path, _run_encode
+
+
+class _FakePopen:
+    """Writes a few bytes to the command's output arg, then exits ``rc``."""
+
+    calls: list[list[str]] = []
+
+    def __init__(self, rc: int):
+        self.rc = rc
+
+    def __call__(self, cmd, **_kw):
+        _FakePopen.calls.append(list(cmd))
+        with open(cmd[-1], "wb") as f:
+            f.write(b"\x1a\x45\xdf\xa3")
+        return SimpleNamespace(returncode=self.rc)
+
+
+def _patch(monkeypatch, rc: int) -> None:
+    _FakePopen.calls = []
+    monkeypatch.setattr(full_gamut.subprocess, "Popen", _FakePopen(rc))
+    monkeypatch.setattr(full_gamut, "_stream_encode_progress", lambda *a, **kw: "Conversion failed!")
+    monkeypatch.setattr(full_gamut, "_output_growth_watchdog", lambda *a, **kw: None)
+
+
+def test_partial_name_keeps_mkv_extension():
+    """ffmpeg picks the muxer from the extension — ".mkv.part" would fail."""
+    assert _partial_output_path("/s/encoded/ab12_Heat.mkv") == "/s/encoded/ab12_Heat.part.mkv"
+
+
+def test_success_renames_part_onto_output(tmp_path, monkeypatch):
+    _patch(monkeypatch, rc=0)
+    out = tmp_path / "ab12_Heat.mkv"
+    cmd = ["ffmpeg", "-y", "-i", "in.mkv", str(out)]
+
+    assert _run_encode(cmd, "in.mkv", str(out), {}, {}, MagicMock(), "/nas/Heat.mkv") is True
+
+    assert _FakePopen.calls[0][-1] == str(tmp_path / "ab12_Heat.part.mkv")
+    assert out.exists()
+    assert not (tmp_path / "ab12_Heat.part.mkv").exists()
+
+
+def test_failure_leaves_no_file_at_output_path(tmp_path, monkeypatch):
+    _patch(monkeypatch, rc=1)
+    out = tmp_path / "ab12_Heat.mkv"
+    cmd = ["ffmpeg", "-y", "-i", "in.mkv", str(out)]
+    state = MagicMock()
+
+    assert _run_encode(cmd, "in.mkv", str(out), {}, {}, state, "/nas/Heat.mkv") is False
+
+    assert not out.exists()
+    assert not (tmp_path / "ab12_Heat.part.mkv").exists()
+    assert state.set_file.call_args.kwargs["stage"] == "encoding"
+
+
+def test_fallback_rebuild_keeps_the_callers_params(tmp_path, monkeypatch):
+    """A bloat retry runs at a raised CQ; if that attempt then falls back to
+    software decode, the rebuilt command must keep the raised CQ rather than
+    re-resolving the original one."""
+    _FakePopen.calls = []
+    outcomes = iter([1, 0])
+
+    def _popen(cmd, **_kw):
+        _FakePopen.calls.append(list(cmd))
+        with open(cmd[-1], "wb") as f:
+            f.write(b"x")
+        return SimpleNamespace(returncode=next(outcomes))
+
+    rebuilt = {}
+
+    def _build(input_path, output_path, item, config, **kw):
+        rebuilt.update(kw)
+        return ["ffmpeg", "-i", input_path, output_path]
+
+    monkeypatch.setattr(full_gamut.subprocess, "Popen", _popen)
+    monkeypatch.setattr(full_gamut, "_stream_encode_progress", lambda *a, **kw: "CUDA_ERROR_NOT_SUPPORTED")
+    monkeypatch.setattr(full_gamut, "_output_growth_watchdog", lambda *a, **kw: None)
+    monkeypatch.setattr("pipeline.ffmpeg.build_ffmpeg_cmd", _build)
+    out = tmp_path / "ab12_Heat.mkv"
+
+    ok = _run_encode(["ffmpeg", "-i", "in.mkv", str(out)], "in.mkv", str(out), {}, {}, MagicMock(),
+                     "/nas/Heat.mkv", params={"cq": 34})
+
+    assert ok is True
+    assert rebuilt["use_hwaccel"] is False
+    assert rebuilt["params"] == {"cq": 34}
+    assert _FakePopen.calls[1][-1] == str(tmp_path / "ab12_Heat.part.mkv")
+
+
+def test_cleanup_tolerates_missing_and_none(tmp_path):
+    from pipeline.full_gamut import _cleanup
+
+    present = tmp_path / "a.part.mkv"
+    present.write_bytes(b"x")
+
+    _cleanup(None, str(tmp_path / "never-existed.mkv"), str(present))
+
+    assert not present.exists()
@@ -0,0 +1,55 @@
+"""ffmpeg stderr captured during an encode is bounded.
+
+_stream_encode_progress used to append every stderr line to a list for the
+life of the encode. A multi-hour encode that repeats a warning per packet
+(non-monotonic DTS on a damaged audio track is the usual one) grew that list
+without limit. _collect_stderr keeps head + tail, and keeps one copy of any
+middle line the retry selection in _run_encode depends on.
+"""
+
+from __future__ import annotations
+
+import io
+
+from pipeline import full_gamut
+from pipeline.full_gamut import _collect_stderr
+
+
+def _stream(lines: list[str]) -> io.StringIO:
+    return io.StringIO("".join(f"{line}\n" for line in lines))
+
+
+def test_short_stderr_is_returned_verbatim():
+    lines = ["ffmpeg version 7.1", "Input #0, matroska", "Error while decoding"]
+    assert _collect_stderr(_stream(lines)) == "\n".join(lines)
+
+
+def test_long_stderr_keeps_head_and_tail_only(monkeypatch):
+    monkeypatch.setattr(full_gamut, "_STDERR_HEAD_LINES", 3)
+    monkeypatch.setattr(full_gamut, "_STDERR_TAIL_LINES", 3)
+    lines = [f"line {i}" for i in range(1000)]
+
+    out = _collect_stderr(_stream(lines)).split("\n")
+
+    assert out[:3] == ["line 0", "line 1", "line 2"]
+    assert out[-3:] == ["line 997", "line 998", "line 999"]
+    assert out[3] == "[... 994 stderr lines omitted ...]"
+    assert len(out) == 7
+
+
+def test_retry_marker_in_trimmed_middle_survives(monkeypatch):
+    """_run_encode picks the audio_copy retry on "non-monotonic dts" anywhere
+    in stderr — trimming must not hide it."""
+    monkeypatch.setattr(full_gamut, "_STDERR_HEAD_LINES", 2)
+    monkeypatch.setattr(full_gamut, "_STDERR_TAIL_LINES", 2)
+    lines = ["banner", "mapping"]
+    lines += ["frame=1"] * 10
+    lines += ["[aist#0:1/dts] Non-monotonic DTS; previous: 100, current: 90"] * 500
+    lines += ["frame=2"] * 10
+    lines += ["Conversion failed!", "exit"]
+
+    out = _collect_stderr(_stream(lines))
+
+    assert "non-monotonic dts" in out.lower()
+    assert out.lower().count("non-monotonic dts") == 1
+    assert out.endswith("Conversion failed!\nexit")
@@ -0,0 +1,64 @@
+"""pipeline.exclusion_match — the substring matcher both exclusion lists use."""
+
+from __future__ import annotations
+
+import re
+
+from pipeline import audio_exclusion, subs_exclusion
+from pipeline.exclusion_match import cached_matcher, minimal_patterns
+
+
+def test_no_patterns_means_no_matcher():
+    assert cached_matcher({}, ()) is None
+
+
+def test_metacharacters_match_as_plain_substrings():
+    m = cached_matcher({}, ("s.w.a.t. [pilot]", "heat (1995)"))
+    assert m.search(r"\\nas\series\s.w.a.t. [pilot]\e01.mkv")
+    assert m.search(r"\\nas\movies\heat (1995)\heat.mkv")
+    assert not m.search(r"\\nas\series\sxwxaxtx pilot\e01.mkv")
+
+
+def test_compiled_once_per_pattern_tuple():
+    cache: dict = {}
+    patterns = ("puffin rock",)
+    first = cached_matcher(cache, patterns)
+    assert cached_matcher(cache, patterns) is first
+    assert cached_matcher(cache, ("sunrise",)) is not first
+
+
+def test_subsumed_and_duplicate_patterns_are_pruned():
+    assert minimal_patterns(("puffin rock season 1", "puffin rock", "puffin rock", "sunrise")) == [
+        "sunrise",
+        "puffin rock",
+    ]
+
+
+def test_pruning_does_not_change_what_matches():
+    m = cached_matcher({}, ("puffin rock season 1", "puffin rock", "sunrise"))
+    assert sorted(m.pattern.split("|")) == [re.escape("puffin rock"), "sunrise"]
+    assert m.search(r"\\nas\series\puffin rock\season 2\e01.mkv")
+    assert m.search(r"\\nas\movies\sunrise (1927)\film.mkv")
+    assert not m.search(r"\\nas\series\the office\e01.mkv")
+
+
+def test_both_exclusion_lists_use_the_shared_matcher(tmp_path, monkeypatch):
+    calls: list[tuple[str, ...]] = []
+    real = cached_matcher
+
+    def spy(cache, patterns):
+        calls.append(patterns)
+        return real(cache, patterns)
+
+    monkeypatch.setattr(subs_exclusion, "cached_matcher", spy)
+    monkeypatch.setattr(audio_exclusion, "cached_matcher", spy)
+    f = tmp_path / "list.json"
+    f.write_text('{"patterns": ["Puffin Rock"]}', encoding="utf-8")
+    subs_exclusion.reset_cache_for_tests()
+    audio_exclusion.reset_cache_for_tests()
+
+    assert subs_exclusion.is_subs_optional(r"\\NAS\Series\Puffin Rock\E01.mkv", path=f)
+    assert audio_exclusion.is_foreign_audio_ok(r"\\NAS\Series\Puffin Rock\E01.mkv", path=f)
+    assert calls == [("puffin rock",), ("puffin rock",)]
+    subs_exclusion.reset_cache_for_tests()
+    audio_exclusion.reset_cache_for_tests()
@@ -19,7 +19,7 @@ from __future__ import annotations
 
 import sys
 from pathlib import Path
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
@@ -111,3 +111,41 @@ def test_remove_missing_source_drops_queue_entry_and_flags(tmp_path):
     assert row is not None
     assert row["status"] == FileStatus.FLAGGED_CORRUPT.value
     assert "source missing" in (row.get("reason") or "")
+
+
+def test_fetch_file_will_not_claim_a_row_that_moved_on(tmp_path):
+    """The prefetch lap filters on a status snapshot; if a row went terminal
+    after that snapshot, fetch_file's claim must refuse it rather than drag
+    it back to FETCHING."""
+    state = _state(tmp_path)
+    source = tmp_path / "Heat.mkv"
+    source.write_bytes(b"x" * 10)
+    state.set_file(str(source), FileStatus.DONE)
+    item = {"filepath": str(source), "filename": "Heat.mkv", "file_size_bytes": 10}
+    config = {
+        "max_staging_bytes": 1_000_000_000_000,
+        "min_free_space_bytes": 0,
+        "max_fetch_buffer_bytes": 100_000_000_000,
+    }
+
+    assert fetch_file(item, str(tmp_path), config, state) is None
+    assert state.get_file(str(source))["status"] == FileStatus.DONE.value
+
+
+def test_fetch_file_claim_reads_only_the_status(tmp_path, monkeypatch):
+    """The claim branches on status alone, so it must not pay for a full
+    row read + extras decode while holding the state lock."""
+    state = _state(tmp_path)
+    source = tmp_path / "Heat.mkv"
+    source.write_bytes(b"x" * 10)
+    state.set_file(str(source), FileStatus.UPLOADING)
+    monkeypatch.setattr(state, "get_file", MagicMock(side_effect=AssertionError("full row read")))
+    item = {"filepath": str(source), "filename": "Heat.mkv", "file_size_bytes": 10}
+    config = {
+        "max_staging_bytes": 1_000_000_000_000,
+        "min_free_space_bytes": 0,
+        "max_fetch_buffer_bytes": 100_000_000_000,
+    }
+
+    assert fetch_file(item, str(tmp_path), config, state) is None
+    assert state.get_status(str(source)) == FileStatus.UPLOADING.value
@@ -162,6 +162,26 @@ class TestBuildFfmpegCmdInvariants:
         )
         assert "-g" not in cmd
 
+    def test_precomputed_params_are_used_verbatim(self, monkeypatch) -> None:
+        """The encode path resolves params once (it hits the state DB for the
+        CQ override) and passes them in; the builder must not re-resolve."""
+        import pipeline.ffmpeg as ffmpeg_mod
+        from pipeline.config import resolve_encode_params
+
+        cfg = _base_config()
+        item = _base_item()
+        params = dict(resolve_encode_params(cfg, item), cq=41)
+
+        def _fail(*_a, **_kw):
+            raise AssertionError("resolve_encode_params called despite params=")
+
+        monkeypatch.setattr(ffmpeg_mod, "resolve_encode_params", _fail)
+        cmd = build_ffmpeg_cmd(
+            input_path="in.mkv", output_path="out.mkv",
+            item=item, config=cfg, params=params,
+        )
+        assert cmd[cmd.index("-cq") + 1] == "41"
+
 
 class TestBuildAudioRemuxCmdInvariants:
     """Invariants for the audio-remux-only ffmpeg command builder."""
@@ -260,6 +280,36 @@ class TestHwaccelCuda:
         )
         assert "-hwaccel_output_format" not in cmd
 
+    def test_sw_decode_threads_capped_before_input(self) -> None:
+        """sw_decode_threads caps decoder + filter threads on the software
+        decode path, as input options (before -i)."""
+        cfg = _base_config()
+        cfg["sw_decode_threads"] = 4
+        cmd = build_ffmpeg_cmd(
+            input_path="in.mkv", output_path="out.mkv",
+            item=_base_item(), config=cfg, use_hwaccel=False,
+        )
+        i_idx = cmd.index("-i")
+        assert cmd[cmd.index("-threads") + 1] == "4"
+        assert cmd.index("-threads") < i_idx
+        assert cmd[cmd.index("-filter_threads") + 1] == "4"
+
+    def test_sw_decode_threads_unset_or_nvdec_emits_nothing(self) -> None:
+        """Default 0 leaves ffmpeg's threading alone; NVDEC ignores the cap."""
+        cmd = build_ffmpeg_cmd(
+            input_path="in.mkv", output_path="out.mkv",
+            item=_base_item(), config=_base_config(), use_hwaccel=False,
+        )
+        assert "-threads" not in cmd
+        cfg = _base_config()
+        cfg["sw_decode_threads"] = 4
+        cmd = build_ffmpeg_cmd(
+            input_path="in.mkv", output_path="out.mkv",
+            item=_base_item(), config=cfg,
+        )
+        assert "-threads" not in cmd
+        assert "-filter_threads" not in cmd
+
     def test_hwaccel_does_not_break_other_invariants(self) -> None:
         """Adding hwaccel must not regress the audio-map or err_detect rules."""
         cmd = build_ffmpeg_cmd(
@@ -170,3 +170,26 @@ def test_forecast_returns_diagnostics():
     }
     missing = expected_keys - set(fc.keys())
     assert not missing, f"forecast missing keys: {missing}"
+
+
+def test_forecast_excludes_every_terminal_status(monkeypatch):
+    """The settled set is derived from the FileStatus enum, so statuses added
+    after the forecast was written (flagged_undersized) don't leak into the
+    remaining count."""
+    from pipeline.state import TERMINAL_STATUSES
+
+    history = [
+        _entry("2026-05-09T10:00:00+00:00", count=1, encode_secs=600, res_key="1080p"),
+        _entry("2026-05-10T10:00:00+00:00", count=1, encode_secs=600, res_key="1080p"),
+    ]
+    monkeypatch.setattr(admin, "_read_history", lambda *_a, **_k: history)
+    files = {f"{s.value}.mkv": {"status": s.value} for s in TERMINAL_STATUSES}
+    files["pending.mkv"] = {"status": "pending"}
+    report = {"files": [
+        {"filepath": fp, "video": {"resolution_class": "1080p", "hdr": False}} for fp in files
+    ]}
+    monkeypatch.setattr(admin, "_get_pipeline_state", lambda: {"files": files})
+    monkeypatch.setattr("server.helpers.read_report_cached", lambda _p: report)
+
+    fc = admin.get_history_summary()["forecast"]
+    assert fc["remaining_files"] == 1
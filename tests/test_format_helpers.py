@@ -0,0 +1,42 @@
+"""format_duration / format_bytes — the per-file log line helpers.
+
+format_duration used to format ``secs / 60`` with ``:.0f``, which rounds the
+leading unit up: a 90 s step logged as "2m 30s" and a 1.5 h encode as
+"2h 30m".
+"""
+
+from __future__ import annotations
+
+import pytest
+
+from pipeline.ffmpeg import format_bytes, format_duration
+
+
+@pytest.mark.parametrize(
+    "secs,expected",
+    [
+        (0, "0s"),
+        (59.4, "59s"),
+        (59.6, "1m 0s"),
+        (90, "1m 30s"),
+        (3599, "59m 59s"),
+        (3600, "1h 0m"),
+        (5400, "1h 30m"),
+        (7199, "1h 59m"),
+    ],
+)
+def test_format_duration_does_not_round_up_leading_unit(secs, expected):
+    assert format_duration(secs) == expected
+
+
+@pytest.mark.parametrize(
+    "b,expected",
+    [
+        (512 * 1024, "512 KB"),
+        (5 * 1024**2, "5 MB"),
+        (int(2.5 * 1024**3), "2.5 GB"),
+        (3 * 1024**4, "3.00 TB"),
+    ],
+)
+def test_format_bytes_units(b, expected):
+    assert format_bytes(b) == expected
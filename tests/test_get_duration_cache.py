@@ -0,0 +1,66 @@
+"""get_duration caches per (path, mtime, size) and never caches a failure.
+
+Every call used to spawn an ffprobe. The verify step and encode retries
+re-probe files that haven't changed; the cache makes those free while a
+rewritten file (new size / mtime) is always probed afresh.
+"""
+
+from __future__ import annotations
+
+import os
+import subprocess
+from unittest.mock import patch
+
+from pipeline import ffmpeg
+from pipeline.ffmpeg import get_duration
+
+
+def _ok(stdout: str) -> subprocess.CompletedProcess:
+    return subprocess.CompletedProcess(args=[], returncode=0, stdout=stdout, stderr="")
+
+
+def test_unchanged_file_is_probed_once(tmp_path):
+    f = tmp_path / "out.mkv"
+    f.write_bytes(b"x" * 10)
+    with patch.object(ffmpeg.subprocess, "run", return_value=_ok("1234.5\n")) as run:
+        assert get_duration(str(f)) == 1234.5
+        assert get_duration(str(f)) == 1234.5
+    assert run.call_count == 1
+    # Only the duration is requested, as plain CSV.
+    cmd = run.call_args[0][0]
+    assert "format=duration" in cmd and "csv=p=0" in cmd
+
+
+def test_rewritten_file_is_probed_again(tmp_path):
+    f = tmp_path / "out.mkv"
+    f.write_bytes(b"x" * 10)
+    with patch.object(ffmpeg.subprocess, "run", side_effect=[_ok("10.0\n"), _ok("20.0\n")]) as run:
+        assert get_duration(str(f)) == 10.0
+        f.write_bytes(b"x" * 20)
+        st = f.stat()
+        os.utime(f, ns=(st.st_atime_ns, st.st_mtime_ns + 5_000_000_000))
+        assert get_duration(str(f)) == 20.0
+    assert run.call_count == 2
+
+
+def test_failed_probe_is_not_cached(tmp_path):
+    """A transient ffprobe failure must not stick as the file's answer."""
+    f = tmp_path / "out.mkv"
+    f.write_bytes(b"x" * 10)
+    failed = subprocess.CompletedProcess(args=[], returncode=1, stdout="", stderr="")
+    with patch.object(ffmpeg.subprocess, "run", side_effect=[failed, _ok("42.0\n")]):
+        assert get_duration(str(f)) is None
+        assert get_duration(str(f)) == 42.0
+
+
+def test_missing_file_returns_none_without_probing(tmp_path):
+    with patch.object(ffmpeg.subprocess, "run") as run:
+        assert get_duration(str(tmp_path / "gone.mkv")) is None
+    run.assert_not_called()
+
+
+def test_no_duration_in_container_is_zero(tmp_path):
+    f = tmp_path / "odd.ts"
+    f.write_bytes(b"x")
+    with patch.object(ffmpeg.subprocess, "run", return_value=_ok("N/A\n")):
+        assert get_duration(str(f)) == 0.0
@@ -0,0 +1,22 @@
+"""The pipeline's JSON path is stdlib-only (CLAUDE.md Essentials).
+
+Optional fast parsers/serialisers have been proposed more than once; each
+time their output or failure modes differed from the stdlib's (NaN, float
+spelling), and the bytes on disk came to depend on what happened to be
+installed. Pin that no pipeline module, nor the report lock it writes
+through, imports one.
+"""
+
+from __future__ import annotations
+
+import re
+from pathlib import Path
+
+_ROOT = Path(__file__).resolve().parent.parent
+_FAST_JSON = re.compile(r"^\s*(?:import|from)\s+(?:orjson|ujson|msgspec|simdjson|ijson)\b", re.MULTILINE)
+
+
+def test_no_third_party_json_in_pipeline_or_report_lock():
+    sources = [*sorted((_ROOT / "pipeline").rglob("*.py")), _ROOT / "tools" / "report_lock.py"]
+    offenders = [str(p.relative_to(_ROOT)) for p in sources if _FAST_JSON.search(p.read_text(encoding="utf-8"))]
+    assert offenders == []
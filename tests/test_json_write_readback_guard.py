@@ -115,3 +115,21 @@ def test_write_json_safe_rejects_corrupt_writeback(tmp_path, monkeypatch):
     assert json.loads(target.read_text())["baseline"] is True
     # Tmp gone.
     assert not target.with_suffix(".tmp").exists()
+
+
+def test_write_json_safe_fsyncs_tmp_before_replace(tmp_path, monkeypatch):
+    """The bytes are on disk before the rename makes them the live file."""
+    from server import helpers
+
+    target = tmp_path / "priority.json"
+    order: list[str] = []
+    real_fsync = helpers.os.fsync
+    real_replace = Path.replace
+
+    monkeypatch.setattr(helpers.os, "fsync", lambda fd: order.append("fsync") or real_fsync(fd))
+    monkeypatch.setattr(Path, "replace", lambda self, dst: order.append("replace") or real_replace(self, dst))
+
+    helpers.write_json_safe(target, {"paths": ["a"]})
+
+    assert order == ["fsync", "replace"]
+    assert json.loads(target.read_text())["paths"] == ["a"]
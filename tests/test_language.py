@@ -224,6 +224,31 @@ def test_clear_legacy_heuristic_detections_strips_inference_only() -> None:
     assert out["subtitle_streams"][0]["detection_method"] == "text_extraction"
 
 
+def test_detection_never_mutates_the_callers_entry() -> None:
+    """Both entry points copy only the stream dicts they write to; the input
+    entry (often the live media_report entry) must come back untouched."""
+    from pipeline.language import clear_legacy_heuristic_detections
+
+    entry = {
+        "filepath": "/tmp/does-not-exist.mkv",
+        "duration_seconds": 120,
+        "tmdb": {"original_language": "en"},
+        "audio_streams": [
+            {"language": "und", "title": "English 5.1", "codec": "dts"},
+            {"language": "und", "detected_language": "en", "detection_method": "heuristic"},
+        ],
+        "subtitle_streams": [],
+    }
+    before = repr(entry)
+
+    result = detect_all_languages(entry, use_whisper=False)
+    cleared, n = clear_legacy_heuristic_detections(entry)
+
+    assert repr(entry) == before
+    assert result["audio_streams"][0]["detection_method"] == "title_hint"
+    assert n == 1 and "detected_language" not in cleared["audio_streams"][1]
+
+
 def test_detect_all_languages_leaves_tagged_tracks_alone() -> None:
     """Tracks that already have a determined language tag are left untouched."""
     entry = {
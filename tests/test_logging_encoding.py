@@ -16,6 +16,7 @@ import logging
 
 import pytest
 
+import pipeline.__main__ as pipeline_main
 from pipeline.__main__ import setup_logging
 
 
@@ -27,6 +28,7 @@ def _clean_root_logger():
     saved = root.handlers[:]
     root.handlers = []
     yield
+    pipeline_main._stop_log_listener()
     for h in root.handlers:
         try:
             h.close()
@@ -41,6 +43,8 @@ def test_non_ascii_log_message_does_not_raise(tmp_path, capsys):
     logging.info("  Under quality floor → parked: Some Show S01E01.mkv")
     logging.info("  Auto-reset flagged_corrupt → pending")
     logging.info("café — em-dash and accents éèü")
+    # Drain the listener while capsys's stream is still open.
+    pipeline_main._stop_log_listener()
     # Reaching here at all is the assertion: no UnicodeEncodeError escaped.
     assert (tmp_path / "pipeline.log").exists()
 
@@ -50,10 +54,11 @@ def test_message_survives_into_the_log_file(tmp_path):
 
     Emits through the configured FileHandler directly rather than the root
     logger: pytest's logging plugin swaps root handlers around, which would
-    make this a test of pytest rather than of setup_logging.
+    make this a test of pytest rather than of setup_logging. The file
+    handler sits behind the QueueListener, not on the root logger.
     """
     setup_logging(str(tmp_path))
-    file_handlers = [h for h in logging.getLogger().handlers if isinstance(h, logging.FileHandler)]
+    file_handlers = [h for h in pipeline_main._log_listener.handlers if isinstance(h, logging.FileHandler)]
     assert file_handlers, "setup_logging must install a FileHandler"
     rec = logging.LogRecord("t", logging.INFO, __file__, 1, "quality floor → parked: Marker123", None, None)
     for h in file_handlers:
@@ -91,3 +96,32 @@ def test_strict_cp1252_would_have_raised():
     with pytest.raises(UnicodeEncodeError):
         stream.write("floor → parked")
         stream.flush()
+
+
+def test_root_logger_only_enqueues_and_listener_drains_to_file(tmp_path):
+    """Worker threads log through a QueueHandler; the listener thread does
+    the file write. Stopping the listener (as atexit does) drains the queue."""
+    import logging.handlers
+
+    setup_logging(str(tmp_path))
+    root = logging.getLogger()
+    queue_handlers = [h for h in root.handlers if isinstance(h, logging.handlers.QueueHandler)]
+    assert queue_handlers, "root logger must log via a QueueHandler"
+    assert not any(isinstance(h, logging.FileHandler) for h in root.handlers)
+
+    rec = logging.LogRecord("t", logging.INFO, __file__, 1, "drained → Marker456", None, None)
+    queue_handlers[0].handle(rec)
+    pipeline_main._stop_log_listener()
+    text = (tmp_path / "pipeline.log").read_text(encoding="utf-8")
+    assert "Marker456" in text
+    assert "[INFO] drained → Marker456" in text, "formatted exactly once, in the pipeline format"
+
+
+def test_setup_logging_twice_replaces_the_listener(tmp_path):
+    """force=True semantics: a second setup_logging stops the first listener
+    rather than leaving two writer threads on the same file."""
+    setup_logging(str(tmp_path))
+    first = pipeline_main._log_listener
+    setup_logging(str(tmp_path))
+    assert pipeline_main._log_listener is not first
+    assert first._thread is None, "the previous listener must be stopped"
@@ -169,6 +169,16 @@ def test_terminal_status_does_not_protect(staging):
     assert not f.exists()
 
 
+def test_flagged_rows_outside_the_sweep_list_still_protect(staging):
+    """The sweep's skip list is narrower than state.SETTLED_STATUSES on
+    purpose: a FLAGGED_CORRUPT row that still names a staged file keeps it."""
+    f = _write(staging / "fetch" / "flagged.mkv")
+    rows = {f.as_posix(): {"status": "flagged_corrupt", "local_path": str(f)}}
+    cleaned, preserved = _run_cleanup(staging, rows)
+    assert cleaned == 0
+    assert f.exists()
+
+
 def test_age_fallback_when_state_unreadable(staging):
     """If state enumeration raises, fall back to age-based: keep files <24h old.
     Without this fallback, a corrupt state DB would re-create the original wipe.
@@ -13,11 +13,12 @@ per-file profile / gentle / reencode overrides.
 from __future__ import annotations
 
 import logging
+import os
 from unittest.mock import MagicMock, patch
 
 from pipeline.control import PipelineControl
 from pipeline.orchestrator import Orchestrator
-from pipeline.state import PipelineState
+from pipeline.state import FileStatus, PipelineState
 
 
 def _bare_orchestrator(tmp_path) -> Orchestrator:
@@ -159,6 +160,34 @@ class TestGpuWorkerInlineUpload:
         queue = [{"filepath": fp, "filename": "fetching.mkv", "file_size_bytes": 0, "video": {}}]
         assert orch._pick_next(queue) is None
 
+    def test_first_pass_reads_rows_only_for_processing_files(self, tmp_path, monkeypatch):
+        """The fetched-first pass used to get_file every queued path on every
+        pick. Only PROCESSING rows (the fetched files) need the full row read;
+        the prepped one still wins over a queue head that was never fetched."""
+        from pipeline.state import FileStatus
+
+        orch = _bare_orchestrator(tmp_path)
+        fetched = tmp_path / "fetched.mkv"
+        fetched.write_bytes(b"0")
+        orch.state.set_file(str(fetched), FileStatus.PROCESSING, local_path=str(fetched), prep_done=True)
+        queue = [
+            {"filepath": str(tmp_path / f"pending{i}.mkv"), "filename": f"pending{i}.mkv", "video": {}}
+            for i in range(50)
+        ]
+        queue.append({"filepath": str(fetched), "filename": "fetched.mkv", "video": {}})
+
+        real_get_file = orch.state.get_file
+        reads: list[str] = []
+
+        def counting_get_file(fp):
+            reads.append(fp)
+            return real_get_file(fp)
+
+        monkeypatch.setattr(orch.state, "get_file", counting_get_file)
+
+        assert orch._pick_next(queue)["filepath"] == str(fetched)
+        assert reads == [str(fetched)]
+
     def test_dispatched_set_cleared_after_each_iteration(self, tmp_path, monkeypatch):
         """_dispatched must be cleared after full_gamut returns.
 
@@ -302,6 +331,113 @@ class TestSkipListHonoured:
         assert r"\\NAS\Keep.mkv" in paths
         assert r"\\NAS\AlsoKeep.mkv" in paths
 
+    def test_skip_set_is_cached_per_mtime(self, tmp_path, monkeypatch):
+        """The normalised skip set is built once per skip.json mtime, not per call."""
+        import json as _json
+        import os as _os
+
+        import pipeline.control as control_mod
+
+        ctrl = PipelineControl(str(tmp_path))
+        skip_path = tmp_path / "control" / "skip.json"
+        _json.dump({"paths": [r"\\NAS\Skipped.mkv"]}, open(skip_path, "w"))
+        ctrl._last_read.pop(str(skip_path), None)
+
+        calls = {"n": 0}
+        real = control_mod._normalise_skip_paths
+
+        def counting(data):
+            calls["n"] += 1
+            return real(data)
+
+        monkeypatch.setattr(control_mod, "_normalise_skip_paths", counting)
+        for _ in range(50):
+            assert ctrl.should_skip(r"\\NAS\Skipped.mkv")
+            assert not ctrl.should_skip(r"\\NAS\Keep.mkv")
+        assert calls["n"] == 1
+
+        # Editing the file (new mtime) rebuilds the set.
+        _json.dump({"paths": [r"\\NAS\Keep.mkv"]}, open(skip_path, "w"))
+        st = _os.stat(skip_path)
+        _os.utime(skip_path, (st.st_atime, st.st_mtime + 5))
+        assert ctrl.should_skip(r"\\NAS\Keep.mkv")
+        assert not ctrl.should_skip(r"\\NAS\Skipped.mkv")
+        assert calls["n"] == 2
+
+    def test_should_skip_is_case_and_dot_segment_insensitive(self, tmp_path):
+        """Comparison key is normpath().lower() on both sides."""
+        import json as _json
+
+        ctrl = PipelineControl(str(tmp_path))
+        skip_path = tmp_path / "control" / "skip.json"
+        _json.dump({"paths": ["/nas/Movies/Skipped.mkv"]}, open(skip_path, "w"))
+        ctrl._last_read.pop(str(skip_path), None)
+
+        assert ctrl.should_skip("/NAS/movies/skipped.MKV")
+        assert ctrl.should_skip("/nas/Movies/./extra/../Skipped.mkv")
+        assert not ctrl.should_skip("/nas/Movies/Other.mkv")
+        queue = [{"filepath": "/NAS/MOVIES/SKIPPED.MKV"}, {"filepath": "/nas/Movies/Other.mkv"}]
+        assert [e["filepath"] for e in ctrl.apply_queue_overrides(queue)] == ["/nas/Movies/Other.mkv"]
+
+    def test_skip_json_saved_with_bom_is_honoured(self, tmp_path):
+        """Notepad's "UTF-8 with BOM" must not make skip.json unreadable."""
+        import json as _json
+
+        ctrl = PipelineControl(str(tmp_path))
+        skip_path = tmp_path / "control" / "skip.json"
+        skip_path.write_bytes(b"\xef\xbb\xbf" + _json.dumps({"paths": ["/nas/Café/Skipped.mkv"]}).encode("utf-8"))
+        ctrl._last_read.pop(str(skip_path), None)
+
+        assert ctrl.should_skip("/nas/Café/Skipped.mkv")
+
+    def test_skip_checker_reads_skip_json_once_per_loop(self, tmp_path, monkeypatch):
+        """A queue-wide loop stats control/ and skip.json once, not per item."""
+        import json as _json
+
+        import pipeline.control as control_mod
+
+        ctrl = PipelineControl(str(tmp_path))
+        skip_path = tmp_path / "control" / "skip.json"
+        _json.dump({"paths": ["/nas/Movies/Skipped.mkv"]}, open(skip_path, "w"))
+        ctrl._last_read.pop(str(skip_path), None)
+
+        is_skipped = ctrl.skip_checker()
+        monkeypatch.setattr(control_mod.os, "stat", MagicMock(side_effect=AssertionError("stat in loop")))
+        assert is_skipped("/NAS/movies/skipped.MKV")
+        assert not any(is_skipped(f"/nas/Movies/Other{i}.mkv") for i in range(100))
+
+    def test_skip_checker_with_no_skips_passes_everything(self, tmp_path):
+        assert not PipelineControl(str(tmp_path)).skip_checker()("/nas/anything.mkv")
+
+    def test_malformed_skip_json_skips_nothing(self, tmp_path):
+        ctrl = PipelineControl(str(tmp_path))
+        skip_path = tmp_path / "control" / "skip.json"
+        skip_path.write_bytes(b'{"paths": [\xff')
+        ctrl._last_read.pop(str(skip_path), None)
+
+        assert not ctrl.should_skip("/nas/anything.mkv")
+
+
+class TestPersistentControlFiles:
+    """PipelineControl seeds skip/subs_optional/audio_foreign_ok on first start only."""
+
+    def test_seeds_missing_files_with_defaults(self, tmp_path):
+        import json as _json
+
+        PipelineControl(str(tmp_path))
+        for name, default in PipelineControl._PERSISTENT_FILES.items():
+            path = tmp_path / "control" / name
+            assert _json.loads(path.read_text(encoding="utf-8")) == default
+
+    def test_existing_files_are_not_overwritten(self, tmp_path):
+        control_dir = tmp_path / "control"
+        control_dir.mkdir()
+        skip_path = control_dir / "skip.json"
+        skip_path.write_text('{"paths": ["\\\\\\\\NAS\\\\Keep.mkv"]}', encoding="utf-8")
+        before = skip_path.read_bytes()
+        PipelineControl(str(tmp_path))
+        assert skip_path.read_bytes() == before
+
 
 class TestPipelineControlSurfaceArea:
     """After the drop, PipelineControl exposes only skip + pause checks."""
@@ -419,3 +555,296 @@ class TestGpuSemaphoreScope:
         )
         # And full_gamut received the semaphore so it can wrap _run_encode itself.
         assert seen_kwarg[0] is orch._gpu_semaphore
+
+
+class TestFetchWorkerWake:
+    """The fetch worker's idle wait ends as soon as a GPU worker posts a want.
+
+    It used to sleep out a fixed 5-10s interval on the shutdown event, so an
+    encoder that had just picked an unfetched file sat idle for the rest of
+    that interval before the fetch even started.
+    """
+
+    def test_gpu_want_cuts_idle_short(self, tmp_path):
+        import threading
+        import time
+
+        orch = _bare_orchestrator(tmp_path)
+        threading.Timer(0.1, orch._set_gpu_wants, args=(str(tmp_path / "next.mkv"),)).start()
+
+        t0 = time.monotonic()
+        orch._fetch_idle(10)
+        assert time.monotonic() - t0 < 5
+
+    def test_wake_is_consumed(self, tmp_path):
+        """One want wakes one idle — the next idle waits again."""
+        import time
+
+        orch = _bare_orchestrator(tmp_path)
+        orch._set_gpu_wants(str(tmp_path / "a.mkv"))
+        orch._fetch_idle(10)
+
+        t0 = time.monotonic()
+        orch._fetch_idle(0.2)
+        assert time.monotonic() - t0 >= 0.15
+
+    def test_clearing_a_want_does_not_wake(self, tmp_path):
+        orch = _bare_orchestrator(tmp_path)
+        orch._set_gpu_wants(None, previous=str(tmp_path / "a.mkv"))
+        assert not orch._fetch_wake.is_set()
+
+
+class TestStageWakes:
+    """Prep, GPU and upload workers idle on per-stage wake events, not a fixed
+    shutdown.wait, so a hand-off from the stage before starts them at once."""
+
+    def test_upload_worker_starts_as_soon_as_an_encode_hands_off(self, tmp_path, monkeypatch):
+        import threading
+        import time
+
+        orch = _bare_orchestrator(tmp_path)
+        picks: list[float] = []
+
+        def pick():
+            picks.append(time.monotonic())
+            if len(picks) == 2:
+                orch._shutdown.set()
+            return None
+
+        monkeypatch.setattr(orch, "_pick_for_upload", pick)
+        worker = threading.Thread(target=orch._upload_worker, daemon=True)
+        worker.start()
+        threading.Timer(0.1, orch._upload_wake.set).start()
+        worker.join(timeout=3)
+
+        assert not worker.is_alive()
+        assert picks[1] - picks[0] < 3
+
+    def test_failed_encode_wakes_the_fetch_worker(self, tmp_path, monkeypatch):
+        """A failed encode frees a prefetch slot without any upload to follow,
+        so the fetch worker is woken to refill it instead of sitting out its poll."""
+        orch = _bare_orchestrator(tmp_path)
+        orch.config["upload_concurrency"] = 1
+        (tmp_path / "bad.mkv").write_bytes(b"0")
+        queue = [{"filepath": str(tmp_path / "bad.mkv"), "filename": "bad.mkv", "file_size_bytes": 0, "video": {}}]
+
+        def failed_encode(*_a, **_kw):
+            orch._fetch_wake.clear()
+            orch._shutdown.set()
+            return False
+
+        monkeypatch.setattr("pipeline.orchestrator.full_gamut", failed_encode)
+        orch._gpu_worker(queue, [], worker_id=0)
+
+        assert orch._fetch_wake.is_set()
+
+    def test_upload_release_refreshes_the_fetch_buffer_figure(self, tmp_path, monkeypatch):
+        """The upload worker's release wake must not hand the fetch worker the
+        memoised pre-delete buffer figure — it would see a full buffer and sleep."""
+        from pipeline.transfer import invalidate_staging_usage
+
+        orch = _bare_orchestrator(tmp_path)
+        fetched = tmp_path / "fetch" / "Heat.mkv"
+        fetched.parent.mkdir(exist_ok=True)
+        fetched.write_bytes(b"x" * 100)
+        invalidate_staging_usage(orch.staging_dir)
+        assert orch._get_fetch_buffer_used() == 100
+
+        picks = iter([str(fetched), None])
+
+        def pick():
+            fp = next(picks)
+            if fp is None:
+                orch._shutdown.set()
+            return fp
+
+        def upload(filepath, *_a, **_kw):
+            os.remove(filepath)
+
+        monkeypatch.setattr(orch, "_pick_for_upload", pick)
+        monkeypatch.setattr("pipeline.full_gamut.finalize_upload", upload)
+        orch._upload_worker()
+
+        assert orch._fetch_wake.is_set()
+        assert orch._get_fetch_buffer_used() == 0
+
+    def test_idle_skips_the_wait_once_shutting_down(self, tmp_path):
+        import time
+
+        orch = _bare_orchestrator(tmp_path)
+        orch._shutdown.set()
+        t0 = time.monotonic()
+        orch._idle(orch._gpu_wake, 10)
+        assert time.monotonic() - t0 < 1
+
+    def test_signal_wakes_every_stage(self, tmp_path):
+        orch = _bare_orchestrator(tmp_path)
+        orch._handle_signal(2, None)
+        for wake in (orch._fetch_wake, orch._gpu_wake, orch._prep_wake, orch._upload_wake):
+            assert wake.is_set()
+
+
+class TestFetchWorkerGpuWants:
+    def test_gpu_want_resolved_from_queue_without_reading_report(self, tmp_path, monkeypatch):
+        """Priority-1 fetches take the entry from the live queue; _lookup_file
+        parses the whole media report and is only the fallback."""
+        orch = _bare_orchestrator(tmp_path)
+        item = {"filepath": str(tmp_path / "want.mkv"), "filename": "want.mkv", "file_size_bytes": 7}
+        queue = [{"filepath": str(tmp_path / "other.mkv")}, item]
+        fetched: list[dict] = []
+
+        def fake_fetch(entry, *_a, **_kw):
+            fetched.append(entry)
+            orch._shutdown.set()
+            return None
+
+        monkeypatch.setattr("pipeline.orchestrator.fetch_file", fake_fetch)
+        monkeypatch.setattr(orch, "_lookup_file", MagicMock(side_effect=AssertionError("report read")))
+        monkeypatch.setattr(orch, "_get_fetch_buffer_used", lambda: 0)
+        monkeypatch.setattr(orch, "_count_prefetched", lambda: 0)
+        orch._set_gpu_wants(item["filepath"])
+
+        orch._fetch_worker(queue)
+
+        assert fetched[0] is item
+
+
+class TestFetchWorkerPrefetchLap:
+    """The prefetch lap filters the queue on one ``all_statuses()`` snapshot,
+    keeping the rows whose status is in ``transfer.FETCH_CLAIMABLE`` — the
+    same set fetch_file's claim accepts — with no per-item state reads."""
+
+    def _run_lap(self, orch, queue, monkeypatch, stop_after):
+        attempted: list[str] = []
+
+        def fake_fetch(entry, *_a, **_kw):
+            attempted.append(entry["filepath"])
+            if len(attempted) == stop_after:
+                orch._shutdown.set()
+            return None
+
+        snapshots = MagicMock(wraps=orch.state.all_statuses)
+        monkeypatch.setattr(orch.state, "all_statuses", snapshots)
+        monkeypatch.setattr("pipeline.orchestrator.fetch_file", fake_fetch)
+        monkeypatch.setattr(orch, "_get_fetch_buffer_used", lambda: 0)
+        monkeypatch.setattr(orch, "_count_prefetched", lambda: 0)
+        monkeypatch.setattr(orch, "_fetch_idle", lambda _t: orch._shutdown.set())
+        for name in ("get_file", "get_status", "all_filepaths", "get_files_by_status"):
+            monkeypatch.setattr(orch.state, name, MagicMock(side_effect=AssertionError(f"per-item read: {name}")))
+
+        orch._fetch_worker(queue)
+        return attempted, snapshots.call_count
+
+    def test_lap_offers_exactly_the_claimable_rows_from_one_snapshot(self, tmp_path, monkeypatch):
+        from pipeline.transfer import FETCH_CLAIMABLE
+
+        orch = _bare_orchestrator(tmp_path)
+        queue = [{"filepath": str(tmp_path / "new.mkv"), "filename": "new.mkv", "file_size_bytes": 1}]
+        for status in FileStatus:
+            fp = str(tmp_path / f"{status.value}.mkv")
+            orch.state.set_file(fp, status)
+            queue.append({"filepath": fp, "filename": f"{status.value}.mkv", "file_size_bytes": 1})
+        claimable = [
+            item["filepath"] for item in queue if orch.state.all_statuses().get(item["filepath"]) in FETCH_CLAIMABLE
+        ]
+
+        attempted, snapshots = self._run_lap(orch, queue, monkeypatch, stop_after=len(queue) + 1)
+
+        assert attempted == claimable
+        assert claimable == [str(tmp_path / "new.mkv"), str(tmp_path / "pending.mkv")]
+        assert snapshots == 1
+
+    def test_lap_with_nothing_claimable_reads_statuses_once(self, tmp_path, monkeypatch):
+        orch = _bare_orchestrator(tmp_path)
+        queue = [{"filepath": str(tmp_path / f"f{i}.mkv"), "filename": f"f{i}.mkv", "file_size_bytes": 1}
+                 for i in range(5)]
+        for item in queue:
+            orch.state.set_file(item["filepath"], FileStatus.DONE)
+
+        attempted, snapshots = self._run_lap(orch, queue, monkeypatch, stop_after=1)
+
+        assert attempted == []
+        assert snapshots == 1
+
+
+class TestStagedChecker:
+    def test_fetch_dir_paths_answered_from_one_listing(self, tmp_path, monkeypatch):
+        """Every local_path under staging/fetch is resolved from a single
+        scandir, not a stat per row."""
+        from pipeline import orchestrator as orch_mod
+
+        fetch = tmp_path / "fetch"
+        fetch.mkdir()
+        (fetch / "a.mkv").write_bytes(b"0")
+        (fetch / "b.mkv").write_bytes(b"0")
+        scans: list[str] = []
+        real_scandir = os.scandir
+
+        def counting_scandir(path):
+            scans.append(path)
+            return real_scandir(path)
+
+        monkeypatch.setattr(orch_mod.os, "scandir", counting_scandir)
+        monkeypatch.setattr(orch_mod.os.path, "exists", MagicMock(side_effect=AssertionError("per-row stat")))
+        is_staged = orch_mod._staged_checker(str(fetch))
+
+        assert is_staged(str(fetch / "a.mkv"))
+        assert is_staged(str(fetch / "b.mkv"))
+        assert not is_staged(str(fetch / "gone.mkv"))
+        assert not is_staged(None)
+        assert len(scans) == 1
+
+    def test_paths_outside_fetch_dir_fall_back_to_exists(self, tmp_path):
+        from pipeline.orchestrator import _staged_checker
+
+        (tmp_path / "fetch").mkdir()
+        elsewhere = tmp_path / "elsewhere.mkv"
+        elsewhere.write_bytes(b"0")
+        is_staged = _staged_checker(str(tmp_path / "fetch"))
+
+        assert is_staged(str(elsewhere))
+        assert not is_staged(str(tmp_path / "missing.mkv"))
+
+    def test_missing_fetch_dir_means_nothing_staged(self, tmp_path):
+        from pipeline.orchestrator import _staged_checker
+
+        is_staged = _staged_checker(str(tmp_path / "fetch"))
+        assert not is_staged(str(tmp_path / "fetch" / "a.mkv"))
+
+    def test_picker_finds_a_fetched_file_in_staging(self, tmp_path):
+        orch = _bare_orchestrator(tmp_path)
+        fetch = tmp_path / "fetch"
+        fetch.mkdir(exist_ok=True)
+        local = fetch / "ab12_Heat.mkv"
+        local.write_bytes(b"0")
+        fp = str(tmp_path / "Heat.mkv")
+        orch.state.set_file(fp, FileStatus.PROCESSING, local_path=str(local), prep_done=True)
+
+        assert orch._pick_next([{"filepath": fp, "filename": "Heat.mkv", "video": {}}])["filepath"] == fp
+
+
+class TestQueueWideStatusReads:
+    """_all_done and the picker's pending pass read every status in one query."""
+
+    def _queue(self, tmp_path, n):
+        return [{"filepath": str(tmp_path / f"f{i}.mkv"), "filename": f"f{i}.mkv", "video": {}} for i in range(n)]
+
+    def test_pick_walks_settled_head_without_per_row_reads(self, tmp_path, monkeypatch):
+        orch = _bare_orchestrator(tmp_path)
+        queue = self._queue(tmp_path, 30)
+        for item in queue[:29]:
+            orch.state.set_file(item["filepath"], FileStatus.DONE)
+        monkeypatch.setattr(orch.state, "get_status", MagicMock(side_effect=AssertionError("per-row read")))
+
+        assert orch._pick_next(queue)["filepath"] == queue[29]["filepath"]
+
+    def test_all_done_without_per_row_reads(self, tmp_path, monkeypatch):
+        orch = _bare_orchestrator(tmp_path)
+        queue = self._queue(tmp_path, 5)
+        for item in queue:
+            orch.state.set_file(item["filepath"], FileStatus.DONE)
+        monkeypatch.setattr(orch.state, "get_status", MagicMock(side_effect=AssertionError("per-row read")))
+
+        assert orch._all_done(queue)
+        orch.state.set_file(queue[2]["filepath"], FileStatus.PENDING)
+        assert not orch._all_done(queue)
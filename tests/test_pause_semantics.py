@@ -25,6 +25,7 @@ The pause-type table after the change:
 from __future__ import annotations
 
 import json
+import os
 from pathlib import Path
 
 import pytest
@@ -94,3 +95,140 @@ def test_pause_flag_file_at_repo_root(tmp_path):
     c = PipelineControl(str(tmp_path))
     assert c.is_encode_paused() is True
     assert c.is_fetch_paused() is False
+
+
+def test_pause_file_dropped_after_start_is_picked_up(tmp_path, monkeypatch):
+    """control/ lookups go through a directory snapshot keyed on the dir's
+    mtime, so a pause file dropped or removed later is seen on the next
+    check. The root-level PAUSE flag is negatively cached for a short TTL
+    and is seen once that expires."""
+    import pipeline.control as control_mod
+
+    clock = {"t": 1000.0}
+    monkeypatch.setattr(control_mod.time, "monotonic", lambda: clock["t"])
+    c = _make_control(tmp_path)
+    assert c.is_encode_paused() is False
+
+    (tmp_path / "control" / "pause_all.json").write_text("{}")
+    clock["t"] += PipelineControl._PAUSE_MEMO_SECS
+    assert c.is_encode_paused() is True
+
+    (tmp_path / "control" / "pause_all.json").unlink()
+    clock["t"] += PipelineControl._PAUSE_MEMO_SECS
+    assert c.is_encode_paused() is False
+
+    (tmp_path / "PAUSE").write_text("")
+    clock["t"] += PipelineControl._ABSENT_TTL_SECS + 0.1
+    assert c.is_encode_paused() is True
+
+
+def _same_tick(path: Path, mtime_ns: int) -> None:
+    """Pin the directory mtime, as a coarse-mtime filesystem would when a
+    second entry is created in the same tick."""
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_second_file_in_the_same_mtime_tick_is_seen(tmp_path, monkeypatch):
+    """On FAT/SMB a second control file created in the listing's mtime tick
+    leaves control/'s mtime unchanged; the snapshot must not hide it."""
+    import pipeline.control as control_mod
+
+    clock = {"t": 1000.0}
+    monkeypatch.setattr(control_mod.time, "monotonic", lambda: clock["t"])
+    c = _make_control(tmp_path)
+    control_dir = tmp_path / "control"
+    tick = control_dir.stat().st_mtime_ns
+
+    (control_dir / "skip.json").write_text("{}")
+    _same_tick(control_dir, tick)
+    assert "skip.json" in c._control_names()
+
+    (control_dir / "pause_all.json").write_text("{}")
+    _same_tick(control_dir, tick)
+    clock["t"] += 0.5
+    assert "pause_all.json" in c._control_names()
+
+
+def test_snapshot_trusted_once_its_mtime_tick_has_closed(tmp_path, monkeypatch):
+    """After a listing taken a full tick past the mtime's first sighting, an
+    unchanged mtime is answered from the snapshot without re-listing."""
+    import pipeline.control as control_mod
+
+    clock = {"t": 1000.0}
+    monkeypatch.setattr(control_mod.time, "monotonic", lambda: clock["t"])
+    c = _make_control(tmp_path)
+    c._control_names()
+    clock["t"] += PipelineControl._DIR_MTIME_TICK_SECS
+    c._control_names()
+
+    scans = {"n": 0}
+    real_scandir = os.scandir
+
+    def counting_scandir(path):
+        scans["n"] += 1
+        return real_scandir(path)
+
+    monkeypatch.setattr(control_mod.os, "scandir", counting_scandir)
+    for _ in range(10):
+        c._control_names()
+    assert scans["n"] == 0
+
+    (tmp_path / "control" / "pause_all.json").write_text("{}")
+    assert "pause_all.json" in c._control_names()
+    assert scans["n"] == 1
+
+
+def test_pause_type_is_memoised_briefly_across_callers(tmp_path, monkeypatch):
+    """Back-to-back fetch/encode checks share one pause lookup; the memo
+    expires after _PAUSE_MEMO_SECS."""
+    import pipeline.control as control_mod
+
+    clock = {"t": 1000.0}
+    monkeypatch.setattr(control_mod.time, "monotonic", lambda: clock["t"])
+    c = _make_control(tmp_path)
+    calls = {"n": 0}
+    real = PipelineControl._read_pause_type
+
+    def counting(self):
+        calls["n"] += 1
+        return real(self)
+
+    monkeypatch.setattr(PipelineControl, "_read_pause_type", counting)
+    c.is_fetch_paused()
+    c.is_encode_paused()
+    c.is_encode_paused()
+    assert calls["n"] == 1
+
+    (tmp_path / "control" / "pause.json").write_text(json.dumps({"type": "encode_only"}))
+    clock["t"] += PipelineControl._PAUSE_MEMO_SECS
+    assert c.is_encode_paused() is True
+    assert calls["n"] == 2
+
+
+def test_wait_for_encode_resume_returns_immediately_when_not_paused(tmp_path):
+    import threading
+
+    c = _make_control(tmp_path)
+    assert c.wait_for_encode_resume(threading.Event()) is False
+
+
+def test_wait_for_encode_resume_releases_on_resume_and_on_shutdown(tmp_path, monkeypatch):
+    """The GPU worker is held while paused, released once the pause file
+    goes away, and released immediately when shutdown is signalled."""
+    import threading
+
+    monkeypatch.setattr(PipelineControl, "_RESUME_POLL_SECS", 0.01)
+    monkeypatch.setattr(PipelineControl, "_ABSENT_TTL_SECS", 0.0)
+    monkeypatch.setattr(PipelineControl, "_PAUSE_MEMO_SECS", 0.0)
+    c = _make_control(tmp_path, {"type": "all"})
+    pause_file = tmp_path / "control" / "pause.json"
+
+    shutdown = threading.Event()
+    threading.Timer(0.1, pause_file.unlink).start()
+    assert c.wait_for_encode_resume(shutdown) is True
+    assert c.is_encode_paused() is False
+
+    pause_file.write_text(json.dumps({"type": "encode_only"}))
+    threading.Timer(0.1, shutdown.set).start()
+    assert c.wait_for_encode_resume(shutdown) is True
+    assert c.is_encode_paused() is True
@@ -0,0 +1,39 @@
+"""_get_pipeline_state memoises one SQLite read until the DB or WAL changes.
+
+Every WebSocket client re-read (and re-decoded) the whole state on each DB
+write and again on a ~6s heartbeat, plus once per forecast / diagnostics
+request. The cache is keyed on the DB and WAL file stats, so a committed write
+is always seen by the next read.
+"""
+
+from __future__ import annotations
+
+import pytest
+
+import server.helpers as helpers
+from pipeline.state import FileStatus, PipelineState
+
+
+@pytest.fixture()
+def state_db(tmp_path, monkeypatch):
+    db = tmp_path / "pipeline_state.db"
+    monkeypatch.setattr(helpers, "PIPELINE_STATE_DB", db)
+    monkeypatch.setattr(helpers, "_state_cache", None)
+    state = PipelineState(str(db))
+    state.set_file(r"\\NAS\a.mkv", FileStatus.PENDING)
+    yield state
+    state.close()
+
+
+def test_unchanged_db_is_read_once(state_db, monkeypatch):
+    first = helpers._get_pipeline_state()
+    monkeypatch.setattr(PipelineState, "data", property(lambda self: pytest.fail("state re-read")))
+    assert helpers._get_pipeline_state() is first
+
+
+def test_write_is_seen_by_the_next_read(state_db):
+    assert set(helpers._get_pipeline_state()["files"]) == {r"\\NAS\a.mkv"}
+    state_db.set_file(r"\\NAS\b.mkv", FileStatus.DONE)
+    data = helpers._get_pipeline_state()
+    assert set(data["files"]) == {r"\\NAS\a.mkv", r"\\NAS\b.mkv"}
+    assert data["files"][r"\\NAS\b.mkv"]["status"] == "done"
@@ -192,6 +192,13 @@ def test_replace_uses_os_replace_for_overwriting_target():
     block_start = src.rfind("# === Replace original (crash-safe) ===")
     assert block_start != -1, "replace block header not found"
     block = src[block_start : block_start + 2048]
+    # The move itself lives in _move_encode_into_place, called from here.
+    assert "_move_encode_into_place(" in block, "replace block no longer moves the encode into place"
+    import inspect
+
+    from pipeline.full_gamut import _move_encode_into_place
+
+    block = inspect.getsource(_move_encode_into_place)
     # Line we care about: os.replace(dest_path, final_path)
     assert "os.replace(dest_path, final_path)" in block, (
         "atomic replace step must use os.replace (overwrites on Windows), "
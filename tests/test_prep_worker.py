@@ -129,6 +129,64 @@ class TestPrepareForEncodeContract:
         assert row["prep_data"]["actual_input"] == local_path
         assert row["stage"] == "prepped"
 
+    def test_remux_intermediate_dropped_once_strip_supersedes_it(self, tmp_path, monkeypatch):
+        """remux -> strip leaves the remux output unused; it must not sit in
+        staging until the encode finishes. The fetched source stays."""
+        from pipeline.full_gamut import prepare_for_encode
+
+        orch = _orch(tmp_path)
+        nas_path, local_path = _file_in_disk_state(tmp_path, "Old.avi")
+        remux_path = local_path + ".remux.mkv"
+        stripped_path = remux_path + ".stripped.mkv"
+
+        def _fake_remux(path):
+            with open(remux_path, "wb") as f:
+                f.write(b"remux")
+            return remux_path
+
+        def _fake_strip(path, item, config):
+            assert path == remux_path
+            with open(stripped_path, "wb") as f:
+                f.write(b"stripped")
+            return (True, stripped_path)
+
+        monkeypatch.setattr("pipeline.prep_streams.strip_streams_locally", _fake_strip)
+        item = {
+            "filepath": nas_path,
+            "filename": "Old.avi",
+            "library_type": "movie",
+            "audio_streams": [{"codec_raw": "eac3", "language": "eng"}],
+            "subtitle_streams": [],
+            "tmdb": {"original_language": "en", "title": "Old"},
+        }
+        orch.state.set_file(nas_path, FileStatus.PROCESSING, local_path=local_path)
+
+        with patch("pipeline.full_gamut.detect_all_languages", side_effect=lambda i, **k: i), \
+             patch("pipeline.filename.clean_filename", return_value=None), \
+             patch("pipeline.full_gamut._find_external_subs", return_value=[]), \
+             patch("pipeline.full_gamut._remux_to_mkv", side_effect=_fake_remux), \
+             patch("pipeline.full_gamut._probe_full", return_value={"error": "skip"}):
+            from pipeline.qualify import QualifyOutcome, QualifyResult
+
+            with patch("pipeline.qualify.qualify_file") as qfile:
+                qfile.return_value = QualifyResult(
+                    outcome=QualifyOutcome.QUALIFIED,
+                    rationale="ready",
+                    audio_keep_indices=[0],
+                    sub_keep_indices=[],
+                    detected_audio_languages={},
+                    original_language="en",
+                    enriched_entry=item,
+                )
+                prep_data = prepare_for_encode(nas_path, item, {}, orch.state, str(tmp_path))
+
+        import os
+
+        assert prep_data["actual_input"] == stripped_path
+        assert os.path.exists(stripped_path)
+        assert os.path.exists(local_path), "the fetched source is not ours to drop"
+        assert not os.path.exists(remux_path), "superseded remux output must be removed at prep time"
+
     def test_idempotent_on_prep_done(self, tmp_path):
         """Re-running prep on a prep_done=True file returns cached data without redoing work."""
         from pipeline.full_gamut import prepare_for_encode
@@ -155,6 +213,28 @@ class TestPrepareForEncodeContract:
         result = prepare_for_encode(nas_path, item, {}, orch.state, str(tmp_path))
         assert result == cached_prep
 
+    def test_wait_for_fetch_returns_promptly_on_shutdown(self, tmp_path):
+        """A prep worker parked in the wait-for-fetch loop leaves as soon as
+        the orchestrator's shutdown event is set, not after its 30-min cap."""
+        import threading
+        import time as _time
+
+        from pipeline.full_gamut import prepare_for_encode
+
+        orch = _orch(tmp_path)
+        nas_path = str(tmp_path / "nas" / "Waiting.mkv")
+        orch.state.set_file(nas_path, FileStatus.FETCHING)
+        shutdown = threading.Event()
+        threading.Timer(0.2, shutdown.set).start()
+
+        t0 = _time.monotonic()
+        item = {"filepath": nas_path, "filename": "Waiting.mkv"}
+        result = prepare_for_encode(nas_path, item, {}, orch.state, str(tmp_path), shutdown=shutdown)
+
+        assert result is None
+        assert _time.monotonic() - t0 < 1.5
+        assert orch.state.get_status(nas_path) == FileStatus.FETCHING.value
+
     def test_concurrent_callers_serialise_via_per_filepath_lock(self, tmp_path):
         """Pin the 2026-05-14 06:21 Resident Alien S01E07 prep race.
 
@@ -540,8 +620,7 @@ class TestEncodeOnlyStaleExistingSnapshot:
              patch("pipeline.full_gamut._run_encode", side_effect=fake_run_encode), \
              patch("pipeline.full_gamut.build_ffmpeg_cmd",
                    return_value=["ffmpeg", "-i", "stub"]), \
-             patch("pipeline.full_gamut.resolve_encode_params", return_value=fake_params), \
-             patch("pipeline.full_gamut.get_res_key", return_value="1080p"):
+             patch("pipeline.full_gamut.resolve_encode_params", return_value=fake_params):
             _encode_only(nas_path, item, {}, orch.state, str(tmp_path), gpu_semaphore=None)
 
         assert observed_audio, "_run_encode was never called"
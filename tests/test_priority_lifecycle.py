@@ -93,6 +93,23 @@ def test_prune_done_removes_done_and_flagged_keeps_rest(tmp_path, monkeypatch):
     assert r"\\NAS\not_in_state.mkv" in data["paths"]
 
 
+def test_prune_done_removes_flagged_undersized(tmp_path):
+    """Every terminal status prunes — including ones added after the prune
+    was written (flagged_undersized wasn't in its old hand-written list)."""
+    import pipeline.__main__ as main_mod
+
+    control = tmp_path / "control"
+    control.mkdir()
+    prio_path = control / "priority.json"
+    prio_path.write_text(json.dumps({"paths": [r"\\NAS\small.mkv"]}), encoding="utf-8")
+
+    class FakeState:
+        def get_file(self, fp):
+            return {"status": "flagged_undersized"}
+
+    assert main_mod._prune_done_from_priority(staging_dir=str(tmp_path), state=FakeState()) == 1
+
+
 def test_prune_done_is_idempotent(tmp_path):
     """Running prune twice in a row with no state change → second call
     finds nothing to remove. Confirms the rewrite is stable."""
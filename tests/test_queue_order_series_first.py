@@ -70,3 +70,13 @@ def test_legacy_flat_orders_still_work():
     _sort_full_gamut(q, {"encode_queue_order": "smallest_first"}, set())
     assert q[0]["filepath"] == "ep_small.mkv"
     assert q[-1]["filepath"] == "mov_big.mkv"
+
+
+def test_returns_priority_bucket_size():
+    """The caller logs the bump count from the return value instead of
+    re-scanning the queue; paths not in the queue don't count."""
+    q = _queue()
+    n = _sort_full_gamut(q, {"encode_queue_order": "series_first"}, {"mov_big.mkv", "ep_mid.mkv", "gone.mkv"})
+    assert n == 2
+    assert [i["filepath"] for i in q[:2]] == ["ep_mid.mkv", "mov_big.mkv"]
+    assert _sort_full_gamut(_queue(), {"encode_queue_order": "series_first"}, set()) == 0
@@ -199,3 +199,37 @@ def test_replace_gives_up_and_raises_after_exhausting_retries(tmp_report_paths,
 
     with pytest.raises(PermissionError):
         write_report({"files": [{"filepath": "/x.mkv"}]})
+
+
+def test_report_with_nan_loads(tmp_report_paths):
+    """json.dump writes NaN by default; reading it back must not count as corrupt."""
+    primary, _ = tmp_report_paths
+    from tools.report_lock import read_report
+
+    primary.write_text('{"files": [{"filepath": "/x.mkv", "bitrate_kbps": NaN}]}', encoding="utf-8")
+
+    assert read_report()["files"][0]["filepath"] == "/x.mkv"
+
+
+def test_report_write_is_stdlib_json(tmp_path):
+    """The written bytes are exactly ``json.dump(indent=2, ensure_ascii=False)``:
+    exponent floats keep their stdlib spelling and NaN stays NaN rather than
+    being rewritten as null."""
+    import tools.report_lock as _rl
+
+    target = tmp_path / "media_report.json"
+    report = {"files": [{"filepath": "/Amélie.mkv", "size": 1e16, "ratio": 1e-05, "bitrate_kbps": float("nan")}]}
+
+    _rl._atomic_write_with_backup(target, report)
+
+    assert target.read_bytes() == json.dumps(report, indent=2, ensure_ascii=False).encode("utf-8")
+    assert b"1e+16" in target.read_bytes() and b"NaN" in target.read_bytes()
+
+
+def test_bom_prefixed_report_is_readable(tmp_report_paths):
+    primary, _ = tmp_report_paths
+    from tools.report_lock import read_report
+
+    primary.write_bytes(b"\xef\xbb\xbf" + json.dumps({"files": [{"filepath": "/b.mkv"}]}).encode())
+
+    assert read_report()["files"] == [{"filepath": "/b.mkv"}]
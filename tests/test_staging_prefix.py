@@ -0,0 +1,46 @@
+"""staging_prefix names fetch/ and encoded/ files — it must be stable.
+
+The prefix used to be ``md5(path).hexdigest()[:12]``; it is now a 6-byte
+BLAKE2b digest. What matters to the pipeline is unchanged: the same source
+path always yields the same 12-hex-char tag (across processes, so not
+``hash()``), and different paths don't collide in practice.
+"""
+
+from __future__ import annotations
+
+import subprocess
+import sys
+from pathlib import Path
+
+from pipeline.transfer import staging_prefix
+
+_PATH = r"\\KieranNAS\Media\Series\Puffin Rock\Season 1\Puffin Rock - S01E01.mkv"
+
+
+def test_prefix_is_12_lowercase_hex_chars():
+    tag = staging_prefix(_PATH)
+    assert len(tag) == 12
+    assert all(c in "0123456789abcdef" for c in tag)
+
+
+def test_prefix_distinguishes_paths_sharing_a_filename():
+    """Two shows with an identically-named episode must not share a staging name."""
+    other = _PATH.replace("Puffin Rock\\Season 1", "Other Show\\Season 1")
+    assert staging_prefix(_PATH) != staging_prefix(other)
+
+
+def test_prefix_is_stable_across_processes():
+    """A restart must compute the same names the previous session staged under."""
+    code = f"from pipeline.transfer import staging_prefix; print(staging_prefix({_PATH!r}))"
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True,
+                         cwd=Path(__file__).resolve().parent.parent)
+    assert out.stdout.strip() == staging_prefix(_PATH)
+
+
+def test_prefix_is_memoised_per_path():
+    """fetch_file derives the name on every attempt; repeats must not rehash."""
+    staging_prefix.cache_clear()
+    for _ in range(5):
+        staging_prefix(_PATH)
+    info = staging_prefix.cache_info()
+    assert (info.misses, info.hits) == (1, 4)
@@ -0,0 +1,132 @@
+"""fetch_file's staging-space check reuses one recent walk of staging.
+
+The fetch worker tries fetch_file against each pending queue item in turn,
+and every attempt used to walk the whole staging tree (plus a listdir of
+fetch/). With staging full that was a walk per queued item per tick, all
+returning the same number. One walk now yields both totals and is memoised
+briefly; fetch_file adds each copy it makes to the memo rather than
+re-walking, and the orchestrator's fetch-buffer check reads the same memo.
+"""
+
+from __future__ import annotations
+
+from unittest.mock import patch
+
+from pipeline import transfer
+from pipeline.transfer import invalidate_staging_usage, staging_usage_snapshot
+
+
+def _tree(tmp_path):
+    (tmp_path / "fetch").mkdir()
+    (tmp_path / "encoded").mkdir()
+    (tmp_path / "fetch" / "a.mkv").write_bytes(b"x" * 100)
+    (tmp_path / "encoded" / "b.mkv").write_bytes(b"x" * 30)
+    invalidate_staging_usage(str(tmp_path))
+    return str(tmp_path)
+
+
+def test_one_walk_gives_staging_and_fetch_totals(tmp_path):
+    staging = _tree(tmp_path)
+    assert staging_usage_snapshot(staging) == (130, 100)
+
+
+def test_repeat_calls_within_ttl_do_not_rewalk(tmp_path):
+    staging = _tree(tmp_path)
+    with patch.object(transfer, "_scan_usage", side_effect=transfer._scan_usage) as walk:
+        for _ in range(50):
+            staging_usage_snapshot(staging)
+    assert walk.call_count == 1
+
+
+def test_expired_entry_is_rewalked(tmp_path, monkeypatch):
+    staging = _tree(tmp_path)
+    staging_usage_snapshot(staging)
+    (tmp_path / "fetch" / "c.mkv").write_bytes(b"x" * 5)
+    monkeypatch.setattr(transfer, "_USAGE_TTL_SECS", 0.0)
+    assert staging_usage_snapshot(staging) == (135, 105)
+
+
+def test_invalidate_makes_new_files_visible(tmp_path):
+    staging = _tree(tmp_path)
+    staging_usage_snapshot(staging)
+    (tmp_path / "fetch" / "c.mkv").write_bytes(b"x" * 5)
+    assert staging_usage_snapshot(staging) == (130, 100)  # memoised
+    invalidate_staging_usage(staging)
+    assert staging_usage_snapshot(staging) == (135, 105)
+
+
+def test_staging_full_warning_is_rate_limited(tmp_path, monkeypatch, caplog):
+    """A pass over a long queue with staging full warns once, not per item."""
+    import logging
+
+    from pipeline.transfer import fetch_file
+
+    staging = _tree(tmp_path)
+    monkeypatch.setattr(transfer, "_space_warned_at", {})
+    config = {"max_staging_bytes": 50, "min_free_space_bytes": 0, "max_fetch_buffer_bytes": 10**12}
+    items = [{"filepath": f"/nas/{i}.mkv", "filename": f"{i}.mkv", "file_size_bytes": 1} for i in range(20)]
+
+    with caplog.at_level(logging.WARNING):
+        for item in items:
+            assert fetch_file(item, staging, config, state=None) is None
+
+    assert sum("Staging full" in r.getMessage() for r in caplog.records) == 1
+
+
+def test_successful_fetch_is_counted_without_rewalking(tmp_path):
+    from pipeline.state import PipelineState
+    from pipeline.transfer import fetch_file
+
+    staging_root = tmp_path / "staging"
+    staging_root.mkdir()
+    staging = _tree(staging_root)
+    src = tmp_path / "nas" / "Heat.mkv"
+    src.parent.mkdir()
+    src.write_bytes(b"x" * 40)
+    state = PipelineState(str(tmp_path / "state.db"))
+    config = {"max_staging_bytes": 10**12, "min_free_space_bytes": 0, "max_fetch_buffer_bytes": 10**12}
+    item = {"filepath": str(src), "filename": "Heat.mkv", "file_size_bytes": 40}
+
+    assert staging_usage_snapshot(staging) == (130, 100)
+    with patch.object(transfer, "_scan_usage", side_effect=transfer._scan_usage) as walk:
+        assert fetch_file(item, staging, config, state) is not None
+        assert staging_usage_snapshot(staging) == (170, 140)
+    assert walk.call_count == 0
+    state.close()
+
+
+def test_orchestrator_fetch_buffer_reads_the_shared_snapshot(tmp_path):
+    from pipeline.orchestrator import Orchestrator
+
+    staging = _tree(tmp_path)
+    orch = Orchestrator.__new__(Orchestrator)
+    orch.staging_dir = staging
+    with patch.object(transfer, "_scan_usage", side_effect=transfer._scan_usage) as walk:
+        assert orch._get_fetch_buffer_used() == 100
+        assert orch._get_fetch_buffer_used() == 100
+    assert walk.call_count == 1
+
+
+def test_nested_dirs_count_toward_staging_but_not_fetch(tmp_path):
+    staging = _tree(tmp_path)
+    (tmp_path / "fetch" / "sub").mkdir()
+    (tmp_path / "fetch" / "sub" / "d.mkv").write_bytes(b"x" * 7)
+    (tmp_path / "gap_stage").mkdir()
+    (tmp_path / "gap_stage" / "e.mkv").write_bytes(b"x" * 3)
+    assert staging_usage_snapshot(staging) == (140, 100)
+
+
+def test_rejected_attempt_does_not_touch_fetch_dir(tmp_path, monkeypatch):
+    """A fetch turned away by the space checks makes no makedirs call."""
+    from unittest.mock import MagicMock
+
+    from pipeline.transfer import fetch_file
+
+    staging = _tree(tmp_path)
+    makedirs = MagicMock()
+    monkeypatch.setattr(transfer.os, "makedirs", makedirs)
+    config = {"max_staging_bytes": 50, "min_free_space_bytes": 0, "max_fetch_buffer_bytes": 10**12}
+    item = {"filepath": "/nas/x.mkv", "filename": "x.mkv", "file_size_bytes": 1}
+
+    assert fetch_file(item, staging, config, state=None) is None
+    makedirs.assert_not_called()
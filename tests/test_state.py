@@ -5,6 +5,7 @@ import pytest
 from pipeline.state import (
     ACTIVE_STATUSES,
     FLAGGED_STATUSES,
+    SETTLED_STATUSES,
     TERMINAL_STATUSES,
     FileStatus,
     PipelineState,
@@ -172,6 +173,102 @@ class TestCountActiveWithLocal:
         state.close()
 
 
+class TestGetStatus:
+    """Status-only lookup used by the orchestrator's per-queue-item loops."""
+
+    def test_matches_get_file_status(self, tmp_state_db):
+        state = PipelineState(tmp_state_db)
+        fp = r"\\KieranNAS\Media\Movies\Heat.mkv"
+        state.set_file(fp, FileStatus.PROCESSING, local_path=r"F:\stage\Heat.mkv")
+        assert state.get_status(fp) == state.get_file(fp)["status"] == "processing"
+        state.close()
+
+    def test_untracked_is_none(self, tmp_state_db):
+        state = PipelineState(tmp_state_db)
+        assert state.get_status("nonexistent") is None
+        state.close()
+
+    def test_corrupt_extras_does_not_matter(self, tmp_state_db):
+        """Only the status column is read, so a poisoned extras blob is never decoded."""
+        state = PipelineState(tmp_state_db)
+        fp = r"\\KieranNAS\Media\Movies\Poisoned.mkv"
+        state.set_file(fp, FileStatus.PENDING)
+        state._conn.execute("UPDATE pipeline_files SET extras = ? WHERE filepath = ?", ('{"x":', fp))
+        assert state.get_status(fp) == "pending"
+        state.close()
+
+
+    def test_all_statuses_maps_every_row(self, tmp_state_db):
+        state = PipelineState(tmp_state_db)
+        state.set_file("a.mkv", FileStatus.DONE)
+        state.set_file("b.mkv", FileStatus.UPLOADING, output_path="b.av1.mkv")
+        assert state.all_statuses() == {"a.mkv": "done", "b.mkv": "uploading"}
+        state.close()
+
+    def test_get_files_excluding_filters_in_sql(self, tmp_state_db):
+        from unittest.mock import patch
+
+        state = PipelineState(tmp_state_db)
+        state.set_file("a.mkv", FileStatus.DONE)
+        state.set_file("b.mkv", FileStatus.UPLOADING, output_path="b.av1.mkv")
+        state.set_file("c.mkv", FileStatus.ERROR, error="boom")
+        # A poisoned extras blob on an excluded row is never decoded.
+        state._conn.execute("UPDATE pipeline_files SET extras = '{bad' WHERE filepath = 'a.mkv'")
+
+        with patch.object(state, "_row_to_dict", wraps=state._row_to_dict) as to_dict:
+            rows = state.get_files_excluding(["done", "error"])
+
+        assert list(rows) == ["b.mkv"]
+        assert rows["b.mkv"]["output_path"] == "b.av1.mkv"
+        assert to_dict.call_count == 1
+        assert set(state.get_files_excluding([])) == {"a.mkv", "b.mkv", "c.mkv"}
+        state.close()
+
+
+class TestTryTransition:
+    """Compare-and-set used by fetch_file's claim."""
+
+    def test_sets_from_an_allowed_status(self, tmp_state_db):
+        state = PipelineState(tmp_state_db)
+        state.set_file("a.mkv", FileStatus.PENDING)
+        assert state.try_transition("a.mkv", frozenset({None, "pending"}), FileStatus.FETCHING, local_path="x")
+        assert state.get_file("a.mkv")["status"] == "fetching"
+        assert state.get_file("a.mkv")["local_path"] == "x"
+        state.close()
+
+    def test_untracked_row_matches_none(self, tmp_state_db):
+        state = PipelineState(tmp_state_db)
+        assert state.try_transition("new.mkv", frozenset({None}), FileStatus.FETCHING)
+        assert state.get_status("new.mkv") == "fetching"
+        state.close()
+
+    def test_refuses_and_leaves_row_untouched(self, tmp_state_db):
+        state = PipelineState(tmp_state_db)
+        state.set_file("a.mkv", FileStatus.DONE)
+        assert not state.try_transition("a.mkv", frozenset({None, "pending"}), FileStatus.FETCHING)
+        assert state.get_status("a.mkv") == "done"
+        state.close()
+
+    def test_only_one_concurrent_claim_wins(self, tmp_state_db):
+        import threading
+
+        state = PipelineState(tmp_state_db)
+        state.set_file("a.mkv", FileStatus.PENDING)
+        start = threading.Barrier(8)
+        wins: list[bool] = []
+
+        def claim():
+            start.wait()
+            wins.append(state.try_transition("a.mkv", frozenset({None, "pending"}), FileStatus.FETCHING))
+
+        threads = [threading.Thread(target=claim) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert wins.count(True) == 1
+        state.close()
+
 class TestStatusTransitions:
     """Verify the pipeline state machine transitions work correctly."""
 
@@ -242,6 +339,60 @@ class TestStats:
         state.close()
         state2.close()
 
+    def test_add_stats_from_threads_loses_no_updates(self, tmp_state_db):
+        """Concurrent increments (upload completions vs GPU error bumps) must all land."""
+        import threading
+
+        state = PipelineState(tmp_state_db)
+
+        def bump():
+            for _ in range(50):
+                state.add_stats(completed=1, bytes_saved=10, gap_filled=1)
+
+        threads = [threading.Thread(target=bump) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        state2 = PipelineState(tmp_state_db)
+        assert state2.stats["completed"] == 200
+        assert state2.stats["bytes_saved"] == 2000
+        assert state2.stats["gap_filled"] == 200  # key absent from the defaults
+        state.close()
+        state2.close()
+
+    def test_read_only_close_does_not_clobber_newer_stats(self, tmp_state_db):
+        """A reader that only looked at stats (the dashboard's open/.data/close
+        pattern) must not write its stale snapshot back on close()."""
+        reader = PipelineState(tmp_state_db)
+        assert reader.stats["completed"] == 0
+
+        writer = PipelineState(tmp_state_db)
+        writer.stats["completed"] = 7
+        writer.save()
+
+        reader.close()
+
+        check = PipelineState(tmp_state_db)
+        assert check.stats["completed"] == 7
+        writer.close()
+        check.close()
+
+    def test_save_after_no_op_still_writes_later_mutations(self, tmp_state_db):
+        """Skipping an unchanged save must not stop the next real change landing."""
+        state = PipelineState(tmp_state_db)
+        state.stats["completed"] = 3
+        state.save()
+        state.save()  # unchanged — skipped
+        state.stats["completed"] = 4
+        state.save()
+
+        state2 = PipelineState(tmp_state_db)
+        assert state2.stats["completed"] == 4
+        state.close()
+        state2.close()
+
 
 class TestCompact:
     """compact() removes replaced/skipped entries."""
@@ -341,6 +492,12 @@ class TestStatusGroupings:
         ):
             assert s in ACTIVE_STATUSES
 
+    def test_settled_is_terminal_plus_error(self):
+        """SETTLED = nothing more to do this queue build; ERROR retries next build."""
+        assert SETTLED_STATUSES == TERMINAL_STATUSES | {FileStatus.ERROR}
+        assert "error" in SETTLED_STATUSES and "done" in SETTLED_STATUSES
+        assert "pending" not in SETTLED_STATUSES and None not in SETTLED_STATUSES
+
     def test_flagged_subset_of_terminal(self):
         """All FLAGGED_* are terminal but not vice versa (DONE is also terminal)."""
         assert FLAGGED_STATUSES.issubset(TERMINAL_STATUSES)
@@ -562,3 +719,15 @@ class TestResetClearsStalePrepArtefacts:
         assert post.get("prep_done") is True
         assert post.get("prep_data") is not None
         state.close()
+
+
+class TestIsTerminal:
+    """is_terminal takes raw DB strings as well as members."""
+
+    @pytest.mark.parametrize("status", ["done", "flagged_corrupt", "flagged_undersized", FileStatus.FLAGGED_MANUAL])
+    def test_terminal(self, status):
+        assert is_terminal(status) is True
+
+    @pytest.mark.parametrize("status", ["pending", "error", "processing", "", "not-a-status", FileStatus.PENDING])
+    def test_not_terminal(self, status):
+        assert is_terminal(status) is False
@@ -255,3 +255,31 @@ def test_to_path_no_drops_just_copies(tmp_path):
     assert ok is True
     assert dst.exists()
     assert dst.read_bytes() == src.read_bytes()
+
+
+def test_to_path_discards_ffmpeg_stdout(monkeypatch, tmp_path):
+    """Only stderr is read (for the failure log). stdout goes to DEVNULL so
+    communicate() has a single pipe to drain rather than a reader per pipe."""
+    src = tmp_path / "src.mkv"
+    src.write_bytes(b"x" * (1024 * 1024))
+    dst = tmp_path / "src.mkv.stripped.mkv"
+
+    _stub_probe(monkeypatch, src_audio=1, src_sub=5, out_audio=1, out_sub=0)
+
+    captured = {}
+
+    class _FakeResult:
+        returncode = 0
+        stdout = None
+        stderr = b""
+
+    def _fake_run(cmd, **kw):
+        captured.update(kw)
+        dst.write_bytes(b"y" * (900 * 1024))
+        return _FakeResult()
+
+    monkeypatch.setattr(subprocess, "run", _fake_run)
+
+    assert cf._mkvmerge_drop_streams_to_path(str(src), str(dst), drop_sub_indices=[0, 1, 2, 3, 4]) is True
+    assert captured["stdout"] is subprocess.DEVNULL
+    assert captured["stderr"] is subprocess.PIPE
@@ -83,6 +83,19 @@ def test_mtime_change_repicks_patterns(tmp_path, monkeypatch):
     assert subs_exclusion.is_subs_optional("Updated Show")
 
 
+def test_regex_metacharacters_match_literally(tmp_path, monkeypatch):
+    """Patterns are compiled into one regex alternation; metacharacters in
+    titles (parens, dots, brackets) must still behave as plain substrings."""
+    f = tmp_path / "subs_optional.json"
+    f.write_text(json.dumps({"patterns": ["Birth of a Nation (1915)", "S.W.A.T. [Pilot]"]}), encoding="utf-8")
+    monkeypatch.setattr(subs_exclusion, "DEFAULT_PATH", f)
+    subs_exclusion.reset_cache_for_tests()
+    assert subs_exclusion.is_subs_optional(r"\\NAS\Movies\Birth of a Nation (1915)\film.mkv")
+    assert not subs_exclusion.is_subs_optional(r"\\NAS\Movies\Birth of a Nation 1915\film.mkv")
+    assert subs_exclusion.is_subs_optional(r"\\NAS\Series\s.w.a.t. [pilot]\E01.mkv")
+    assert not subs_exclusion.is_subs_optional(r"\\NAS\Series\SxWxAxTx Pilot\E01.mkv")
+
+
 # ---------------------------------------------------------------------------
 # Integration: _compliance_for_entry honours the exclusion list
 # ---------------------------------------------------------------------------
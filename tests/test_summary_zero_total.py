@@ -0,0 +1,28 @@
+"""Summary lines still print their count when the total is zero.
+
+The percentage used to ride on a ``... if total else ""`` around the whole
+f-string, so an empty scan printed a blank line where the count belonged.
+"""
+
+from __future__ import annotations
+
+from tools.plex_metadata import _pct
+from tools.subtitles import print_report
+
+
+def test_subtitle_report_prints_count_for_empty_scan(capsys):
+    print_report([])
+    out = capsys.readouterr().out
+    assert "With English subtitles:       0\n" in out
+
+
+def test_subtitle_report_keeps_percentage(capsys):
+    r = {"has_english_any": True, "embedded_sub_count": 1, "external_sub_files": [], "library_type": "movie",
+         "filepath": "/m/a.mkv", "filename": "a.mkv"}
+    print_report([r])
+    assert "With English subtitles:       1 (100.0%)" in capsys.readouterr().out
+
+
+def test_pct_suffix():
+    assert _pct(1, 4) == " (25.0%)"
+    assert _pct(0, 0) == ""
@@ -104,7 +104,7 @@ def test_orchestrator_errors_increment_inside_except():
     idx = src.find("Upload failed for")
     assert idx != -1
     window = src[idx: idx + 400]
-    assert 'stats["errors"]' in window, (
+    assert "add_stats(errors=1)" in window, (
         "errors increment must immediately follow the 'Upload failed' log inside except"
     )
 
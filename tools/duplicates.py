@@ -14,6 +14,7 @@ No extra ffprobe calls -- works entirely from the scan report.
 
 import argparse
 import csv
+import functools
 import json
 import os
 import re
@@ -46,11 +47,16 @@ _STRIP_RE = re.compile(
 )
 
 
+@functools.lru_cache(maxsize=65536)
 def normalize_title(filename: str) -> str:
     """Strip year, codec tags, resolution, punctuation from a filename.
 
     Also tries the strip_tags cleaner as a fallback — it's more thorough
     at extracting the actual title from messy scene-style filenames.
+
+    Memoised: the dashboard's /api/duplicates runs this over every file in
+    the report on each request, and the filenames barely change between
+    requests.
     """
     stem = Path(filename).stem
     cleaned = _STRIP_RE.sub(" ", stem)
@@ -146,38 +152,28 @@ def find_duration_resolution_dupes(files: list[dict], duration_tolerance: float
         if len(items) < 2:
             continue
         items_sorted = sorted(items, key=lambda x: x.get("duration_seconds", 0))
+        durations = [x.get("duration_seconds", 0) for x in items_sorted]
         # Sliding window cluster by duration
         i = 0
         while i < len(items_sorted):
-            cluster = [items_sorted[i]]
             j = i + 1
-            while j < len(items_sorted):
-                if (
-                    abs(items_sorted[j].get("duration_seconds", 0) - cluster[-1].get("duration_seconds", 0))
-                    <= duration_tolerance
-                ):
-                    cluster.append(items_sorted[j])
-                    j += 1
-                else:
-                    break
-            if len(cluster) >= 2:
-                # Filter out clusters where all files have the same path (not dupes)
-                unique_dirs = {str(Path(f["filepath"]).parent) for f in cluster}
-                if len(unique_dirs) >= 2 or len(cluster) >= 2:
-                    group_id += 1
-                    for f in cluster:
-                        groups.append(
-                            {
-                                "group_id": group_id,
-                                "mode": "duration",
-                                "filepath": f["filepath"],
-                                "filename": f["filename"],
-                                "resolution": res,
-                                "codec": f.get("video", {}).get("codec", ""),
-                                "duration": round(f.get("duration_seconds", 0), 1),
-                                "file_size_gb": f.get("file_size_gb", 0),
-                            }
-                        )
+            while j < len(items_sorted) and abs(durations[j] - durations[j - 1]) <= duration_tolerance:
+                j += 1
+            if j - i >= 2:
+                group_id += 1
+                for f in items_sorted[i:j]:
+                    groups.append(
+                        {
+                            "group_id": group_id,
+                            "mode": "duration",
+                            "filepath": f["filepath"],
+                            "filename": f["filename"],
+                            "resolution": res,
+                            "codec": f.get("video", {}).get("codec", ""),
+                            "duration": round(f.get("duration_seconds", 0), 1),
+                            "file_size_gb": f.get("file_size_gb", 0),
+                        }
+                    )
             i = j
     return groups
 
@@ -273,8 +269,10 @@ def main():
         print(f"ERROR: Report not found: {report_path}", file=sys.stderr)
         sys.exit(1)
 
-    with open(report_path, "r", encoding="utf-8") as f:
-        report = json.load(f)
+    # Binary read + json.loads: one bulk decode of a report that runs to
+    # hundreds of MB, as build_queues does. Also tolerates a UTF-8 BOM.
+    with open(report_path, "rb") as f:
+        report = json.loads(f.read())
 
     files = report.get("files", [])
     print(f"Loaded {len(files)} files from report")
@@ -296,6 +296,11 @@ def load_rules() -> dict:
 # ---------------------------------------------------------------------------
 
 
+def _pct(count: int, total: int) -> str:
+    """`` (12.3%)`` suffix for a summary line, or nothing when there is no total."""
+    return f" ({count / total * 100:.1f}%)" if total else ""
+
+
 def _audit_items(items: list[dict], section: dict, section_type: str) -> dict:
     """Build audit dict for a list of movies or shows."""
     label = "movies" if section_type == "movie" else "shows"
@@ -467,9 +472,9 @@ def cmd_report(rules: dict) -> None:
         total = len(movies)
         print("\n  Summary:")
         print(f"    Total:       {total}")
-        print(f"    Unrated:     {len(unrated)} ({len(unrated) / total * 100:.1f}%)" if total else "")
-        print(f"    No genres:   {len(no_genre)} ({len(no_genre) / total * 100:.1f}%)" if total else "")
-        print(f"    No collect.: {len(no_coll)} ({len(no_coll) / total * 100:.1f}%)" if total else "")
+        print(f"    Unrated:     {len(unrated)}{_pct(len(unrated), total)}")
+        print(f"    No genres:   {len(no_genre)}{_pct(len(no_genre), total)}")
+        print(f"    No collect.: {len(no_coll)}{_pct(len(no_coll), total)}")
         print(f"    Alias fixes: {len(alias_issues)}")
 
 
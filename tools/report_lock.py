@@ -161,9 +161,11 @@ def _try_load(path: Path) -> dict | None:
     report doesn't get treated as good.
     """
     try:
-        with path.open("r", encoding="utf-8") as f:
-            data = json.load(f)
-    except (FileNotFoundError, json.JSONDecodeError, UnicodeDecodeError, OSError):
+        # Bytes into json.loads: one bulk decode, and a UTF-8 BOM (which
+        # text-mode "utf-8" rejects) doesn't read as corruption.
+        with path.open("rb") as f:
+            data = json.loads(f.read())
+    except (ValueError, OSError):
         return None
     if not isinstance(data, dict):
         return None
@@ -210,7 +210,8 @@ def print_report(results: list[dict]) -> None:
     print("  Subtitle Report")
     print(f"{'=' * 70}")
     print(f"  Total files scanned:          {total}")
-    print(f"  With English subtitles:       {has_eng} ({100 * has_eng / total:.1f}%)" if total else "")
+    eng_pct = f" ({100 * has_eng / total:.1f}%)" if total else ""
+    print(f"  With English subtitles:       {has_eng}{eng_pct}")
     print(f"  Missing English subtitles:    {len(missing)}")
     print(f"  No subtitles at all:          {len(no_subs_at_all)}")
     print(f"{'=' * 70}")